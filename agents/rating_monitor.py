@@ -3,33 +3,178 @@ Agent 3: Real-Time Rating Monitor
 Continuously scrapes rating updates and stores time-series snapshots
 """
 import os
-import psycopg2
+import socket
+import sys
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 import requests
 from bs4 import BeautifulSoup
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import get_pool
+from metrics import metrics, start_metrics_server
+from profiling import add_profile_arguments, profiled
+from http_client import get_http_client, validators_from
+from snapshot_writer import SnapshotWriter
+from stream_stats import ReviewStreamStats
+from scrapers.rate_limit import TokenBucket, AdaptiveConcurrency
+from scrapers.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED
+from scrapers.url_cache import ResolutionCache
+from scrapers import fast_extract
+from scrapers.page_parsers import parse_rt_page, parse_imdb_page, parse_metacritic_page
+from scrapers.parse_pool import get_parse_pool
+from monitor_schedule import MonitorSchedule, VolatilityPolicy, TIERS, tier_for
 
 load_dotenv()
 
+# Sources in scrape order, with the label used in console output
+SOURCES = ['RottenTomatoes', 'IMDb', 'Metacritic']
+SOURCE_LABELS = {'RottenTomatoes': 'RT', 'IMDb': 'IMDb', 'Metacritic': 'Metacritic'}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Movie page parser per source (run on the parse pool)
+PAGE_PARSERS = {
+    'RottenTomatoes': parse_rt_page,
+    'IMDb': parse_imdb_page,
+    'Metacritic': parse_metacritic_page
+}
+
+# Score-region digest kind per source (see fast_extract.score_digest)
+DIGEST_KINDS = {'RottenTomatoes': 'rt', 'IMDb': 'imdb', 'Metacritic': 'metacritic'}
+
+# Responses that mean the source is blocking or struggling (5xx also count)
+BLOCKED_STATUSES = {403, 429}
+
+# scrape_source result when the page is known unchanged (304 or same score digest)
+NOT_MODIFIED = object()
+
 class RatingMonitor:
-    def __init__(self):
-        self.conn = psycopg2.connect(
-            host=os.environ.get("DB_HOST"),
-            port=os.environ.get("DB_PORT"),
-            database=os.environ.get("DB_NAME"),
-            user=os.environ.get("DB_USER"),
-            password=os.environ.get("DB_PASSWORD")
-        )
-        self.conn.autocommit = True
-        
-        with self.conn.cursor() as cur:
-            cur.execute("SET search_path TO movie_platform;")
+    def __init__(self, workers=1, parse_workers=None):
+        """
+        Args:
+            workers: Concurrent scrapes per source. 1 keeps the legacy serial
+                loop with fixed sleeps; >1 runs the sources in parallel, each
+                paced by its own token bucket from review_sources.
+            parse_workers: Processes for HTML parsing (default PARSE_POOL_SIZE
+                or one per CPU); 0 parses serially in the scraping thread.
+        """
+        self.conn = get_pool().getconn()
+        self.parse_pool = get_parse_pool(parse_workers)
+        self.http = get_http_client()
+        # Pages parsed / skipped since the last report_cycle_stats
+        self.page_stats = Counter()
+        self._stats_lock = threading.Lock()
+        self.workers = max(workers, 1)
+        # Sources run side by side (concurrent or scheduled mode), so output gets tagged
+        self.parallel = self.workers > 1
+        self.rate_limiters = {}
+        # Every request to a source passes its circuit breaker and AIMD concurrency cap
+        self.breakers = {source: CircuitBreaker(SOURCE_LABELS[source]) for source in SOURCES}
+        self.concurrency = {source: AdaptiveConcurrency(self.workers) for source in SOURCES}
+        self.url_cache = ResolutionCache(self.conn)
+        # (movie_id, source) -> (validators, digest) of a parsed page, saved once its ratings are stored
+        self.pending_page_state = {}
+        self.writer = SnapshotWriter(self.conn)
+        # Running new-review statistics per (movie, source), for spike alerts on ingest
+        self.stream_stats = ReviewStreamStats(self.conn)
+        # (movie_id, source, rating_type) -> newest rating_snapshots row, per cycle
+        self.latest_snapshots = {}
+        self.latest_loaded = set()
+        # source -> search for the movie's page URL
+        self.sources = {
+            'RottenTomatoes': self.find_rt_url,
+            'IMDb': self.find_imdb_url,
+            'Metacritic': self.find_metacritic_url
+        }
     
+    def close(self):
+        """Flush buffered writes and return the pooled connection"""
+        self.writer.close()
+        get_pool().putconn(self.conn)
+
+    def load_rate_limits(self):
+        """Build one token bucket per source from review_sources.rate_limit_per_minute"""
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT name, rate_limit_per_minute FROM review_sources WHERE is_active;")
+            rows = cur.fetchall()
+        self.rate_limiters = {
+            row['name']: TokenBucket(row['rate_limit_per_minute'] or 0)
+            for row in rows if row['name'] in SOURCES
+        }
+        return self.rate_limiters
+
+    def _throttle(self, source):
+        """Wait for the source's rate budget before a request (no-op in serial mode)"""
+        limiter = self.rate_limiters.get(source)
+        if limiter:
+            limiter.acquire()
+
+    def fetch(self, source, url, validators=None, phase='page_fetch'):
+        """GET a page from a source through the shared client, within its rate budget.
+
+        The request is timed under `phase` ('search_fetch' or 'page_fetch'),
+        and waiting for the token bucket and a concurrency slot as rate_limit_wait.
+        Every retry inside the shared client takes another token, so retries
+        stay within review_sources.rate_limit_per_minute.
+
+        Raises HTTPError on 4xx/5xx; a 304 (only possible with validators) is returned.
+        Raises CircuitOpenError without sending anything while the source's
+        circuit is open. Timeouts, connection errors, 403/429 and 5xx count as
+        failures for the breaker; latency and retries feed its concurrency cap.
+        """
+        breaker = self.breakers[source]
+        retry_in = breaker.retry_in()
+        if retry_in > 0:
+            raise CircuitOpenError(SOURCE_LABELS[source], retry_in)
+
+        def throttle_retry(attempt):
+            if attempt:  # The first attempt's token is taken below
+                waiting = time.monotonic()
+                self._throttle(source)
+                metrics.observe('rate_limit_wait', time.monotonic() - waiting, source)
+
+        waiting = time.monotonic()
+        self._throttle(source)
+        with self.concurrency[source]:
+            started = time.monotonic()
+            metrics.observe('rate_limit_wait', started - waiting, source)
+            metrics.inc('requests', source)
+            try:
+                response = self.http.get(url, headers=HEADERS, timeout=10, validators=validators,
+                                         before_attempt=throttle_retry)
+            except (requests.ConnectionError, requests.Timeout):
+                metrics.observe(phase, time.monotonic() - started, source)
+                breaker.record(False)
+                self._record_latency(source, time.monotonic() - started, throttled=True)
+                raise
+            latency = time.monotonic() - started
+            metrics.observe(phase, latency, source)
+
+        status = response.status_code
+        breaker.record(status not in BLOCKED_STATUSES and status < 500)
+        self._record_latency(source, latency, throttled=status == 429 or getattr(response, 'attempts', 1) > 1)
+        if status != 304:
+            response.raise_for_status()
+        return response
+
+    def _record_latency(self, source, latency, throttled=False):
+        limiter = self.concurrency[source]
+        before = int(limiter.limit)
+        after = limiter.record(latency, throttled=throttled)
+        if after != before:
+            print(f"   🎚️ {SOURCE_LABELS[source]} concurrency {before} → {after}")
+
     def get_active_movies(self, days=30):
         """Get movies released in the last N days"""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with metrics.timer('db_read'), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
             query = """
                 SELECT * FROM movies 
                 WHERE release_date > NOW() - INTERVAL '%s days'
@@ -38,215 +183,209 @@ class RatingMonitor:
             cur.execute(query, (days,))
             return cur.fetchall()
     
-    def scrape_rt_rating(self, movie_title):
-        """Scrape Rotten Tomatoes rating for a movie"""
-        import json
-
-        # Search for movie
+    def find_rt_url(self, movie_title):
+        """Search Rotten Tomatoes for a movie's page URL"""
         search_url = f"https://www.rottentomatoes.com/search?search={movie_title.replace(' ', '+')}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-
-        try:
-            response = requests.get(search_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Find first movie result in the movie results section
-            movie_section = soup.select_one('search-page-result[type="movie"]')
-            if not movie_section:
-                # Fallback to general search media row
-                movie_link = soup.select_one('search-page-media-row a[slot="title"], a[data-qa="search-result-title"]')
-            else:
-                movie_link = movie_section.select_one('search-page-media-row a[slot="title"]')
-
-            if not movie_link:
-                # Last resort fallback
-                movie_link = soup.select_one('a[href*="/m/"]')
 
-            if not movie_link:
-                return None
+        response = self.fetch('RottenTomatoes', search_url, phase='search_fetch')
+        soup = BeautifulSoup(response.text, 'html.parser')
 
-            movie_url = movie_link['href']
-            if not movie_url.startswith('http'):
-                movie_url = f"https://www.rottentomatoes.com{movie_url}"
-
-            # Get movie page
-            movie_response = requests.get(movie_url, headers=headers, timeout=10)
-            movie_response.raise_for_status()
-            movie_soup = BeautifulSoup(movie_response.text, 'html.parser')
-
-            ratings = {}
-            review_counts = {}
-
-            # PRIMARY METHOD: Extract from JSON-LD schema data (most reliable)
-            for script in movie_soup.select('script[type="application/ld+json"]'):
-                try:
-                    data = json.loads(script.string)
-                    if data.get('@type') == 'Movie':
-                        agg = data.get('aggregateRating', {})
-                        if agg.get('ratingValue'):
-                            ratings['tomatometer'] = float(agg['ratingValue'])
-                        if agg.get('reviewCount'):
-                            review_counts['critic_reviews'] = int(agg['reviewCount'])
-                        break
-                except Exception:
-                    pass
-
-            # FALLBACK: CSS selectors for audience score (not in JSON-LD)
-            if 'tomatometer' not in ratings:
-                tomatometer = movie_soup.select_one('rt-text[slot="criticsScore"], [data-qa="tomatometer"]')
-                if tomatometer:
-                    score_text = tomatometer.text.strip().replace('%', '')
-                    try:
-                        ratings['tomatometer'] = float(score_text)
-                    except Exception as e:
-                        print(f"      Failed to parse tomatometer '{score_text}': {e}")
+        # Find first movie result in the movie results section
+        movie_section = soup.select_one('search-page-result[type="movie"]')
+        if not movie_section:
+            # Fallback to general search media row
+            movie_link = soup.select_one('search-page-media-row a[slot="title"], a[data-qa="search-result-title"]')
+        else:
+            movie_link = movie_section.select_one('search-page-media-row a[slot="title"]')
 
-            audience_score = movie_soup.select_one('rt-text[slot="audienceScore"], [data-qa="audience-score"]')
-            if audience_score:
-                score_text = audience_score.text.strip().replace('%', '')
-                try:
-                    ratings['audience'] = float(score_text)
-                except Exception as e:
-                    print(f"      Failed to parse audience score '{score_text}': {e}")
+        if not movie_link:
+            # Last resort fallback
+            movie_link = soup.select_one('a[href*="/m/"]')
 
-            # Additional review counts from page scraping
-            page_review_counts = self.scrape_review_counts(movie_soup)
-            if page_review_counts:
-                review_counts.update(page_review_counts)
+        if not movie_link:
+            return None
 
-            if review_counts:
-                ratings['review_counts'] = review_counts
+        movie_url = movie_link['href']
+        if not movie_url.startswith('http'):
+            movie_url = f"https://www.rottentomatoes.com{movie_url}"
+        return movie_url
 
-            return ratings
+    def scrape_rt_page(self, movie_url):
+        """Scrape ratings and review counts from a Rotten Tomatoes movie page"""
+        return self.parse_pool.parse(parse_rt_page, self.fetch('RottenTomatoes', movie_url).text)
 
+    def scrape_rt_rating(self, movie_title):
+        """Scrape Rotten Tomatoes rating for a movie"""
+        try:
+            movie_url = self.find_rt_url(movie_title)
+            return self.scrape_rt_page(movie_url) if movie_url else None
         except Exception as e:
             print(f"Error scraping RT for {movie_title}: {e}")
             return None
     
-    def scrape_review_counts(self, soup):
-        """Extract review counts from movie page"""
-        try:
-            counts = {}
-            
-            # Try to find critic review count
-            critic_count_elem = soup.select_one('[data-qa="tomatometer-review-count"], .scoreboard__info--reviews')
-            if critic_count_elem:
-                text = critic_count_elem.text.strip()
-                # Extract number from text like "150 Reviews"
-                import re
-                match = re.search(r'(\d+)', text)
-                if match:
-                    counts['critic_reviews'] = int(match.group(1))
-            
-            # Try to find audience review count  
-            audience_count_elem = soup.select_one('[data-qa="audience-rating-count"]')
-            if audience_count_elem:
-                text = audience_count_elem.text.strip()
-                match = re.search(r'([\d,]+)', text)
-                if match:
-                    counts['audience_reviews'] = int(match.group(1).replace(',', ''))
-            
-            return counts if counts else None
-        except Exception as e:
-            print(f"      Failed to extract review counts: {e}")
+    def find_imdb_url(self, movie_title):
+        """Search IMDb for a movie's title page URL"""
+        search_url = f"https://www.imdb.com/find?q={movie_title.replace(' ', '+')}&s=tt&ttype=ft"
+
+        response = self.fetch('IMDb', search_url, phase='search_fetch')
+        soup = BeautifulSoup(response.text, 'html.parser')
+        
+        # Find first movie result
+        result = soup.select_one('a[href*="/title/tt"]')
+        if not result:
             return None
-    
+        
+        return f"https://www.imdb.com{result['href'].split('?')[0]}"
+
+    def scrape_imdb_page(self, movie_url):
+        """Scrape the aggregate rating from an IMDb title page"""
+        return self.parse_pool.parse(parse_imdb_page, self.fetch('IMDb', movie_url).text)
+
     def scrape_imdb_rating(self, movie_title):
         """Scrape IMDb rating for a movie"""
         try:
-            # Search IMDb
-            search_url = f"https://www.imdb.com/find?q={movie_title.replace(' ', '+')}&s=tt&ttype=ft"
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find first movie result
-            result = soup.select_one('a[href*="/title/tt"]')
-            if not result:
-                return None
-            
-            movie_url = f"https://www.imdb.com{result['href'].split('?')[0]}"
-            
-            # Get movie page
-            movie_response = requests.get(movie_url, headers=headers, timeout=10)
-            movie_response.raise_for_status()
-            movie_soup = BeautifulSoup(movie_response.text, 'html.parser')
-            
-            # Extract rating
-            rating_elem = movie_soup.select_one('[data-testid="hero-rating-bar__aggregate-rating__score"] span')
-            if rating_elem:
-                score_text = rating_elem.text.strip()
-                try:
-                    # IMDb uses 0-10 scale, convert to percentage
-                    score = float(score_text) * 10
-                    return {'imdb_score': score}
-                except:
-                    pass
-            
-            return None
+            movie_url = self.find_imdb_url(movie_title)
+            return self.scrape_imdb_page(movie_url) if movie_url else None
         except Exception as e:
             print(f"      Error scraping IMDb: {e}")
             return None
     
+    def find_metacritic_url(self, movie_title):
+        """Search Metacritic for a movie's page URL"""
+        search_url = f"https://www.metacritic.com/search/{movie_title.replace(' ', '-')}/"
+
+        response = self.fetch('Metacritic', search_url, phase='search_fetch')
+        soup = BeautifulSoup(response.text, 'html.parser')
+        
+        # Find movie result
+        movie_link = soup.select_one('a[href*="/movie/"]')
+        if not movie_link:
+            return None
+        
+        return f"https://www.metacritic.com{movie_link['href']}"
+
+    def scrape_metacritic_page(self, movie_url):
+        """Scrape Metascore and user score from a Metacritic movie page"""
+        return self.parse_pool.parse(parse_metacritic_page, self.fetch('Metacritic', movie_url).text)
+
     def scrape_metacritic_rating(self, movie_title):
         """Scrape Metacritic rating for a movie"""
         try:
-            # Search Metacritic
-            search_url = f"https://www.metacritic.com/search/{movie_title.replace(' ', '-')}/"
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find movie result
-            movie_link = soup.select_one('a[href*="/movie/"]')
-            if not movie_link:
-                return None
-            
-            movie_url = f"https://www.metacritic.com{movie_link['href']}"
-            
-            # Get movie page
-            movie_response = requests.get(movie_url, headers=headers, timeout=10)
-            movie_response.raise_for_status()
-            movie_soup = BeautifulSoup(movie_response.text, 'html.parser')
-            
-            ratings = {}
-            
-            # Metascore (critic score)
-            metascore = movie_soup.select_one('.c-siteReviewScore_background-critic_medium span, .metascore_w')
-            if metascore:
-                try:
-                    ratings['metascore'] = float(metascore.text.strip())
-                except:
-                    pass
-            
-            # User score
-            user_score = movie_soup.select_one('.c-siteReviewScore_background-user span')
-            if user_score:
-                try:
-                    # User score is 0-10, convert to percentage
-                    ratings['user_score'] = float(user_score.text.strip()) * 10
-                except:
-                    pass
-            
-            return ratings if ratings else None
+            movie_url = self.find_metacritic_url(movie_title)
+            return self.scrape_metacritic_page(movie_url) if movie_url else None
         except Exception as e:
             print(f"      Error scraping Metacritic: {e}")
             return None
+
+    def _count_page(self, outcome):
+        with self._stats_lock:
+            self.page_stats[outcome] += 1
+        metrics.inc(f'pages_{outcome}')
+
+    def scrape_page(self, movie, source, movie_url, cached=None):
+        """Fetch and parse a movie page, skipping the work when it is unchanged.
+
+        Returns NOT_MODIFIED when the server answers 304 to the cached
+        validators, or when the digest of the page's score region matches the
+        one stored at the last parse. A parsed page's validators and digest
+        are held in pending_page_state until monitor_source has stored its
+        ratings (see save_page_state).
+        """
+        response = self.fetch(source, movie_url, validators=cached)
+        if response.status_code == 304:
+            self._count_page('not_modified')
+            return NOT_MODIFIED
+
+        validators = validators_from(response)
+        digest = fast_extract.score_digest(DIGEST_KINDS[source], response.text)
+        if digest and cached and digest == cached.get('content_digest'):
+            self.url_cache.put_page_state(movie['id'], source, validators, digest)
+            self._count_page('unchanged')
+            return NOT_MODIFIED
+
+        with metrics.timer('parse', source):
+            ratings = self.parse_pool.parse(PAGE_PARSERS[source], response.text)
+        # Only trust the digest once the page has actually yielded ratings
+        with self._stats_lock:
+            self.pending_page_state[(str(movie['id']), source)] = (validators, digest if ratings else None)
+        self._count_page('parsed')
+        return ratings
+
+    def save_page_state(self, movie, source, stored=True):
+        """Persist the pending page state of a parsed page once its ratings are stored.
+
+        When storing failed the cached validators and digest are cleared
+        instead, so the next cycle fetches and parses the page again rather
+        than skipping it as unchanged.
+        """
+        with self._stats_lock:
+            page_state = self.pending_page_state.pop((str(movie['id']), source), None)
+        if page_state is None:
+            return
+        if stored:
+            self.url_cache.put_page_state(movie['id'], source, *page_state)
+        else:
+            self.url_cache.put_page_state(movie['id'], source, {}, None)
+
+    def scrape_source(self, movie, source):
+        """Scrape a movie's ratings from one source, using the URL cache.
+
+        A cached canonical URL skips the search page; a cached miss skips the
+        source entirely until it expires. Search runs only on a cache miss or
+        when the cached page returns 404. Cached pages are fetched with a
+        conditional GET and compared by score digest, so an unchanged page
+        costs a 304 or a hash rather than a parse and DB writes.
+        """
+        find_url = self.sources[source]
+        cached = self.url_cache.get(movie['id'], source)
+        try:
+            if cached is not None:
+                if not cached['url']:
+                    return None  # Negative entry: source had no match recently
+                try:
+                    return self.scrape_page(movie, source, cached['url'], cached=cached)
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code != 404:
+                        raise
+                    print(f"      Cached {SOURCE_LABELS[source]} URL gone (404), searching again")
+
+            movie_url = find_url(movie['title'])
+            self.url_cache.put(movie['id'], source, movie_url)
+            return self.scrape_page(movie, source, movie_url) if movie_url else None
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"      Error scraping {SOURCE_LABELS[source]} for {movie['title']}: {e}")
+            return None
     
+    def load_latest_snapshots(self, movie_ids):
+        """Load the newest snapshot per (movie, source, rating_type) for a batch in one query.
+
+        Change detection for these movies is then answered from memory by
+        get_last_snapshot, and store_snapshot keeps the map current.
+        """
+        movie_ids = [str(m) for m in movie_ids]
+        if not movie_ids:
+            return
+        with metrics.timer('db_read'), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            query = """
+                SELECT DISTINCT ON (movie_id, source, rating_type)
+                    movie_id, source, rating_type, rating_value, review_count, snapshot_time
+                FROM rating_snapshots
+                WHERE movie_id = ANY(%s::uuid[])
+                ORDER BY movie_id, source, rating_type, snapshot_time DESC;
+            """
+            cur.execute(query, (movie_ids,))
+            for row in cur.fetchall():
+                self.latest_snapshots[(str(row['movie_id']), row['source'], row['rating_type'])] = row
+        self.latest_loaded.update(movie_ids)
+
     def get_last_snapshot(self, movie_id, source, rating_type):
         """Get the most recent snapshot for comparison"""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        if str(movie_id) in self.latest_loaded:
+            return self.latest_snapshots.get((str(movie_id), source, rating_type))
+
+        with metrics.timer('db_read', source), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
             query = """
                 SELECT * FROM rating_snapshots
                 WHERE movie_id = %s AND source = %s AND rating_type = %s
@@ -257,21 +396,50 @@ class RatingMonitor:
             return cur.fetchone()
     
     def store_snapshot(self, movie_id, source, rating_type, rating_value, review_count=0):
-        """Store a new rating snapshot"""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-
-            query = """
-                INSERT INTO rating_snapshots (
-                    movie_id, source, rating_type, rating_value, review_count, snapshot_time
-                ) VALUES (%s, %s, %s, %s, %s, NOW())
-                ON CONFLICT (movie_id, source, rating_type, snapshot_time) DO NOTHING
-                RETURNING *;
-            """
-
-            cur.execute(query, (movie_id, source, rating_type, rating_value, review_count))
-            self.conn.commit()
-            return cur.fetchone()
+        """Queue a new rating snapshot on the buffered writer"""
+        snapshot = self.writer.add_snapshot(movie_id, source, rating_type, rating_value, review_count)
+        self.latest_snapshots[(str(movie_id), source, rating_type)] = snapshot
+        return snapshot
     
+    def _snapshot_period(self, interval):
+        """(snapshot_time SQL, previous-period offset) for 'hourly' or 'daily' snapshots"""
+        if interval == 'hourly':
+            return "DATE_TRUNC('hour', NOW())", "1 hour"
+        return "DATE_TRUNC('day', NOW())", "1 day"
+
+    def carry_forward_daily_snapshot(self, movie_id, source, interval='daily'):
+        """Repeat the latest time-series snapshot for the current period.
+
+        Used when a conditional GET says the page is unchanged, so review
+        trends keep one row per period without re-parsing the page. Does
+        nothing if the source has no earlier snapshot or this period exists.
+        """
+        time_trunc, _ = self._snapshot_period(interval)
+        query = f"""
+            INSERT INTO daily_review_snapshots (
+                movie_id, source, snapshot_date, snapshot_time,
+                total_reviews, new_reviews_today,
+                critic_score, audience_score, score_change, review_velocity
+            )
+            SELECT
+                prev.movie_id, prev.source, CURRENT_DATE, {time_trunc},
+                prev.total_reviews, 0,
+                prev.critic_score, prev.audience_score, 0.0,
+                prev.total_reviews::float / GREATEST(COALESCE(EXTRACT(DAY FROM NOW() - m.release_date)::integer, 1), 1)
+            FROM (
+                SELECT * FROM daily_review_snapshots
+                WHERE movie_id = %s AND source = %s
+                ORDER BY snapshot_time DESC
+                LIMIT 1
+            ) prev
+            LEFT JOIN movies m ON m.id = prev.movie_id
+            ON CONFLICT (movie_id, source, snapshot_time) DO NOTHING
+            RETURNING *;
+        """
+        with metrics.timer('db_write', source), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (movie_id, source))
+            return cur.fetchone()
+
     def store_daily_snapshot(self, movie_id, source, ratings, review_counts, interval='daily'):
         """Store review snapshot for trend analysis.
 
@@ -282,80 +450,177 @@ class RatingMonitor:
             review_counts: Dict with 'critic_reviews' and/or 'audience_reviews'
             interval: 'hourly' or 'daily' - determines snapshot granularity
         """
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            from datetime import datetime
-
-            # Determine snapshot time based on interval
-            if interval == 'hourly':
-                time_trunc = "DATE_TRUNC('hour', NOW())"
-                prev_interval = "1 hour"
-            else:
-                time_trunc = "DATE_TRUNC('day', NOW())"
-                prev_interval = "1 day"
-
-            # Check previous snapshot
-            prev_query = f"""
-                SELECT total_reviews, critic_score 
-                FROM daily_review_snapshots 
-                WHERE movie_id = %s AND source = %s 
-                AND snapshot_time = {time_trunc} - INTERVAL '{prev_interval}'
-                LIMIT 1;
-            """
-            cur.execute(prev_query, (movie_id, source))
-            previous = cur.fetchone()
-
-            # Calculate metrics
-            total_reviews = review_counts.get('critic_reviews', 0) + review_counts.get('audience_reviews', 0)
-            new_reviews = 0
-            score_change = 0.0
-
-            if previous:
-                new_reviews = total_reviews - (previous['total_reviews'] or 0)
-                if previous['critic_score'] and ratings.get('tomatometer'):
-                    score_change = ratings['tomatometer'] - previous['critic_score']
-
-            # Calculate velocity (reviews per day since release)
-            days_query = "SELECT EXTRACT(DAY FROM NOW() - release_date)::INTEGER as days FROM movies WHERE id = %s;"
-            cur.execute(days_query, (movie_id,))
-            days_result = cur.fetchone()
-            days_since_release = max(days_result['days'] if days_result else 1, 1)
-            review_velocity = total_reviews / days_since_release
-
-            # Store snapshot with timestamp
-            query = f"""
-                INSERT INTO daily_review_snapshots (
-                    movie_id, source, snapshot_date, snapshot_time,
-                    total_reviews, new_reviews_today,
-                    critic_score, audience_score, score_change
-                ) VALUES (%s, %s, CURRENT_DATE, {time_trunc}, %s, %s, %s, %s, %s)
-                ON CONFLICT (movie_id, source, snapshot_time) DO UPDATE SET
-                    total_reviews = EXCLUDED.total_reviews,
-                    new_reviews_today = EXCLUDED.new_reviews_today,
-                    critic_score = EXCLUDED.critic_score,
-                    audience_score = EXCLUDED.audience_score
-                RETURNING *;
-            """
-            
-            cur.execute(query, (
-                movie_id, source,
-                total_reviews, new_reviews,
-                ratings.get('tomatometer'), ratings.get('audience'), score_change
-            ))
+        time_trunc, prev_interval = self._snapshot_period(interval)
+
+        total_reviews = review_counts.get('critic_reviews', 0) + review_counts.get('audience_reviews', 0)
+
+        # One round-trip: previous snapshot and release age are joined in, and
+        # new_reviews_today / score_change / review_velocity computed server-side
+        query = f"""
+            WITH current_snapshot AS (
+                SELECT
+                    %(movie_id)s::uuid AS movie_id,
+                    %(source)s::text AS source,
+                    {time_trunc} AS snapshot_time,
+                    %(total_reviews)s::integer AS total_reviews,
+                    %(critic_score)s::float AS critic_score,
+                    %(audience_score)s::float AS audience_score
+            )
+            INSERT INTO daily_review_snapshots (
+                movie_id, source, snapshot_date, snapshot_time,
+                total_reviews, new_reviews_today,
+                critic_score, audience_score, score_change, review_velocity
+            )
+            SELECT
+                c.movie_id, c.source, CURRENT_DATE, c.snapshot_time,
+                c.total_reviews,
+                -- Reviews added since the previous interval's snapshot (0 without one)
+                CASE WHEN prev.movie_id IS NULL THEN 0
+                     ELSE c.total_reviews - COALESCE(prev.total_reviews, 0) END,
+                c.critic_score, c.audience_score,
+                CASE WHEN prev.critic_score <> 0 AND c.critic_score <> 0
+                     THEN c.critic_score - prev.critic_score ELSE 0.0 END,
+                -- Reviews per day since release
+                c.total_reviews::float / GREATEST(COALESCE(EXTRACT(DAY FROM NOW() - m.release_date)::integer, 1), 1)
+            FROM current_snapshot c
+            LEFT JOIN movies m ON m.id = c.movie_id
+            LEFT JOIN daily_review_snapshots prev
+                ON prev.movie_id = c.movie_id
+                AND prev.source = c.source
+                AND prev.snapshot_time = c.snapshot_time - INTERVAL '{prev_interval}'
+            ON CONFLICT (movie_id, source, snapshot_time) DO UPDATE SET
+                total_reviews = EXCLUDED.total_reviews,
+                new_reviews_today = EXCLUDED.new_reviews_today,
+                critic_score = EXCLUDED.critic_score,
+                audience_score = EXCLUDED.audience_score,
+                score_change = EXCLUDED.score_change,
+                review_velocity = EXCLUDED.review_velocity,
+                updated_at = NOW()
+            RETURNING *;
+        """
 
+        with metrics.timer('db_write', source), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, {
+                'movie_id': movie_id,
+                'source': source,
+                'total_reviews': total_reviews,
+                'critic_score': ratings.get('tomatometer'),
+                'audience_score': ratings.get('audience')
+            })
             return cur.fetchone()
     
+    def observe_daily_snapshot(self, movie, snapshot, tag=""):
+        """Fold a stored daily_review_snapshots row into the streaming stats.
+
+        A new-review count more than 5σ above the (movie, source) history is
+        flagged in movie_trends straight away. Returns the spike magnitude or None.
+        """
+        source = snapshot['source']
+        try:
+            with metrics.timer('db_write', source):
+                magnitude = self.stream_stats.observe(snapshot)
+        except Exception as e:
+            print(f"    ⚠️ Failed to update review stream stats: {e}")
+            return None
+        if magnitude is not None:
+            metrics.inc('review_spikes', source)
+            print(f"    🚨 {SOURCE_LABELS[source]} review spike for {movie['title']}: "
+                  f"+{snapshot['new_reviews_today']} new ({magnitude:.1f}σ){tag}")
+        return magnitude
+
     def log_scrape(self, source_name, movie_id, status, error_message=None, snapshots_created=0):
-        """Log scraping activity"""
-        with self.conn.cursor() as cur:
-            query = """
-                INSERT INTO scrape_logs (
-                    source_name, movie_id, status, error_message, snapshots_created
-                ) VALUES (%s, %s, %s, %s, %s);
-            """
-            cur.execute(query, (source_name, movie_id, status, error_message, snapshots_created))
+        """Log scraping activity (buffered)"""
+        self.writer.add_log(source_name, movie_id, status, error_message, snapshots_created)
     
+    def monitor_source(self, movie, source, interval='daily'):
+        """Scrape one source for a movie and store any changed ratings.
+
+        Returns:
+            Number of rating snapshots created
+        """
+        label = SOURCE_LABELS[source]
+        # Output from parallel sources interleaves, so tag each line with the movie
+        tag = f" [{movie['title']}]" if self.parallel else ""
+        if not self.breakers[source].allow():
+            return self._skip_open_circuit(movie, source, tag)
+        try:
+            ratings = self.scrape_source(movie, source)
+        except CircuitOpenError:
+            return self._skip_open_circuit(movie, source, tag)
+        if ratings is NOT_MODIFIED:
+            print(f"    💤 {label} unchanged{tag}")
+            try:
+                daily_snapshot = self.carry_forward_daily_snapshot(movie['id'], source, interval=interval)
+                if daily_snapshot:
+                    self.observe_daily_snapshot(movie, daily_snapshot, tag)
+            except Exception as e:
+                print(f"    ⚠️ Failed to carry forward daily snapshot: {e}")
+            self.log_scrape(source, movie['id'], 'success')
+            return 0
+        if not ratings:
+            self.save_page_state(movie, source)
+            if source == 'RottenTomatoes':
+                self.log_scrape(source, movie['id'], 'error', error_message='No ratings found')
+            return 0
+
+        snapshots_created = 0
+        review_counts = ratings.pop('review_counts', {})
+
+        # Store regular snapshots
+        for rating_type, rating_value in ratings.items():
+            last_snapshot = self.get_last_snapshot(movie['id'], source, rating_type)
+
+            if not last_snapshot or last_snapshot['rating_value'] != rating_value:
+                snapshot = self.store_snapshot(
+                    movie['id'],
+                    source,
+                    rating_type,
+                    rating_value
+                )
+                if snapshot:
+                    snapshots_created += 1
+                    change = ""
+                    if last_snapshot:
+                        diff = rating_value - last_snapshot['rating_value']
+                        change = f" ({diff:+.1f})"
+                    print(f"    ✅ {label} {rating_type}: {rating_value}{change}{tag}")
+
+        # Store time-series snapshot (review counts come from RT only)
+        stored = True
+        if review_counts:
+            try:
+                daily_snapshot = self.store_daily_snapshot(
+                    movie['id'],
+                    source,
+                    ratings,
+                    review_counts,
+                    interval=interval
+                )
+                if daily_snapshot:
+                    period = "Hourly" if interval == 'hourly' else "Daily"
+                    print(f"    📊 {period} snapshot: {daily_snapshot['total_reviews']} reviews (+{daily_snapshot['new_reviews_today']} new){tag}")
+                    self.observe_daily_snapshot(movie, daily_snapshot, tag)
+            except Exception as e:
+                stored = False
+                print(f"    ⚠️ Failed to store daily snapshot: {e}")
+
+        # The digest may only say "unchanged" once the changed ratings are in the database
+        if snapshots_created:
+            self.writer.flush()
+        self.save_page_state(movie, source, stored=stored)
+        self.log_scrape(source, movie['id'], 'success', snapshots_created=snapshots_created)
+        return snapshots_created
+
+    def _skip_open_circuit(self, movie, source, tag=""):
+        """Log a scrape skipped because the source's circuit is open"""
+        retry_in = self.breakers[source].retry_in()
+        metrics.inc('circuit_skips', source)
+        print(f"    ⛔ {SOURCE_LABELS[source]} skipped, circuit open{tag}")
+        self.log_scrape(source, movie['id'], 'rate_limited', error_message=f"Circuit open, retrying in {retry_in:.0f}s")
+        return 0
+
     def monitor_movie(self, movie, interval='daily'):
-        """Monitor a single movie for rating changes from all sources.
+        """Monitor a single movie for rating changes from all sources, one after another.
 
         Args:
             movie: Movie dict with 'id', 'title', etc.
@@ -364,91 +629,89 @@ class RatingMonitor:
         print(f"  Monitoring: {movie['title']}")
         
         snapshots_created = 0
-        
-        # 1. Scrape Rotten Tomatoes
-        rt_ratings = self.scrape_rt_rating(movie['title'])
-        if rt_ratings:
-            review_counts = rt_ratings.pop('review_counts', {})
-            
-            # Store regular snapshots
-            for rating_type, rating_value in rt_ratings.items():
-                last_snapshot = self.get_last_snapshot(movie['id'], 'RottenTomatoes', rating_type)
-                
-                if not last_snapshot or last_snapshot['rating_value'] != rating_value:
-                    snapshot = self.store_snapshot(
-                        movie['id'], 
-                        'RottenTomatoes', 
-                        rating_type, 
-                        rating_value
-                    )
-                    if snapshot:
-                        snapshots_created += 1
-                        change = ""
-                        if last_snapshot:
-                            diff = rating_value - last_snapshot['rating_value']
-                            change = f" ({diff:+.1f})"
-                        print(f"    ✅ RT {rating_type}: {rating_value}{change}")
-            
-            # Store time-series snapshot
-            if review_counts:
-                try:
-                    daily_snapshot = self.store_daily_snapshot(
-                        movie['id'],
-                        'RottenTomatoes',
-                        rt_ratings,
-                        review_counts,
-                        interval=interval
-                    )
-                    if daily_snapshot:
-                        label = "Hourly" if interval == 'hourly' else "Daily"
-                        print(f"    📊 {label} snapshot: {daily_snapshot['total_reviews']} reviews (+{daily_snapshot['new_reviews_today']} new)")
-                except Exception as e:
-                    print(f"    ⚠️ Failed to store daily snapshot: {e}")
-            
-            self.log_scrape('RottenTomatoes', movie['id'], 'success', snapshots_created=snapshots_created)
-        else:
-            self.log_scrape('RottenTomatoes', movie['id'], 'error', error_message='No ratings found')
-        
-        # 2. Scrape IMDb
-        time.sleep(1)  # Rate limiting
-        imdb_ratings = self.scrape_imdb_rating(movie['title'])
-        if imdb_ratings:
-            for rating_type, rating_value in imdb_ratings.items():
-                last_snapshot = self.get_last_snapshot(movie['id'], 'IMDb', rating_type)
-                
-                if not last_snapshot or last_snapshot['rating_value'] != rating_value:
-                    snapshot = self.store_snapshot(
-                        movie['id'],
-                        'IMDb',
-                        rating_type,
-                        rating_value
-                    )
-                    if snapshot:
-                        snapshots_created += 1
-                        print(f"    ✅ IMDb {rating_type}: {rating_value}")
-            
-            self.log_scrape('IMDb', movie['id'], 'success', snapshots_created=snapshots_created)
-        
-        # 3. Scrape Metacritic
-        time.sleep(1)  # Rate limiting
-        mc_ratings = self.scrape_metacritic_rating(movie['title'])
-        if mc_ratings:
-            for rating_type, rating_value in mc_ratings.items():
-                last_snapshot = self.get_last_snapshot(movie['id'], 'Metacritic', rating_type)
-                
-                if not last_snapshot or last_snapshot['rating_value'] != rating_value:
-                    snapshot = self.store_snapshot(
-                        movie['id'],
-                        'Metacritic',
-                        rating_type,
-                        rating_value
-                    )
-                    if snapshot:
-                        snapshots_created += 1
-                        print(f"    ✅ Metacritic {rating_type}: {rating_value}")
-            
-            self.log_scrape('Metacritic', movie['id'], 'success', snapshots_created=snapshots_created)
-    
+        for i, source in enumerate(SOURCES):
+            if i > 0:
+                with metrics.timer('sleep'):
+                    time.sleep(1)  # Rate limiting
+            snapshots_created += self.monitor_source(movie, source, interval=interval)
+        return snapshots_created
+
+    def _monitor_task(self, movie, source, interval):
+        """monitor_source for worker threads: errors are logged, never raised"""
+        try:
+            return self.monitor_source(movie, source, interval=interval)
+        except Exception as e:
+            metrics.inc('errors', source)
+            print(f"  ❌ Error monitoring {movie['title']} on {source}: {e}")
+            self.log_scrape(source, movie['id'], 'error', error_message=str(e))
+            return 0
+
+    def _monitor_source_queue(self, movies, source, interval):
+        """Work through every movie for one source on its own worker pool"""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"scrape-{source}") as pool:
+            return sum(pool.map(lambda movie: self._monitor_task(movie, source, interval), movies))
+
+    def monitor_movies(self, movies, interval='daily'):
+        """Monitor a batch of movies, serially or with the sources in parallel.
+
+        In concurrent mode each source gets its own queue and token bucket,
+        so the batch takes as long as the slowest host's budget rather than
+        the sum of every source's requests and sleeps.
+        """
+        # One query each for the batch's cached page URLs and latest ratings
+        movie_ids = [movie['id'] for movie in movies]
+        with metrics.timer('db_read'):
+            self.url_cache.load(movie_ids)
+        self.load_latest_snapshots(movie_ids)
+
+        try:
+            if self.workers <= 1:
+                for movie in movies:
+                    try:
+                        self.monitor_movie(movie, interval=interval)
+                        with metrics.timer('sleep'):
+                            time.sleep(2)  # Rate limiting between movies
+                    except Exception as e:
+                        print(f"  ❌ Error monitoring {movie['title']}: {e}")
+                        self.log_scrape('RottenTomatoes', movie['id'], 'error', error_message=str(e))
+                return
+
+            if not self.rate_limiters:
+                self.load_rate_limits()
+            with ThreadPoolExecutor(max_workers=len(SOURCES)) as hosts:
+                futures = [hosts.submit(self._monitor_source_queue, movies, source, interval) for source in SOURCES]
+                snapshots_created = sum(f.result() for f in futures)
+            print(f"  📈 {snapshots_created} new snapshots across {len(movies)} movies")
+        finally:
+            # End of batch: write whatever the size/age thresholds have not
+            self.writer.flush()
+            self.report_cycle_stats()
+
+    def report_cycle_stats(self):
+        """Print and reset page and parse counters since the last report.
+
+        Unchanged pages were skipped by score digest, not-modified ones by a
+        304. A falling fast-path hit rate usually means a site changed its markup.
+        Ends with the cycle's timing summary as one JSON line.
+        """
+        with self._stats_lock:
+            pages, self.page_stats = self.page_stats, Counter()
+        if pages:
+            print(f"  📄 Pages: {pages['parsed']} parsed, {pages['unchanged']} unchanged, "
+                  f"{pages['not_modified']} not modified (304)")
+        if fast_extract.stats.snapshot():
+            print(f"  ⚡ Fast-path parses (hits/total): {fast_extract.stats.summary()}")
+            fast_extract.stats.reset()
+        degraded = [
+            f"{SOURCE_LABELS[source]} {self.breakers[source].state}, {int(self.concurrency[source].limit)}/{self.workers} slots"
+            for source in SOURCES
+            if self.breakers[source].state != CLOSED or int(self.concurrency[source].limit) < self.workers
+        ]
+        if degraded:
+            print(f"  🔌 Degraded sources: {'; '.join(degraded)}")
+        metrics.emit_cycle_summary('rating_monitor')
+        return pages
+
     def run_once(self, interval='daily'):
         """Run one monitoring cycle.
 
@@ -460,13 +723,7 @@ class RatingMonitor:
         movies = self.get_active_movies(days=30)
         print(f"Found {len(movies)} active movies")
 
-        for movie in movies:
-            try:
-                self.monitor_movie(movie, interval=interval)
-                time.sleep(2)  # Rate limiting between movies
-            except Exception as e:
-                print(f"  ❌ Error monitoring {movie['title']}: {e}")
-                self.log_scrape('RottenTomatoes', movie['id'], 'error', error_message=str(e))
+        self.monitor_movies(movies, interval=interval)
 
         print(f"✅ Cycle complete\n")
 
@@ -491,6 +748,16 @@ class RatingMonitor:
                 print(f"❌ Error in monitoring loop: {e}")
                 time.sleep(60)  # Wait 1 minute before retry
 
+    def print_savings_report(self, schedule=None):
+        """Print scrapes per day under the scheduled intervals vs the age tiers alone"""
+        report = (schedule or MonitorSchedule(self.conn, SOURCES)).savings_report()
+        if not report['pairs']:
+            print("   📉 No scheduled scrapes have completed yet")
+            return report
+        print(f"   📉 {report['policy_requests_per_day']} scrapes/day vs {report['age_requests_per_day']} age-based "
+              f"across {report['pairs']} movie-sources: {report['requests_saved_per_day']} saved ({report['saved_pct']}%)")
+        return report
+
     def get_movies_by_age(self, min_days, max_days):
         """Get movies released within a specific age range (days)"""
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -503,68 +770,172 @@ class RatingMonitor:
             cur.execute(query, (min_days, max_days))
             return cur.fetchall()
 
-    def run_adaptive(self):
-        """Run continuous monitoring with adaptive scheduling based on movie 'freshness'"""
-        print("🚀 Starting ADAPTIVE rating monitor")
-        print("   - 🔥 Hot (< 7 days): Every 30 mins")
-        print("   - 🎬 Active (7-30 days): Every 4 hours")
-        print("   - 📚 Archive (> 30 days): Every 24 hours")
+    def run_adaptive(self, resync_minutes=10, policy='volatility', min_interval=30, max_interval=1440,
+                     worker=False, lease_seconds=300):
+        """Run continuous monitoring with adaptive scheduling based on movie 'freshness'.
 
-        cycle_count = 0
-        interval_minutes = 30 # Base heartbeat
+        Every (movie, source) pair has a persistent deadline in monitor_schedule.
+        Due pairs are dispatched as soon as a worker slot for their source is
+        free, paced by the source's token bucket, so load is spread evenly
+        instead of arriving in per-tier bursts. Restarts resume from the stored
+        deadlines.
 
-        while True:
-            try:
-                print(f"\n🔄 Cycle {cycle_count} starting at {datetime.now().strftime('%H:%M')}")
-                
-                # 1. ALWAYS scrape Hot movies (0-7 days old)
-                hot_movies = self.get_movies_by_age(0, 7)
-                print(f"   🔥 Processing {len(hot_movies)} HOT movies...")
-                for movie in hot_movies:
-                    self.monitor_movie(movie, interval='hourly')
-                
-                
-                # 2. Active Cycles (7-30 days) - Check every 4 hours (interval=8)
-                if cycle_count % 8 == 0:
-                    print("  Checking Active Movies...")
-                    active_movies = self.get_movies_by_age(7, 30)
-                    for movie in active_movies:
-                        self.monitor_movie(movie, interval='daily')
-                        
-                # 3. Archive Cycles (30-90 days) - Check every 24 hours (interval=48)
-                if cycle_count % 48 == 0:
-                    print("  Checking Archive Movies...")
-                    archive_movies = self.get_movies_by_age(30, 90)
-                    for movie in archive_movies:
-                        self.monitor_movie(movie, interval='daily')
-
-                cycle_count += 1
-                print(f"⏳ Sleeping for {interval_minutes} minutes...")
-                time.sleep(interval_minutes * 60)
+        With worker=True the monitor_schedule table is a shared queue: any
+        number of worker processes, on any host, claim due pairs with
+        FOR UPDATE SKIP LOCKED under a lease, so no pair is scraped twice and
+        a crashed worker's claims are picked up once the lease expires.
 
-            except KeyboardInterrupt:
-                print("\n👋 Shutting down rating monitor")
-                break
-            except Exception as e:
-                print(f"❌ Error in monitoring loop: {e}")
-                time.sleep(60)
+        Args:
+            resync_minutes: How often to pick up new releases and drop aged-out movies
+            policy: 'volatility' sets each pair's interval from its recent rating
+                changes and review velocity; 'age' uses the freshness tiers alone
+            min_interval: Floor in minutes for volatility-based intervals
+            max_interval: Ceiling in minutes for volatility-based intervals
+            worker: Claim work from the shared queue alongside other workers
+            lease_seconds: How long a claim survives without renewal
+        """
+        worker_id = f"{socket.gethostname()}:{os.getpid()}" if worker else None
+        print(f"🚀 Starting ADAPTIVE rating monitor{f' as worker {worker_id}' if worker else ''}")
+        for (max_age, minutes, _), label in zip(TIERS, ["🔥 Hot", "🎬 Active", "📚 Archive"]):
+            print(f"   - {label} (< {max_age} days): every {minutes} mins")
+        if policy == 'volatility':
+            print(f"   - 📈 Adjusted by rating volatility within {min_interval}-{max_interval} mins")
+
+        self.parallel = True
+        self.load_rate_limits()
+        schedule = MonitorSchedule(
+            self.conn, SOURCES,
+            policy=VolatilityPolicy(self.conn, min_minutes=min_interval, max_minutes=max_interval)
+            if policy == 'volatility' else None,
+            worker_id=worker_id, lease_seconds=lease_seconds
+        )
+        pools = {
+            source: ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"scrape-{source}")
+            for source in SOURCES
+        }
+        in_flight = {}  # future -> (movie, source, due_at)
+        next_sync = None
+        next_renew = None
+
+        try:
+            while True:
+                try:
+                    now = datetime.now(timezone.utc)
+                    self.writer.flush_if_stale()
+
+                    # Reschedule finished work first so its slot is free this pass
+                    finished = [f for f in in_flight if f.done()]
+                    if finished and worker:
+                        # Snapshots must be stored before the lease is released
+                        self.writer.flush()
+                    for future in finished:
+                        movie, source, due_at = in_flight.pop(future)
+                        aged_out = tier_for(movie['release_date'], today=now.date()) is None
+                        if schedule.complete(movie, source, due_at, now=now) is None and worker and not aged_out:
+                            print(f"   ⚠️ Lease on {movie['title']} ({source}) expired before completion")
+
+                    if worker and (next_renew is None or now >= next_renew):
+                        schedule.renew()
+                        next_renew = now + timedelta(seconds=lease_seconds / 3)
+
+                    if next_sync is None or now >= next_sync:
+                        running = {(str(movie['id']), source) for movie, source, _ in in_flight.values()}
+                        scheduled = schedule.sync(exclude=running)
+                        self.url_cache.load(list(schedule.movies))
+                        self.load_latest_snapshots(list(schedule.movies))
+                        self.writer.flush()
+                        self.report_cycle_stats()
+                        print(f"🗓️  {now.strftime('%H:%M')} {scheduled} scheduled scrapes across {len(schedule.movies)} movies, {len(in_flight)} in flight")
+                        if schedule.policy:
+                            self.print_savings_report(schedule)
+                        next_sync = now + timedelta(minutes=resync_minutes)
+
+                    # Fill each source's free worker slots with its most overdue pairs
+                    claimed = []
+                    for source in SOURCES:
+                        if self.breakers[source].retry_in() > 0:
+                            continue  # Leave its pairs due until the circuit half-opens
+                        busy = sum(1 for _, s, _ in in_flight.values() if s == source)
+                        claimed += [(movie, source, due_at) for due_at, movie in schedule.pop_due(source, now, self.workers - busy)]
+                    if claimed and worker:
+                        # Other workers may have scraped these since our last sync
+                        claimed_ids = list({movie['id'] for movie, _, _ in claimed})
+                        self.url_cache.load(claimed_ids)
+                        self.load_latest_snapshots(claimed_ids)
+                    for movie, source, due_at in claimed:
+                        tier = tier_for(movie['release_date'], today=now.date())
+                        if tier is None:
+                            # Aged out since the last sync: drop the pair (and its lease)
+                            schedule.complete(movie, source, due_at, now=now)
+                            continue
+                        snapshot_interval = tier[1]
+                        future = pools[source].submit(self._monitor_task, movie, source, snapshot_interval)
+                        in_flight[future] = (movie, source, due_at)
+
+                    # Sleep until the next deadline, but wake often enough to reap finished work
+                    next_due = schedule.next_due_at()
+                    wait = 60 if next_due is None else (next_due - now).total_seconds()
+                    time.sleep(min(max(wait, 0.5), 5 if in_flight else self.writer.max_age_seconds))
+
+                except KeyboardInterrupt:
+                    print("\n👋 Shutting down rating monitor")
+                    break
+                except Exception as e:
+                    print(f"❌ Error in monitoring loop: {e}")
+                    time.sleep(60)
+        finally:
+            # Pairs still in flight keep their stored deadline and rerun after restart
+            for pool in pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            self.writer.flush()
+            released = schedule.release()
+            if released:
+                print(f"   ↩️  Released {released} claimed scrapes back to the queue")
 
 if __name__ == "__main__":
     import sys
     import argparse
 
     parser = argparse.ArgumentParser(description='Movie Rating Monitor')
-    parser.add_argument('--adaptive', action='store_true', help='Run with adaptive scheduling')
+    parser.add_argument('--adaptive', action='store_true', help='Run with adaptive deadline scheduling (resumes after restart)')
+    parser.add_argument('--worker', action='store_true',
+                        help='Adaptive scheduling as one of several workers sharing the monitor_schedule queue')
+    parser.add_argument('--lease-seconds', type=int, default=300,
+                        help='How long a worker holds a claimed scrape without renewing (default: 300)')
     parser.add_argument('--continuous', action='store_true', help='Run continuously (legacy mode)')
     parser.add_argument('--interval', type=int, default=60, help='Minutes between cycles (default: 60)')
     parser.add_argument('--snapshots', choices=['hourly', 'daily'], default='daily',
                         help='Snapshot granularity: hourly or daily (default: daily)')
+    parser.add_argument('--policy', choices=['volatility', 'age'], default='volatility',
+                        help='Adaptive scrape intervals from rating volatility or release age alone (default: volatility)')
+    parser.add_argument('--min-interval', type=int, default=30,
+                        help='Shortest volatility-based scrape interval in minutes (default: 30)')
+    parser.add_argument('--max-interval', type=int, default=1440,
+                        help='Longest volatility-based scrape interval in minutes (default: 1440)')
+    parser.add_argument('--savings-report', action='store_true',
+                        help='Print scrapes/day saved by the adaptive policy vs age tiers and exit')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Concurrent scrapes per source; 1 = serial (default: 1)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics on this local port (default: METRICS_PORT, off if unset)')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='Processes for HTML parsing; 0 = parse serially (default: PARSE_POOL_SIZE or CPU count)')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    monitor = RatingMonitor()
-
-    if args.adaptive:
-        monitor.run_adaptive()
+    start_metrics_server(args.metrics_port)
+    monitor = RatingMonitor(workers=args.workers, parse_workers=args.parse_workers)
+
+    if args.savings_report:
+        monitor.print_savings_report()
+    elif args.profile:
+        # Profile exactly one cycle, whatever the run mode
+        with profiled('rating_monitor', args):
+            monitor.run_once(interval=args.snapshots)
+        monitor.close()
+    elif args.adaptive or args.worker:
+        monitor.run_adaptive(policy=args.policy, min_interval=args.min_interval, max_interval=args.max_interval,
+                             worker=args.worker, lease_seconds=args.lease_seconds)
     elif args.continuous:
         monitor.run_continuous(interval_minutes=args.interval, snapshot_interval=args.snapshots)
     else:
@@ -3,12 +3,15 @@ Agent 1: Daily Release Tracker
 Fetches all new movie releases globally from TMDb API
 """
 import os
-import psycopg2
+import sys
 from psycopg2.extras import RealDictCursor
 from datetime import datetime, timedelta
-import requests
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import get_pool
+from http_client import get_http_client
+
 load_dotenv()
 
 class ReleaseTracker:
@@ -16,18 +19,12 @@ class ReleaseTracker:
         self.tmdb_api_key = os.environ.get("TMDB_API_KEY")
         self.tmdb_base_url = "https://api.themoviedb.org/3"
         
-        self.conn = psycopg2.connect(
-            host=os.environ.get("DB_HOST"),
-            port=os.environ.get("DB_PORT"),
-            database=os.environ.get("DB_NAME"),
-            user=os.environ.get("DB_USER"),
-            password=os.environ.get("DB_PASSWORD")
-        )
-        self.conn.autocommit = True
-        
-        with self.conn.cursor() as cur:
-            cur.execute("SET search_path TO movie_platform;")
+        self.conn = get_pool().getconn()
     
+    def close(self):
+        """Return the pooled connection"""
+        get_pool().putconn(self.conn)
+
     def fetch_releases(self, date, regions=None):
         """Fetch movies released on a specific date across regions"""
         if regions is None:
@@ -47,7 +44,7 @@ class ReleaseTracker:
             }
             
             try:
-                response = requests.get(url, params=params, timeout=10)
+                response = get_http_client().get(url, params=params, timeout=10)
                 response.raise_for_status()
                 data = response.json()
                 
@@ -74,7 +71,7 @@ class ReleaseTracker:
         params = {'api_key': self.tmdb_api_key}
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = get_http_client().get(url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -161,7 +158,7 @@ class ReleaseTracker:
         
         print(f"\n✅ Stored {stored_count} movies")
         
-        self.conn.close()
+        self.close()
 
 if __name__ == "__main__":
     tracker = ReleaseTracker()
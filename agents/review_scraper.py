@@ -1,26 +1,25 @@
 import os
-import psycopg2
+import sys
+import argparse
 from psycopg2.extras import RealDictCursor
 from datetime import datetime
 from dotenv import load_dotenv
 from playwright.sync_api import sync_playwright
 from langdetect import detect, LangDetectException
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import get_pool
+from profiling import add_profile_arguments, profiled
+
 load_dotenv()
 
 class ReviewScraper:
     def __init__(self):
-        self.conn = psycopg2.connect(
-            host=os.environ.get("DB_HOST", "127.0.0.1"),
-            port=os.environ.get("DB_PORT", "54322"),
-            database=os.environ.get("DB_NAME", "postgres"),
-            user=os.environ.get("DB_USER", "postgres"),
-            password=os.environ.get("DB_PASSWORD", "postgres")
-        )
-        self.conn.autocommit = True
-        
-        with self.conn.cursor() as cur:
-            cur.execute("SET search_path TO movie_platform;")
+        self.conn = get_pool().getconn()
+
+    def close(self):
+        """Return the pooled connection"""
+        get_pool().putconn(self.conn)
 
     def get_movies_to_scrape(self, limit=20):
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -184,8 +183,13 @@ class ReviewScraper:
         print("🕷️ Starting Playwright Review Scraper...")
         movies = self.get_movies_to_scrape()
         self.scrape_with_playwright(movies)
-        self.conn.close()
+        self.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Playwright Review Scraper')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
     scraper = ReviewScraper()
-    scraper.run()
+    with profiled('review_scraper', args):
+        scraper.run()
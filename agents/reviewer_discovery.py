@@ -3,29 +3,26 @@ Agent 2: Reviewer Discovery
 Builds and maintains database of top reviewers per region
 """
 import os
-import psycopg2
+import sys
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
-import requests
 from bs4 import BeautifulSoup
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import get_pool
+from http_client import get_http_client
+
 load_dotenv()
 
 class ReviewerDiscovery:
     def __init__(self):
-        self.conn = psycopg2.connect(
-            host=os.environ.get("DB_HOST"),
-            port=os.environ.get("DB_PORT"),
-            database=os.environ.get("DB_NAME"),
-            user=os.environ.get("DB_USER"),
-            password=os.environ.get("DB_PASSWORD")
-        )
-        self.conn.autocommit = True
-        
-        with self.conn.cursor() as cur:
-            cur.execute("SET search_path TO movie_platform;")
+        self.conn = get_pool().getconn()
     
+    def close(self):
+        """Return the pooled connection"""
+        get_pool().putconn(self.conn)
+
     def scrape_rotten_tomatoes_critics(self):
         """Scrape top critics from Rotten Tomatoes"""
         url = "https://editorial.rottentomatoes.com/otg-article/top-critics-list/"
@@ -34,7 +31,7 @@ class ReviewerDiscovery:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = get_http_client().get(url, headers=headers, timeout=10)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             
@@ -106,7 +103,7 @@ class ReviewerDiscovery:
                 print(f"  ❌ Error storing {critic['name']}: {e}")
         
         print(f"\n✅ Stored {stored_count} reviewers")
-        self.conn.close()
+        self.close()
 
 if __name__ == "__main__":
     discovery = ReviewerDiscovery()
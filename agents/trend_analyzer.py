@@ -3,31 +3,79 @@ Agent 4: Trend Analyzer
 Analyzes daily review snapshots and classifies movie trends
 """
 import os
+import sys
+import argparse
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import statistics
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import get_pool
+from trend_batch import SNAPSHOT_ORDER, load_snapshot_columns, classify_columns
+from trend_sql import TRENDS_QUERY, classify_trends_sql, query_params
+from metrics import metrics
+from profiling import add_profile_arguments, profiled
+
 load_dotenv()
 
+# movie_trends columns written per classification, after movie_id
+TREND_COLUMNS = (
+    'trend_status', 'trend_confidence',
+    'avg_daily_reviews', 'review_growth_rate', 'score_momentum',
+    'has_suspicious_activity', 'spike_detected', 'spike_date', 'spike_magnitude',
+    'snapshots_through', 'snapshot_count'
+)
+
+SPIKE_COLUMNS = ('has_suspicious_activity', 'spike_detected', 'spike_date', 'spike_magnitude')
+
+# A spike the monitor flagged on ingest (stream_stats) survives a window
+# classification that does not see one, until it falls out of the window.
+# Any other rewrite of the spike columns clears spike_flagged_at, so the
+# analyzer's own spikes are never mistaken for ingest flags later.
+KEEP_INGEST_SPIKE = """
+    NOT EXCLUDED.spike_detected
+    AND movie_trends.spike_flagged_at IS NOT NULL
+    AND movie_trends.spike_date >= CURRENT_DATE - INTERVAL '7 days'
+"""
+
+
+def _upsert_assignment(column):
+    if column in SPIKE_COLUMNS:
+        return f"{column} = CASE WHEN {KEEP_INGEST_SPIKE} THEN movie_trends.{column} ELSE EXCLUDED.{column} END"
+    return f"{column} = EXCLUDED.{column}"
+
+
+UPSERT_CONFLICT = f"""
+    ON CONFLICT (movie_id) DO UPDATE SET
+        {', '.join(_upsert_assignment(column) for column in TREND_COLUMNS)},
+        spike_flagged_at = CASE WHEN {KEEP_INGEST_SPIKE} THEN movie_trends.spike_flagged_at END,
+        last_calculated_at = NOW()
+"""
+
+UPSERT_TRENDS = f"""
+    INSERT INTO movie_trends (movie_id, {', '.join(TREND_COLUMNS)})
+    VALUES %s
+""" + UPSERT_CONFLICT
+
+# Classify and store in one server-side statement (see trend_sql)
+UPSERT_TRENDS_SQL = f"""
+    INSERT INTO movie_trends (movie_id, {', '.join(TREND_COLUMNS)})
+    SELECT movie_id, {', '.join(TREND_COLUMNS)} FROM ({TRENDS_QUERY}) trends
+""" + UPSERT_CONFLICT
+
 class TrendAnalyzer:
     def __init__(self):
-        self.conn = psycopg2.connect(
-            host=os.environ.get("DB_HOST"),
-            port=os.environ.get("DB_PORT"),
-            database=os.environ.get("DB_NAME"),
-            user=os.environ.get("DB_USER"),
-            password=os.environ.get("DB_PASSWORD")
-        )
-        self.conn.autocommit = True
-        
-        with self.conn.cursor() as cur:
-            cur.execute("SET search_path TO movie_platform;")
+        self.conn = get_pool().getconn()
     
+    def close(self):
+        """Return the pooled connection"""
+        get_pool().putconn(self.conn)
+
     def get_active_movies(self, days=30):
         """Get movies released in the last N days"""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with metrics.timer('db_read'), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
             query = """
                 SELECT * FROM movies 
                 WHERE release_date > NOW() - INTERVAL '%s days'
@@ -38,12 +86,12 @@ class TrendAnalyzer:
     
     def get_daily_snapshots(self, movie_id, days=7):
         """Get daily snapshots for a movie"""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            query = """
+        with metrics.timer('db_read'), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            query = f"""
                 SELECT * FROM daily_review_snapshots
                 WHERE movie_id = %s
                 AND snapshot_date >= CURRENT_DATE - INTERVAL '%s days'
-                ORDER BY snapshot_date ASC;
+                ORDER BY {SNAPSHOT_ORDER};
             """
             cur.execute(query, (movie_id, days))
             return cur.fetchall()
@@ -124,10 +172,76 @@ class TrendAnalyzer:
         
         return False, None, 0.0
     
+    def snapshot_marks(self, movie_ids, days=7):
+        """Current and stored high-water marks of each movie's snapshot window, in one query.
+
+        Returns {movie_id: {'snapshots_through', 'snapshot_count', 'changed'}};
+        `changed` is True when the window's newest write or row count differs
+        from what the stored classification was computed from (or there is none).
+        """
+        with metrics.timer('db_read'), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT
+                    m.id AS movie_id,
+                    w.snapshots_through,
+                    w.snapshot_count,
+                    t.movie_id IS NULL
+                        OR t.snapshots_through IS DISTINCT FROM w.snapshots_through
+                        OR t.snapshot_count IS DISTINCT FROM w.snapshot_count AS changed
+                FROM movies m
+                CROSS JOIN LATERAL (
+                    SELECT MAX(s.updated_at) AS snapshots_through, COUNT(*)::integer AS snapshot_count
+                    FROM daily_review_snapshots s
+                    WHERE s.movie_id = m.id
+                    AND s.snapshot_date >= CURRENT_DATE - INTERVAL '%s days'
+                ) w
+                LEFT JOIN movie_trends t ON t.movie_id = m.id
+                WHERE m.id = ANY(%s::uuid[]);
+            """, (days, [str(m) for m in movie_ids]))
+            return {str(row.pop('movie_id')): row for row in cur.fetchall()}
+
     def classify_trend(self, movie_id):
         """Classify movie trend status"""
-        snapshots = self.get_daily_snapshots(movie_id, days=7)
-        
+        return self.classify_snapshots(self.get_daily_snapshots(movie_id, days=7))
+
+    def classify_trends_batch(self, movie_ids, days=7):
+        """classify_trend for many movies: one query, vectorised metrics.
+
+        Returns {movie_id: trend dict}, identical to calling classify_trend on each.
+        """
+        with metrics.timer('db_read'):
+            columns = load_snapshot_columns(self.conn, movie_ids, days=days)
+        with metrics.timer('compute'):
+            trends = classify_columns(columns, self.detect_anomalies)
+        empty = self.classify_snapshots([])
+        return {str(movie_id): trends.get(str(movie_id), dict(empty)) for movie_id in movie_ids}
+
+    def classify_trends_sql(self, movie_ids, days=7):
+        """classify_trend for many movies, computed by Postgres in one statement.
+
+        Returns {movie_id: trend dict}, including the window marks
+        (snapshots_through, snapshot_count); statuses and spikes match
+        classify_trend, float metrics agree to rounding.
+        """
+        with metrics.timer('db_read'):
+            return classify_trends_sql(self.conn, movie_ids, days=days)
+
+    def store_trends_sql(self, movie_ids, days=7):
+        """Classify and upsert every listed movie without fetching any snapshots.
+
+        Returns the stored rows' movie_id and headline fields, for reporting.
+        """
+        if not movie_ids:
+            return []
+        with metrics.timer('db_write'), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(UPSERT_TRENDS_SQL + """
+                RETURNING movie_id, trend_status, avg_daily_reviews, review_growth_rate,
+                          has_suspicious_activity, spike_date, spike_magnitude;
+            """, query_params(movie_ids, days))
+            return cur.fetchall()
+
+    def classify_snapshots(self, snapshots):
+        """Classify a movie's trend from its snapshots, oldest first"""
         if not snapshots:
             return {
                 'trend_status': 'stable',
@@ -188,81 +302,136 @@ class TrendAnalyzer:
             'spike_magnitude': spike_magnitude
         }
     
+    def _trend_values(self, movie_id, trend_data):
+        # High-water marks are absent when classifying outside analyze_all; NULL forces a recompute
+        return (movie_id,) + tuple(trend_data.get(column) for column in TREND_COLUMNS)
+
     def store_trend(self, movie_id, trend_data):
         """Store trend classification in database"""
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            query = """
-                INSERT INTO movie_trends (
-                    movie_id, trend_status, trend_confidence,
-                    avg_daily_reviews, review_growth_rate, score_momentum,
-                    has_suspicious_activity, spike_detected, spike_date, spike_magnitude
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (movie_id) DO UPDATE SET
-                    trend_status = EXCLUDED.trend_status,
-                    trend_confidence = EXCLUDED.trend_confidence,
-                    avg_daily_reviews = EXCLUDED.avg_daily_reviews,
-                    review_growth_rate = EXCLUDED.review_growth_rate,
-                    score_momentum = EXCLUDED.score_momentum,
-                    has_suspicious_activity = EXCLUDED.has_suspicious_activity,
-                    spike_detected = EXCLUDED.spike_detected,
-                    spike_date = EXCLUDED.spike_date,
-                    spike_magnitude = EXCLUDED.spike_magnitude,
-                    last_calculated_at = NOW()
-                RETURNING *;
-            """
-            
-            cur.execute(query, (
-                movie_id,
-                trend_data['trend_status'],
-                trend_data['trend_confidence'],
-                trend_data['avg_daily_reviews'],
-                trend_data['review_growth_rate'],
-                trend_data['score_momentum'],
-                trend_data['has_suspicious_activity'],
-                trend_data['spike_detected'],
-                trend_data['spike_date'],
-                trend_data['spike_magnitude']
-            ))
-            
-            return cur.fetchone()
-    
-    def analyze_all(self):
-        """Analyze trends for all active movies"""
-        print("🔍 Analyzing movie trends...")
+        with metrics.timer('db_write'), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            rows = execute_values(cur, UPSERT_TRENDS + " RETURNING *;", [self._trend_values(movie_id, trend_data)], fetch=True)
+            return rows[0] if rows else None
+
+    def store_trends(self, trends, returning=False, page_size=1000):
+        """Upsert many classifications in multi-row statements.
+
+        Args:
+            trends: {movie_id: trend dict}
+            returning: Fetch back the stored rows (otherwise only counted)
+            page_size: Rows per statement, so a run costs ceil(N / page_size) round-trips
+
+        Returns:
+            The stored rows if `returning`, else how many were written
+        """
+        values = [self._trend_values(movie_id, trend_data) for movie_id, trend_data in trends.items()]
+        if not values:
+            return [] if returning else 0
+        query = UPSERT_TRENDS + (" RETURNING *;" if returning else " RETURNING 1;")
+        try:
+            with metrics.timer('db_write'), self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                rows = execute_values(cur, query, values, page_size=page_size, fetch=True)
+        except psycopg2.Error as e:
+            # One bad row (e.g. a movie deleted mid-run) should not drop the batch
+            print(f"    ⚠️ Bulk trend upsert failed ({e.pgcode}), retrying {len(values)} rows individually")
+            rows = []
+            for movie_id, trend_data in trends.items():
+                try:
+                    stored = self.store_trend(movie_id, trend_data)
+                except psycopg2.Error as row_error:
+                    print(f"    ❌ Dropped trend for {movie_id}: {row_error}")
+                    continue
+                if stored:
+                    rows.append(stored)
+        return rows if returning else len(rows)
+
+    def _report_trend(self, trend_data):
+        status_icon = {
+            'trending_up': '🔥',
+            'trending_down': '📉',
+            'sleeper_hit': '💎',
+            'stable': '➡️'
+        }.get(trend_data['trend_status'], '❓')
+
+        print(f"    {status_icon} Status: {trend_data['trend_status']}")
+        print(f"    📊 Avg daily reviews: {trend_data['avg_daily_reviews']:.1f}")
+        print(f"    📈 Growth rate: {trend_data['review_growth_rate']:+.1f}%")
+
+        if trend_data['has_suspicious_activity']:
+            print(f"    ⚠️ Spike detected on {trend_data['spike_date']} ({trend_data['spike_magnitude']:.1f}σ)")
+
+    def analyze_all(self, batch=False, incremental=False, sql=False):
+        """Analyze trends for all active movies.
+
+        Args:
+            batch: Load every movie's snapshots in one query and classify them
+                with vectorised NumPy code instead of one query per movie
+            incremental: Only recompute movies whose snapshot window changed
+                since their stored classification
+            sql: Classify and store every movie in one server-side statement;
+                no snapshot rows are fetched
+        """
+        if batch and sql:
+            raise ValueError("batch and sql are alternative backends")
+        modes = ", ".join(name for name, on in (('batch', batch), ('sql', sql), ('incremental', incremental)) if on)
+        print(f"🔍 Analyzing movie trends{f' ({modes})' if modes else ''}...")
         
         movies = self.get_active_movies(days=30)
         print(f"Found {len(movies)} active movies")
-        
-        analyzed_count = 0
-        for movie in movies:
-            try:
-                print(f"\n  Analyzing: {movie['title']}")
-                trend_data = self.classify_trend(movie['id'])
-                
-                stored_trend = self.store_trend(movie['id'], trend_data)
-                if stored_trend:
-                    status_icon = {
-                        'trending_up': '🔥',
-                        'trending_down': '📉',
-                        'sleeper_hit': '💎',
-                        'stable': '➡️'
-                    }.get(trend_data['trend_status'], '❓')
-                    
-                    print(f"    {status_icon} Status: {trend_data['trend_status']}")
-                    print(f"    📊 Avg daily reviews: {trend_data['avg_daily_reviews']:.1f}")
-                    print(f"    📈 Growth rate: {trend_data['review_growth_rate']:+.1f}%")
-                    
-                    if trend_data['has_suspicious_activity']:
-                        print(f"    ⚠️ Spike detected on {trend_data['spike_date']} ({trend_data['spike_magnitude']:.1f}σ)")
-                    
-                    analyzed_count += 1
-                    
-            except Exception as e:
-                print(f"    ❌ Error analyzing {movie['title']}: {e}")
-        
-        print(f"\n✅ Analyzed {analyzed_count} movies")
-        self.conn.close()
+
+        # Read before the snapshots, so a row landing mid-run is picked up next time
+        # (the sql backend computes its own from the rows it reads)
+        marks = self.snapshot_marks([movie['id'] for movie in movies]) if incremental or not sql else None
+        skipped = 0
+        if incremental:
+            changed = [movie for movie in movies if marks[str(movie['id'])]['changed']]
+            skipped = len(movies) - len(changed)
+            movies = changed
+            print(f"⏭️  Skipping {skipped} movies with no new snapshots")
+
+        if sql:
+            stored = {str(row['movie_id']): row for row in self.store_trends_sql([movie['id'] for movie in movies])}
+            for movie in movies:
+                if str(movie['id']) in stored:
+                    print(f"\n  Analyzed: {movie['title']}")
+                    self._report_trend(stored[str(movie['id'])])
+            analyzed_count = len(stored)
+        else:
+            batch_trends = self.classify_trends_batch([movie['id'] for movie in movies]) if batch else None
+
+            trends = {}
+            for movie in movies:
+                try:
+                    print(f"\n  Analyzing: {movie['title']}")
+                    if batch_trends is not None:
+                        trend_data = batch_trends[str(movie['id'])]
+                    else:
+                        trend_data = self.classify_trend(movie['id'])
+                    mark = marks[str(movie['id'])]
+                    trends[movie['id']] = dict(trend_data, snapshots_through=mark['snapshots_through'],
+                                               snapshot_count=mark['snapshot_count'])
+                    self._report_trend(trend_data)
+
+                except Exception as e:
+                    print(f"    ❌ Error analyzing {movie['title']}: {e}")
+
+            # Every classification from the run in ceil(N / 1000) statements
+            analyzed_count = self.store_trends(trends)
+        print(f"\n✅ Analyzed {analyzed_count} movies{f', skipped {skipped} unchanged' if incremental else ''}")
+        metrics.emit_cycle_summary('trend_analyzer', movies=len(movies) + skipped, analyzed=analyzed_count, skipped=skipped)
+        self.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Movie Trend Analyzer')
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument('--batch', action='store_true',
+                         help='Classify all movies from one snapshot query with vectorised NumPy code')
+    backend.add_argument('--sql', action='store_true',
+                         help='Classify and store all movies in one server-side SQL statement')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only recompute movies with new or changed snapshots since their last classification')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
     analyzer = TrendAnalyzer()
-    analyzer.analyze_all()
+    with profiled('trend_analyzer', args):
+        analyzer.analyze_all(batch=args.batch, incremental=args.incremental, sql=args.sql)
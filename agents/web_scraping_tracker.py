@@ -3,31 +3,26 @@ Alternative Release Tracker - Web Scraping Based
 Scrapes movie releases from Rotten Tomatoes instead of TMDb API
 """
 import os
-import psycopg2
+import sys
 from psycopg2.extras import RealDictCursor
 from datetime import datetime, timedelta
-import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 import time
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import get_pool
+from http_client import get_http_client
+from scrapers import fast_extract
+from scrapers.page_parsers import parse_rt_movie_details
+from scrapers.parse_pool import get_parse_pool
 
 load_dotenv()
 
 class WebScrapingReleaseTracker:
     def __init__(self):
-        self.conn = psycopg2.connect(
-            host=os.environ.get("DB_HOST"),
-            port=os.environ.get("DB_PORT"),
-            database=os.environ.get("DB_NAME"),
-            user=os.environ.get("DB_USER"),
-            password=os.environ.get("DB_PASSWORD")
-        )
-        self.conn.autocommit = True
-
-        with self.conn.cursor() as cur:
-            cur.execute("SET search_path TO movie_platform;")
+        self.conn = get_pool().getconn()
 
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -37,6 +32,10 @@ class WebScrapingReleaseTracker:
         self.tmdb_api_key = os.environ.get("TMDB_API_KEY")
         self.tmdb_base_url = "https://api.themoviedb.org/3"
     
+    def close(self):
+        """Return the pooled connection"""
+        get_pool().putconn(self.conn)
+
     def scrape_rt_new_releases(self):
         """Scrape new releases from Rotten Tomatoes"""
         movies = []
@@ -45,7 +44,7 @@ class WebScrapingReleaseTracker:
         url = "https://www.rottentomatoes.com/browse/movies_in_theaters/"
 
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = get_http_client().get(url, headers=self.headers, timeout=15)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -101,87 +100,10 @@ class WebScrapingReleaseTracker:
 
     def scrape_movie_details(self, movie_url, movie_title):
         """Scrape detailed info from a movie page"""
-        import json
-
         try:
-            response = requests.get(movie_url, headers=self.headers, timeout=15)
+            response = get_http_client().get(movie_url, headers=self.headers, timeout=15)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            details = {}
-
-            # Try to find release date
-            release_elem = soup.find(string=re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d+,\s+\d{4}'))
-            if release_elem:
-                details['release_date'] = release_elem.strip()
-
-            # POSTER EXTRACTION - Multiple methods for reliability
-            poster_url = None
-
-            # Method 1: JSON-LD schema (most reliable, unique per movie)
-            for script in soup.select('script[type="application/ld+json"]'):
-                try:
-                    data = json.loads(script.string)
-                    if data.get('@type') == 'Movie' and data.get('image'):
-                        poster_url = data['image']
-                        print(f"    ✅ Got poster from JSON-LD")
-                        break
-                except:
-                    pass
-
-            # Method 2: og:image meta tag
-            if not poster_url:
-                og_image = soup.select_one('meta[property="og:image"]')
-                if og_image and og_image.get('content'):
-                    poster_url = og_image['content']
-                    print(f"    ✅ Got poster from og:image")
-
-            # Method 3: Fallback to rt-img with movie title in alt
-            if not poster_url:
-                # Look for poster image matching movie title
-                for img in soup.select('rt-img'):
-                    alt = img.get('alt', '').lower()
-                    if 'poster' in alt and movie_title.lower().split()[0] in alt:
-                        src = img.get('src') or img.get('srcset', '').split(',')[0].split(' ')[0]
-                        if src and 'flixster' in src:
-                            poster_url = src
-                            print(f"    ✅ Got poster from rt-img")
-                            break
-
-            if poster_url:
-                details['poster_url'] = poster_url
-            else:
-                print(f"    ⚠️ No poster found")
-
-            # Try to find genre
-            genre_elems = soup.select('[data-qa="movie-info-item-value"]')
-            if genre_elems:
-                details['genres'] = [g.text.strip() for g in genre_elems[:3]]
-
-            # Try to find overview/synopsis
-            overview = soup.select_one('[data-qa="movie-info-synopsis"], .movie_synopsis')
-            if overview:
-                details['overview'] = overview.text.strip()
-
-            # Try to find "Original Language"
-            # It's usually in a list of info items. We need to find the label "Original Language" and get the value.
-            # RT struture: <li class="info-item"> <span class="label">Original Language:</span> <span class="value">English</span> </li>
-            
-            # Generic finder for info items
-            info_items = soup.select('li.info-item, .meta-row')
-            for item in info_items:
-                label = item.select_one('.label, .meta-label')
-                value = item.select_one('.value, .meta-value')
-                
-                if label and value and 'language' in label.text.lower():
-                    details['original_language'] = value.text.strip().split()[0].lower() # "English" -> "english" -> "en" (simplified)
-                    # Map common full names to codes if needed, or store full name
-                    # For consistency with schema (varchar 10), store standardized if possible
-                    lang_map = {'english': 'en', 'spanish': 'es', 'french': 'fr', 'german': 'de', 'japanese': 'ja', 'korean': 'ko', 'hindi': 'hi'}
-                    details['original_language'] = lang_map.get(details['original_language'].lower(), details['original_language'][:2])
-                    print(f"    ✅ Found Language: {details['original_language']}")
-
-            return details
+            return get_parse_pool().parse(parse_rt_movie_details, response.text, movie_title)
 
         except Exception as e:
             print(f"  Error scraping details: {e}")
@@ -322,7 +244,9 @@ class WebScrapingReleaseTracker:
                 print(f"  ❌ Error processing {movie['title']}: {e}")
         
         print(f"\n✅ Successfully stored {stored_count} movies")
-        self.conn.close()
+        if fast_extract.stats.snapshot():
+            print(f"⚡ Fast-path parses (hits/total): {fast_extract.stats.summary()}")
+        self.close()
 
 if __name__ == "__main__":
     tracker = WebScrapingReleaseTracker()
@@ -1,10 +1,11 @@
 import os
+import sys
 import psycopg2
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def setup_db():
+def setup_db(sql_file="setup_schema.sql"):
     conn = None
     try:
         conn = psycopg2.connect(
@@ -16,9 +17,9 @@ def setup_db():
         )
         conn.autocommit = True
         with conn.cursor() as cur:
-            with open("setup_schema.sql", "r") as f:
+            with open(sql_file, "r") as f:
                 sql = f.read()
-                print("Executing setup_schema.sql...")
+                print(f"Executing {sql_file}...")
                 cur.execute(sql)
                 print("Schema and tables created successfully.")
     except Exception as e:
@@ -28,4 +29,5 @@ def setup_db():
             conn.close()
 
 if __name__ == "__main__":
-    setup_db()
+    # Optional argument: migration file to apply (default: setup_schema.sql)
+    setup_db(*sys.argv[1:2])
@@ -1,27 +1,20 @@
-import os
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from dotenv import load_dotenv
-
-load_dotenv()
+from psycopg2.extras import RealDictCursor, execute_values
+from db_pool import get_pool
 
 class Database:
     def __init__(self):
         try:
-            self.conn = psycopg2.connect(
-                host=os.environ.get("DB_HOST", "127.0.0.1"),
-                port=os.environ.get("DB_PORT", "5432"),
-                database=os.environ.get("DB_NAME", "postgres"),
-                user=os.environ.get("DB_USER", "postgres"),
-                password=os.environ.get("DB_PASSWORD", "postgres")
-            )
-            self.conn.autocommit = True
-            with self.conn.cursor() as cur:
-                cur.execute("SET search_path TO movie_platform;")
+            self.conn = get_pool().getconn()
         except Exception as e:
             print(f"Error connecting to database: {e}")
             self.conn = None
 
+    def close(self):
+        """Return the pooled connection"""
+        if self.conn:
+            get_pool().putconn(self.conn)
+            self.conn = None
+
     def upsert_reviewer(self, reviewer_data):
         if not self.conn: return None
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -42,8 +35,12 @@ class Database:
         if not self.conn: return
         with self.conn.cursor() as cur:
             query = """
-                INSERT INTO reviews (reviewer_id, movie_title, rating, content, review_date, source_url)
-                VALUES (%(reviewer_id)s, %(movie_title)s, %(rating)s, %(content)s, %(review_date)s, %(source_url)s);
+                INSERT INTO reviews (reviewer_id, movie_id, movie_title, rating, content, review_date, source_url)
+                VALUES (
+                    %(reviewer_id)s,
+                    (SELECT id FROM movies WHERE title = %(movie_title)s ORDER BY popularity DESC NULLS LAST LIMIT 1),
+                    %(movie_title)s, %(rating)s, %(content)s, %(review_date)s, %(source_url)s
+                );
             """
             cur.execute(query, review_data)
 
@@ -78,6 +75,54 @@ class Database:
             cur.execute(query, region_data)
             return cur.fetchone()
 
+    def upsert_movies_bulk(self, movies):
+        """Upsert many movies in one multi-row statement.
+
+        Rows repeating a tmdb_id (e.g. the same title found in several
+        regions) are collapsed to their first occurrence, since one
+        INSERT ... ON CONFLICT cannot touch the same row twice.
+        Returns a {tmdb_id: id} mapping for the region insert.
+        """
+        if not self.conn or not movies: return {}
+        unique = {}
+        for movie in movies:
+            if movie.get('tmdb_id') is not None:
+                unique.setdefault(movie['tmdb_id'], movie)
+        rows = list(unique.values())
+        with self.conn.cursor() as cur:
+            query = """
+                INSERT INTO movies (tmdb_id, title, original_title, release_date, region, language, overview, vote_average, vote_count, popularity, poster_path, backdrop_path, genre_ids, adult, video, trending_score)
+                VALUES %s
+                ON CONFLICT (tmdb_id) DO UPDATE SET
+                    title = EXCLUDED.title,
+                    vote_average = EXCLUDED.vote_average,
+                    vote_count = EXCLUDED.vote_count,
+                    popularity = EXCLUDED.popularity,
+                    trending_score = EXCLUDED.trending_score
+                RETURNING tmdb_id, id;
+            """
+            template = "(%(tmdb_id)s, %(title)s, %(original_title)s, %(release_date)s, %(region)s, %(language)s, %(overview)s, %(vote_average)s, %(vote_count)s, %(popularity)s, %(poster_path)s, %(backdrop_path)s, %(genre_ids)s, %(adult)s, %(video)s, %(trending_score)s)"
+            result = execute_values(cur, query, rows, template=template, page_size=len(rows), fetch=True)
+            return {tmdb_id: movie_id for tmdb_id, movie_id in result}
+
+    def upsert_movie_regions_bulk(self, regions):
+        """Upsert many (movie_id, region_code) rows in one statement. Returns rows written."""
+        if not self.conn or not regions: return 0
+        unique = {}
+        for region in regions:
+            unique[(region['movie_id'], region['region_code'])] = region
+        rows = list(unique.values())
+        with self.conn.cursor() as cur:
+            query = """
+                INSERT INTO movie_regions (movie_id, region_code, release_date)
+                VALUES %s
+                ON CONFLICT (movie_id, region_code) DO UPDATE SET
+                    release_date = EXCLUDED.release_date;
+            """
+            template = "(%(movie_id)s, %(region_code)s, %(release_date)s)"
+            execute_values(cur, query, rows, template=template, page_size=len(rows))
+            return len(rows)
+
     def get_movies_for_summarization(self, limit=10):
         if not self.conn: return []
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -91,10 +136,15 @@ class Database:
             query = "UPDATE movies SET ai_summary_positive = %s, ai_summary_negative = %s WHERE tmdb_id = %s;"
             cur.execute(query, (positive_summary, negative_summary, tmdb_id))
 
-    def list_movies(self, region=None, language=None, title_query=None):
+    # Columns returned by list/search, leaving out overview text and AI summaries
+    MOVIE_LIST_COLUMNS = "id, tmdb_id, title, original_title, release_date, region, language, popularity, vote_average"
+
+    def list_movies(self, region=None, language=None, title_query=None, limit=100, offset=0):
         if not self.conn: return []
+        if title_query:
+            return self.search_movies(title_query, region=region, language=language, limit=limit, offset=offset)['movies']
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            query = "SELECT * FROM movies WHERE 1=1"
+            query = f"SELECT {self.MOVIE_LIST_COLUMNS} FROM movies WHERE 1=1"
             params = []
             if region:
                 query += " AND region = %s"
@@ -102,46 +152,115 @@ class Database:
             if language:
                 query += " AND language = %s"
                 params.append(language)
-            if title_query:
-                query += " AND title ILIKE %s"
-                params.append(f"%{title_query}%")
+            query += " ORDER BY popularity DESC NULLS LAST LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
             cur.execute(query, params)
             return cur.fetchall()
 
-    def get_movie_reviews(self, tmdb_id):
-        if not self.conn: return []
+    def search_movies(self, title_query, region=None, language=None, limit=20, offset=0):
+        """Ranked title search backed by the trigram indexes in schema_movie_search.sql.
+
+        Matches title or original_title by substring or trigram similarity,
+        orders by best similarity then popularity, and returns one page plus
+        a total-count estimate:
+            {"movies": [...], "total_estimate": int, "limit": int, "offset": int}
+        """
+        empty = {"movies": [], "total_estimate": 0, "limit": limit, "offset": offset}
+        if not self.conn or not title_query: return empty
+
+        # Escape LIKE wildcards so the user's text is matched literally
+        escaped = title_query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        params = {
+            "q": title_query,
+            "pattern": f"%{escaped}%",
+            "region": region,
+            "language": language,
+            "limit": limit,
+            "offset": offset
+        }
+        where = """
+            WHERE (title ILIKE %(pattern)s OR title %% %(q)s
+                   OR original_title ILIKE %(pattern)s OR original_title %% %(q)s)
+            AND (%(region)s::text IS NULL OR region = %(region)s)
+            AND (%(language)s::text IS NULL OR language = %(language)s)
+        """
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            # First get movie title
-            cur.execute("SELECT title FROM movies WHERE tmdb_id = %s;", (tmdb_id,))
-            movie = cur.fetchone()
-            if not movie: return []
-            title = movie['title']
+            cur.execute(f"""
+                SELECT {self.MOVIE_LIST_COLUMNS},
+                    GREATEST(similarity(title, %(q)s), COALESCE(similarity(original_title, %(q)s), 0)) AS relevance
+                FROM movies
+                {where}
+                ORDER BY relevance DESC, popularity DESC NULLS LAST
+                LIMIT %(limit)s OFFSET %(offset)s;
+            """, params)
+            movies = cur.fetchall()
 
-            # Join with reviewers to get name
-            query = """
-                SELECT r.*, rev.name as reviewer_name 
-                FROM reviews r
-                JOIN reviewers rev ON r.reviewer_id = rev.id
-                WHERE r.movie_title = %s;
-            """
-            cur.execute(query, (title,))
-            results = cur.fetchall()
-            # Format to match previous Realtime API structure roughly
-            for r in results:
-                r['reviewers'] = {'name': r['reviewer_name']}
-            return results
+            if len(movies) < limit and (movies or offset == 0):
+                # Short page: the exact total is known without counting
+                total = offset + len(movies)
+            elif not movies:
+                # Paged past the end: the offset says nothing about the total
+                cur.execute(f"SELECT COUNT(*) AS total FROM movies {where}", params)
+                total = cur.fetchone()['total']
+            else:
+                # Planner row estimate, avoids counting every match
+                cur.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM movies {where}", params)
+                plan = cur.fetchone()['QUERY PLAN']
+                total = max(int(plan[0]['Plan']['Plan Rows']), offset + len(movies))
+
+        return {"movies": movies, "total_estimate": total, "limit": limit, "offset": offset}
+
+    # Single statement keyed by movie id; keyset-paginated on reviews.id
+    MOVIE_REVIEWS_QUERY = """
+        SELECT r.*, rev.name AS reviewer_name
+        FROM movies m
+        JOIN reviews r ON r.movie_id = m.id
+        JOIN reviewers rev ON rev.id = r.reviewer_id
+        WHERE m.tmdb_id = %(tmdb_id)s
+        AND (%(after_id)s::uuid IS NULL OR r.id > %(after_id)s::uuid)
+        ORDER BY r.id
+        LIMIT %(limit)s;
+    """
+
+    def get_movie_reviews(self, tmdb_id, after_id=None, limit=None):
+        """Reviews for a movie, ordered by review id.
+
+        Pass the last row's id as after_id to fetch the next page; limit=None
+        returns everything after after_id.
+        """
+        if not self.conn: return []
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(self.MOVIE_REVIEWS_QUERY, {"tmdb_id": tmdb_id, "after_id": after_id, "limit": limit})
+            return cur.fetchall()
 
     def get_movie_stats(self, movie_title):
         if not self.conn: return {"count": 0, "fresh_score": 0}
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("SELECT rating FROM reviews WHERE movie_title = %s;", (movie_title,))
-            rows = cur.fetchall()
-            if not rows: return {"count": 0, "fresh_score": 0}
-            
-            count = len(rows)
-            fresh_count = sum(1 for r in rows if r['rating'] == 'Fresh')
-            score = (fresh_count / count) * 100 if count > 0 else 0
-            return {"count": count, "fresh_score": score}
+            # Maintained incrementally by trg_reviews_stats (schema_review_stats.sql)
+            cur.execute("""
+                SELECT review_count, fresh_count, rotten_count, last_review_date
+                FROM movie_review_stats
+                WHERE movie_title = %s;
+            """, (movie_title,))
+            row = cur.fetchone()
+            if not row or not row['review_count']: return {"count": 0, "fresh_score": 0}
+
+            count = row['review_count']
+            score = (row['fresh_count'] / count) * 100
+            return {
+                "count": count,
+                "fresh_score": score,
+                "fresh_count": row['fresh_count'],
+                "rotten_count": row['rotten_count'],
+                "last_review_date": row['last_review_date']
+            }
+
+    def rebuild_movie_stats(self):
+        """Recompute movie_review_stats from the reviews table. Returns titles rebuilt."""
+        if not self.conn: return 0
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT rebuild_movie_review_stats();")
+            return cur.fetchone()[0]
 
     def get_reviewer_by_url(self, external_url):
         if not self.conn: return None
@@ -0,0 +1,238 @@
+"""
+Shared PostgreSQL connection pool
+Process-wide pool used by Database and every agent instead of raw psycopg2.connect
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SEARCH_PATH = "movie_platform"
+
+
+def connect_kwargs_from_env():
+    """Connection parameters for the platform database.
+
+    search_path is passed as a startup option so it is applied once per
+    physical connection, without an extra SET round-trip.
+    """
+    return {
+        "host": os.environ.get("DB_HOST", "127.0.0.1"),
+        "port": os.environ.get("DB_PORT", "5432"),
+        "database": os.environ.get("DB_NAME", "postgres"),
+        "user": os.environ.get("DB_USER", "postgres"),
+        "password": os.environ.get("DB_PASSWORD", "postgres"),
+        "options": f"-c search_path={SEARCH_PATH}",
+    }
+
+
+class ConnectionPool:
+    """Thread-safe, bounded pool of autocommit connections.
+
+    Sizing comes from DB_POOL_MIN / DB_POOL_MAX, callers block for up to
+    DB_POOL_TIMEOUT seconds when every connection is checked out, and a
+    connection that sat idle longer than DB_POOL_HEALTHCHECK_SECONDS is
+    pinged before it is handed out again.
+    """
+
+    def __init__(self, minconn=None, maxconn=None, healthcheck_interval=None,
+                 acquire_timeout=None, **connect_kwargs):
+        self.minconn = int(minconn if minconn is not None else os.environ.get("DB_POOL_MIN", 1))
+        self.maxconn = int(maxconn if maxconn is not None else os.environ.get("DB_POOL_MAX", 10))
+        self.healthcheck_interval = float(
+            healthcheck_interval if healthcheck_interval is not None
+            else os.environ.get("DB_POOL_HEALTHCHECK_SECONDS", 30)
+        )
+        self.acquire_timeout = float(
+            acquire_timeout if acquire_timeout is not None
+            else os.environ.get("DB_POOL_TIMEOUT", 30)
+        )
+        if self.maxconn < max(self.minconn, 1):
+            raise ValueError("DB_POOL_MAX must be >= max(DB_POOL_MIN, 1)")
+
+        self._connect_kwargs = connect_kwargs or connect_kwargs_from_env()
+        self._cond = threading.Condition()
+        self._idle = []      # (conn, returned_at) pairs, most recently used last
+        self._size = 0       # physical connections currently open or being opened
+        self._in_use = 0
+        self.closed = False
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "peak_in_use": 0,
+            "connections_opened": 0,
+            "connections_discarded": 0,
+            "healthcheck_failures": 0,
+        }
+
+        for _ in range(self.minconn):
+            self._size += 1
+            self._idle.append((self._open(), time.monotonic()))
+
+    def _open(self):
+        conn = psycopg2.connect(**self._connect_kwargs)
+        conn.autocommit = True
+        with self._cond:
+            self._stats["connections_opened"] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats["connections_discarded"] += 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn, idle_for):
+        if conn.closed:
+            return False
+        if idle_for < self.healthcheck_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            return True
+        except psycopg2.Error:
+            with self._cond:
+                self._stats["healthcheck_failures"] += 1
+            return False
+
+    def _reserve(self, deadline):
+        """Take an idle connection or a slot for a new one, blocking until one is free."""
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            try:
+                while True:
+                    if self.closed:
+                        raise PoolError("connection pool is closed")
+                    if self._idle:
+                        conn, returned_at = self._idle.pop()
+                        return conn, time.monotonic() - returned_at
+                    if self._size < self.maxconn:
+                        self._size += 1
+                        return None, 0.0
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolError(f"connection pool exhausted ({self.maxconn} connections in use)")
+                    waited = True
+                    self._cond.wait(remaining)
+            finally:
+                if waited:
+                    self._stats["waits"] += 1
+                    self._stats["wait_seconds"] += time.monotonic() - started
+
+    def getconn(self):
+        """Check out a healthy connection"""
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            conn, idle_for = self._reserve(deadline)
+            if conn is None:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(conn, idle_for):
+                self._discard(conn)
+                continue
+
+            with self._cond:
+                self._in_use += 1
+                self._stats["checkouts"] += 1
+                self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._in_use)
+            return conn
+
+    def putconn(self, conn, close=False):
+        """Return a connection, resetting it to an idle autocommit state"""
+        if conn is None:
+            return
+        with self._cond:
+            self._in_use -= 1
+
+        if self.closed or close or conn.closed:
+            self._discard(conn)
+            return
+
+        status = conn.info.transaction_status
+        if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            self._discard(conn)
+            return
+        try:
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if not conn.autocommit:
+                conn.autocommit = True
+        except psycopg2.Error:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def stats(self):
+        """Pool utilisation counters, for sizing DB_POOL_MIN / DB_POOL_MAX"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "min_size": self.minconn,
+                "max_size": self.maxconn,
+                "open": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "utilisation": self._in_use / self.maxconn,
+                "avg_wait_ms": (stats["wait_seconds"] / stats["waits"] * 1000) if stats["waits"] else 0.0,
+            })
+        return stats
+
+    def closeall(self):
+        with self._cond:
+            self.closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = ConnectionPool()
+        return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
@@ -0,0 +1,157 @@
+"""
+Shared HTTP client
+One pooled requests.Session for every scraper and API client: keep-alive per
+host, compressed responses, retries with jittered exponential backoff that
+honour Retry-After, and conditional GET from stored validators.
+"""
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Worth retrying: rate limited, or the server/proxy is having a moment
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def validators_from(response):
+    """{'etag', 'last_modified'} from a response, for the next conditional GET"""
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+
+
+def retry_after_seconds(value, now=None):
+    """Parse a Retry-After header (delta-seconds or HTTP-date); None if absent/invalid"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = now or datetime.now(timezone.utc)
+    return max((when - now).total_seconds(), 0.0)
+
+
+class HttpClient:
+    """Thread-safe wrapper around one requests.Session.
+
+    Retries up to HTTP_MAX_RETRIES times on connection errors and RETRY_STATUSES,
+    waiting HTTP_BACKOFF_SECONDS * 2^attempt with full jitter (capped at
+    HTTP_BACKOFF_MAX_SECONDS), or exactly Retry-After when the server sends it.
+    Once retries run out the last response is returned, so callers keep using
+    raise_for_status() / status_code as before. `response.attempts` says how
+    many tries it took. Callers with a rate budget pass before_attempt so
+    retries are paced by it too.
+    """
+
+    def __init__(self, max_retries=None, backoff=None, backoff_max=None, pool_size=None, sleep=time.sleep):
+        self.max_retries = int(os.environ.get("HTTP_MAX_RETRIES", 3)) if max_retries is None else max_retries
+        self.backoff = float(os.environ.get("HTTP_BACKOFF_SECONDS", 1.0)) if backoff is None else backoff
+        self.backoff_max = float(os.environ.get("HTTP_BACKOFF_MAX_SECONDS", 60)) if backoff_max is None else backoff_max
+        pool_size = int(os.environ.get("HTTP_POOL_SIZE", 20)) if pool_size is None else pool_size
+        self._sleep = sleep
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.retries = 0
+        self.not_modified = 0
+
+    def _delay(self, attempt, response):
+        if response is not None:
+            retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff * (2 ** attempt), self.backoff_max))
+
+    def get(self, url, params=None, headers=None, timeout=10, validators=None, before_attempt=None):
+        """GET with pooling and retries.
+
+        Args:
+            validators: Optional {'etag', 'last_modified'} from a previous
+                response; sent as If-None-Match / If-Modified-Since so an
+                unchanged page comes back as a body-less 304.
+            before_attempt: Optional callable(attempt) run before every send,
+                after any backoff, e.g. to take a rate-limit token per try.
+        """
+        headers = dict(headers or {})
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        attempt = 0
+        while True:
+            response = None
+            if before_attempt:
+                before_attempt(attempt)
+            try:
+                with self._lock:
+                    self.requests_sent += 1
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+                response.attempts = attempt + 1
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code == 304:
+                        with self._lock:
+                            self.not_modified += 1
+                    return response
+                if attempt >= self.max_retries:
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+
+            delay = self._delay(attempt, response)
+            status = response.status_code if response is not None else "connection error"
+            print(f"      ↻ {status} from {url.split('?')[0]}, retrying in {delay:.1f}s")
+            with self._lock:
+                self.retries += 1
+            self._sleep(delay)
+            attempt += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests_sent': self.requests_sent,
+                'retries': self.retries,
+                'not_modified': self.not_modified,
+            }
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide client, creating it on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -2,6 +2,8 @@ from openai import OpenAI
 import os
 from dotenv import load_dotenv
 
+from metrics import metrics
+
 load_dotenv()
 
 class LLMClient:
@@ -36,11 +38,12 @@ class LLMClient:
         """
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7
-            )
+            with metrics.timer('llm_call', 'openai'):
+                response = self.client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.7
+                )
             content = response.choices[0].message.content
             
             # Simple parsing
@@ -7,42 +7,56 @@ mcp = FastMCP("MovieRatings")
 db = Database()
 
 @mcp.tool()
-def list_movies(region: str = None, language: str = None, title: str = None) -> str:
+def list_movies(region: str = None, language: str = None, title: str = None, limit: int = 20, offset: int = 0) -> str:
     """
     List movies stored in the database with optional filters.
+    Title searches are ranked by relevance and popularity.
     
     Args:
         region: ISO 3166-1 region code (e.g., 'US', 'FR')
         language: ISO 639-1 language code (e.g., 'en', 'fr')
         title: Partial title to search for
+        limit: Maximum number of movies to return (default 20)
+        offset: Number of movies to skip, for paging
     """
-    movies = db.list_movies(region=region, language=language, title_query=title)
+    output = []
+    if title:
+        result = db.search_movies(title, region=region, language=language, limit=limit, offset=offset)
+        movies = result['movies']
+        if movies:
+            output.append(f"Showing {offset + 1}-{offset + len(movies)} of ~{result['total_estimate']} matches")
+    else:
+        movies = db.list_movies(region=region, language=language, limit=limit, offset=offset)
     if not movies:
         return "No movies found matching the criteria."
     
-    output = []
     for m in movies:
         output.append(f"- {m['title']} ({m['release_date']}) [ID: {m['tmdb_id']}]")
     
     return "\n".join(output)
 
 @mcp.tool()
-def get_movie_reviews(tmdb_id: int) -> str:
+def get_movie_reviews(tmdb_id: int, after_id: str = None, limit: int = 50) -> str:
     """
-    Get all reviews and ratings for a specific movie by its TMDB ID.
+    Get reviews and ratings for a specific movie by its TMDB ID, one page at a time.
     
     Args:
         tmdb_id: The TMDB ID of the movie
+        after_id: Review ID to continue after (from the previous page)
+        limit: Maximum number of reviews to return (default 50)
     """
-    reviews = db.get_movie_reviews(tmdb_id)
+    reviews = db.get_movie_reviews(tmdb_id, after_id=after_id, limit=limit)
     if not reviews:
         return f"No reviews found for movie with ID {tmdb_id}."
     
     output = []
     for r in reviews:
-        reviewer_name = r.get('reviewers', {}).get('name', 'Unknown')
+        reviewer_name = r.get('reviewer_name') or 'Unknown'
         output.append(f"Reviewer: {reviewer_name}\nRating: {r['rating']}\nContent: {r['content']}\n---")
     
+    if len(reviews) == limit:
+        output.append(f"More reviews available: call again with after_id={reviews[-1]['id']}")
+    
     return "\n".join(output)
 
 @mcp.tool()
@@ -57,7 +71,10 @@ def get_movie_insights(title: str) -> str:
     if stats['count'] == 0:
         return f"No statistical data found for '{title}'."
     
-    return f"Insights for '{title}':\n- Total Reviews: {stats['count']}\n- Rotten Tomatoes Proxy Score: {stats['fresh_score']:.1f}% Fresh"
+    insights = f"Insights for '{title}':\n- Total Reviews: {stats['count']}\n- Rotten Tomatoes Proxy Score: {stats['fresh_score']:.1f}% Fresh"
+    if stats.get('last_review_date'):
+        insights += f"\n- Latest Review: {stats['last_review_date']}"
+    return insights
 
 if __name__ == "__main__":
     mcp.run()
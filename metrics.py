@@ -0,0 +1,215 @@
+"""
+Cycle-level timing metrics for the agents
+Monotonic timers and counters per (phase, source), exposed as Prometheus
+text on an optional local HTTP endpoint and as one JSON summary line per
+cycle, so per-source p50/p95 latency and where a cycle's time went are
+visible without attaching a profiler.
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Phases the agents time; anything else is accepted too
+PHASES = ('search_fetch', 'page_fetch', 'parse', 'db_read', 'db_write', 'rate_limit_wait', 'sleep', 'llm_call', 'compute')
+
+# Histogram upper bounds in seconds (Prometheus `le` labels)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+# Samples kept per series for the cycle's percentiles
+MAX_CYCLE_SAMPLES = 10000
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers (None when empty)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+class Histogram:
+    """Cumulative Prometheus buckets plus the raw samples of the current cycle"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.cycle = deque(maxlen=MAX_CYCLE_SAMPLES)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.cycle.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class Metrics:
+    """Thread-safe registry of phase histograms and event counters"""
+
+    def __init__(self):
+        self._histograms = {}           # (phase, source) -> Histogram
+        self._counters = Counter()      # (name, source) -> total
+        self._cycle_counters = Counter()
+        self._cycle_started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def observe(self, phase, seconds, source=None):
+        """Record one timed operation"""
+        with self._lock:
+            key = (phase, source or '')
+            if key not in self._histograms:
+                self._histograms[key] = Histogram()
+            self._histograms[key].observe(seconds)
+
+    @contextmanager
+    def timer(self, phase, source=None):
+        """Time the enclosed block, including when it raises"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.monotonic() - started, source)
+
+    def inc(self, name, source=None, amount=1):
+        """Bump an event counter"""
+        with self._lock:
+            self._counters[(name, source or '')] += amount
+            self._cycle_counters[(name, source or '')] += amount
+
+    def cycle_summary(self, reset=True):
+        """Per-phase and per-source timings since the last reset.
+
+        Returns {'cycle_s', 'phases': {phase: stats}, 'sources': {source:
+        {phase: stats}}, 'counters': {name: total}} where stats are count,
+        total_s, p50_s and p95_s.
+        """
+        with self._lock:
+            now = time.monotonic()
+            samples = {key: list(h.cycle) for key, h in self._histograms.items() if h.cycle}
+            counters = dict(self._cycle_counters)
+            cycle_s = now - self._cycle_started
+            if reset:
+                for histogram in self._histograms.values():
+                    histogram.cycle.clear()
+                self._cycle_counters.clear()
+                self._cycle_started = now
+
+        def stats(values):
+            return {
+                'count': len(values),
+                'total_s': round(sum(values), 4),
+                'p50_s': round(percentile(values, 50), 4),
+                'p95_s': round(percentile(values, 95), 4),
+            }
+
+        by_phase = {}
+        sources = {}
+        for (phase, source), values in sorted(samples.items()):
+            by_phase.setdefault(phase, []).extend(values)
+            if source:
+                sources.setdefault(source, {})[phase] = stats(values)
+
+        totals = Counter()
+        for (name, source), value in counters.items():
+            totals[f"{name}.{source}" if source else name] += value
+
+        return {
+            'cycle_s': round(cycle_s, 3),
+            'phases': {phase: stats(values) for phase, values in by_phase.items()},
+            'sources': sources,
+            'counters': dict(sorted(totals.items())),
+        }
+
+    def emit_cycle_summary(self, agent, **extra):
+        """Print this cycle's summary as one JSON line and reset the cycle window"""
+        summary = self.cycle_summary(reset=True)
+        if not summary['phases'] and not summary['counters']:
+            return summary
+        line = {'event': 'cycle_metrics', 'agent': agent, 'at': datetime.now(timezone.utc).isoformat()}
+        line.update(extra)
+        line.update(summary)
+        print(json.dumps(line, default=str))
+        return summary
+
+    def render_prometheus(self):
+        """All histograms and counters in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines = [
+            "# HELP agent_phase_seconds Time spent per agent phase and source",
+            "# TYPE agent_phase_seconds histogram",
+        ]
+        for (phase, source), h in histograms:
+            labels = f'phase="{phase}",source="{source}"'
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'agent_phase_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"agent_phase_seconds_sum{{{labels}}} {h.sum}")
+            lines.append(f"agent_phase_seconds_count{{{labels}}} {h.count}")
+
+        lines += [
+            "# HELP agent_events_total Agent event counters",
+            "# TYPE agent_events_total counter",
+        ]
+        for (name, source), value in counters:
+            lines.append(f'agent_events_total{{name="{name}",source="{source}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._cycle_counters.clear()
+            self._cycle_started = time.monotonic()
+
+
+metrics = Metrics()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would drown the agent's own output
+
+
+def start_metrics_server(port=None, host='127.0.0.1'):
+    """Serve /metrics on a daemon thread.
+
+    port defaults to METRICS_PORT; returns None (no server) when neither is set.
+    """
+    if port is None:
+        port = os.environ.get("METRICS_PORT")
+        if not port:
+            return None
+    server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"📡 Metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,359 @@
+"""
+Deadline scheduler for the adaptive rating monitor
+Keeps a next_due_at per (movie, source) in monitor_schedule and hands out due work
+"""
+import heapq
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+from psycopg2.extras import RealDictCursor, execute_values
+
+# Freshness tiers, youngest first: (max age in days, minutes between scrapes, snapshot granularity)
+TIERS = [
+    (7, 30, 'hourly'),      # Hot
+    (30, 240, 'daily'),     # Active
+    (90, 1440, 'daily'),    # Archive
+]
+
+
+def tier_for(release_date, today=None):
+    """(interval_minutes, snapshot_interval) for a release date, or None once it ages out"""
+    if release_date is None:
+        return None
+    if isinstance(release_date, datetime):
+        release_date = release_date.date()
+    today = today or datetime.now(timezone.utc).date()
+    age = (today - release_date).days
+    if age < 0:
+        return None  # Not released yet
+    for max_age, interval_minutes, snapshot_interval in TIERS:
+        if age < max_age:
+            return interval_minutes, snapshot_interval
+    return None
+
+
+class VolatilityPolicy:
+    """Sets each (movie, source) scrape interval from how fast it is actually moving.
+
+    Activity is the number of rating changes per day over the lookback window
+    (rating_snapshots only gets a row when a value changes), plus the movie's
+    recent review velocity from daily_review_snapshots at REVIEWS_PER_CHANGE
+    new reviews per expected change. The interval samples each expected change
+    SAMPLES_PER_CHANGE times, clamped to [min_minutes, max_minutes]. Pairs with
+    less than MIN_HISTORY_DAYS of history keep their age-tier interval.
+    """
+
+    REVIEWS_PER_CHANGE = 10
+    SAMPLES_PER_CHANGE = 2
+    MIN_HISTORY_DAYS = 1
+
+    def __init__(self, conn, min_minutes=30, max_minutes=1440, lookback_days=7):
+        self.conn = conn
+        self.min_minutes = min_minutes
+        self.max_minutes = max(max_minutes, min_minutes)
+        self.lookback_days = lookback_days
+        self.changes = {}       # (movie_id, source) -> (changes in window, days observed)
+        self.velocity = {}      # movie_id -> new reviews per day
+        self._lock = threading.Lock()
+
+    def load(self, movie_ids):
+        """Read change counts and review velocity for a batch of movies (two queries)"""
+        movie_ids = [str(m) for m in movie_ids]
+        if not movie_ids:
+            return
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # A row after a rating type's first observation is a change
+            cur.execute("""
+                SELECT
+                    movie_id, source,
+                    COUNT(*) FILTER (WHERE rn > 1 AND snapshot_time > NOW() - INTERVAL '%s days') AS changes,
+                    LEAST(EXTRACT(EPOCH FROM NOW() - MIN(snapshot_time)) / 86400, %s) AS observed_days
+                FROM (
+                    SELECT movie_id, source, snapshot_time,
+                        ROW_NUMBER() OVER (PARTITION BY movie_id, source, rating_type ORDER BY snapshot_time) AS rn
+                    FROM rating_snapshots
+                    WHERE movie_id = ANY(%s::uuid[])
+                ) s
+                GROUP BY movie_id, source;
+            """, (self.lookback_days, self.lookback_days, movie_ids))
+            changes = {
+                (str(row['movie_id']), row['source']): (row['changes'], float(row['observed_days']))
+                for row in cur.fetchall()
+            }
+
+            # Reviews are a movie-level signal; take the busiest source
+            cur.execute("""
+                SELECT movie_id, MAX(reviews_per_day) AS reviews_per_day
+                FROM (
+                    SELECT movie_id, source,
+                        (MAX(total_reviews) - MIN(total_reviews))::float
+                            / GREATEST(EXTRACT(EPOCH FROM MAX(snapshot_time) - MIN(snapshot_time)) / 86400, 1) AS reviews_per_day
+                    FROM daily_review_snapshots
+                    WHERE movie_id = ANY(%s::uuid[])
+                    AND snapshot_time > NOW() - INTERVAL '%s days'
+                    GROUP BY movie_id, source
+                ) v
+                GROUP BY movie_id;
+            """, (movie_ids, self.lookback_days))
+            velocity = {str(row['movie_id']): row['reviews_per_day'] or 0.0 for row in cur.fetchall()}
+
+        with self._lock:
+            self.changes.update(changes)
+            self.velocity.update(velocity)
+
+    def interval_for(self, movie, source, tier_minutes):
+        """Minutes until the pair's next scrape"""
+        movie_id = str(movie['id'])
+        with self._lock:
+            changes, observed_days = self.changes.get((movie_id, source), (0, 0.0))
+            velocity = self.velocity.get(movie_id, 0.0)
+        if observed_days < self.MIN_HISTORY_DAYS:
+            return tier_minutes
+
+        activity = changes / observed_days + velocity / self.REVIEWS_PER_CHANGE
+        if activity <= 0:
+            return self.max_minutes
+        minutes = 1440 / (activity * self.SAMPLES_PER_CHANGE)
+        return int(min(max(minutes, self.min_minutes), self.max_minutes))
+
+
+def next_deadline(due_at, interval_minutes, now):
+    """Keep a fixed cadence from the previous deadline; if that is already past
+    (we fell behind), restart from now instead of queueing catch-up runs."""
+    deadline = due_at + timedelta(minutes=interval_minutes)
+    return deadline if deadline > now else now + timedelta(minutes=interval_minutes)
+
+
+class MonitorSchedule:
+    """One min-heap of (next_due_at, movie_id) per source, persisted in monitor_schedule.
+
+    sync() seeds deadlines for newly released movies (spread at random over
+    their first interval so they do not arrive as a burst), drops movies that
+    aged out (leased pairs are left to their worker's complete()), and
+    reloads the heaps from the table. Restarts therefore resume
+    from the stored deadlines.
+
+    With a worker_id the table itself is the queue, shared by any number of
+    worker processes: pop_due() claims due rows with FOR UPDATE SKIP LOCKED
+    and leases them for lease_seconds, renew() extends the caller's leases,
+    and complete() releases them. A crashed worker's pairs become claimable
+    again once their lease runs out.
+    """
+
+    def __init__(self, conn, sources, policy=None, worker_id=None, lease_seconds=300):
+        """
+        Args:
+            policy: Optional VolatilityPolicy; None schedules by age tier alone
+            worker_id: Claim work from the shared queue under this name
+                (e.g. host:pid) instead of keeping in-process heaps
+            lease_seconds: How long a claim lasts without renewal
+        """
+        self.conn = conn
+        self.sources = list(sources)
+        self.policy = policy
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.movies = {}        # movie_id -> movies row
+        self._heaps = {source: [] for source in self.sources}
+        self._lock = threading.Lock()
+
+    def sync(self, exclude=()):
+        """Refresh from the database; keys in `exclude` (in flight) are not queued.
+
+        Returns the number of scheduled (movie, source) pairs.
+        """
+        # Age window on the same UTC date basis as tier_for, not the session timezone
+        now = datetime.now(timezone.utc)
+        today = now.date()
+        cutoff = today - timedelta(days=TIERS[-1][0])
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT * FROM movies
+                WHERE release_date <= %s AND release_date > %s;
+            """, (today, cutoff))
+            movies = {str(m['id']): m for m in cur.fetchall()}
+
+            seeds = []
+            for movie_id, movie in movies.items():
+                tier = tier_for(movie['release_date'], today=today)
+                if tier:
+                    for source in self.sources:
+                        seeds.append((movie_id, source, now + timedelta(minutes=tier[0] * random.random())))
+            if seeds:
+                execute_values(cur, """
+                    INSERT INTO monitor_schedule (movie_id, source, next_due_at)
+                    VALUES %s
+                    ON CONFLICT (movie_id, source) DO NOTHING;
+                """, seeds)
+
+            cur.execute("""
+                DELETE FROM monitor_schedule s
+                USING movies m
+                WHERE s.movie_id = m.id
+                AND (m.release_date IS NULL OR m.release_date <= %s)
+                AND (s.lease_until IS NULL OR s.lease_until < NOW());
+            """, (cutoff,))
+
+            cur.execute("""
+                SELECT movie_id, source, next_due_at FROM monitor_schedule
+                WHERE source = ANY(%s);
+            """, (self.sources,))
+            rows = cur.fetchall()
+
+        if self.policy:
+            self.policy.load(list(movies))
+
+        if self.shared:
+            with self._lock:
+                self.movies = movies
+            return len(rows)
+
+        heaps = {source: [] for source in self.sources}
+        for row in rows:
+            movie_id = str(row['movie_id'])
+            if movie_id in movies and (movie_id, row['source']) not in exclude:
+                heaps[row['source']].append((row['next_due_at'], movie_id))
+        for heap in heaps.values():
+            heapq.heapify(heap)
+
+        with self._lock:
+            self.movies = movies
+            self._heaps = heaps
+        return sum(len(heap) for heap in heaps.values())
+
+    @property
+    def shared(self):
+        return self.worker_id is not None
+
+    def _claim(self, source, now, limit):
+        """Lease up to `limit` due, unleased pairs; rows other workers are claiming are skipped"""
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                WITH due AS (
+                    SELECT movie_id, source FROM monitor_schedule
+                    WHERE source = %s AND next_due_at <= %s
+                    AND (lease_until IS NULL OR lease_until < NOW())
+                    ORDER BY next_due_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE monitor_schedule s
+                SET lease_until = NOW() + make_interval(secs => %s), leased_by = %s
+                FROM due, movies m
+                WHERE s.movie_id = due.movie_id AND s.source = due.source AND m.id = s.movie_id
+                RETURNING s.next_due_at AS claimed_due_at, m.*;
+            """, (source, now, limit, self.lease_seconds, self.worker_id))
+            rows = cur.fetchall()
+        due = []
+        for row in sorted(rows, key=lambda r: r['claimed_due_at']):
+            due_at = row.pop('claimed_due_at')
+            due.append((due_at, row))
+        return due
+
+    def pop_due(self, source, now, limit):
+        """Remove and return up to `limit` (due_at, movie) pairs due by `now`, earliest first"""
+        if limit <= 0:
+            return []
+        if self.shared:
+            return self._claim(source, now, limit)
+        due = []
+        with self._lock:
+            heap = self._heaps[source]
+            while heap and len(due) < limit and heap[0][0] <= now:
+                due_at, movie_id = heapq.heappop(heap)
+                movie = self.movies.get(movie_id)
+                if movie:
+                    due.append((due_at, movie))
+        return due
+
+    def next_due_at(self):
+        """Earliest queued deadline across all sources, or None when idle"""
+        if self.shared:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    SELECT MIN(next_due_at) FROM monitor_schedule
+                    WHERE source = ANY(%s) AND (lease_until IS NULL OR lease_until < NOW());
+                """, (self.sources,))
+                return cur.fetchone()[0]
+        with self._lock:
+            heads = [heap[0][0] for heap in self._heaps.values() if heap]
+        return min(heads) if heads else None
+
+    def renew(self):
+        """Extend every lease this worker holds; returns how many"""
+        if not self.shared:
+            return 0
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE monitor_schedule SET lease_until = NOW() + make_interval(secs => %s)
+                WHERE leased_by = %s;
+            """, (self.lease_seconds, self.worker_id))
+            return cur.rowcount
+
+    def release(self):
+        """Hand back this worker's unfinished claims (on shutdown); returns how many"""
+        if not self.shared:
+            return 0
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE monitor_schedule SET lease_until = NULL, leased_by = NULL
+                WHERE leased_by = %s;
+            """, (self.worker_id,))
+            return cur.rowcount
+
+    def complete(self, movie, source, due_at, now=None):
+        """Record a finished scrape, release its lease and queue the next deadline.
+
+        Returns the new deadline, or None if the movie has aged out or (in
+        shared mode) the lease expired and another worker has the pair now.
+        """
+        now = now or datetime.now(timezone.utc)
+        tier = tier_for(movie['release_date'], today=now.date())
+        with self.conn.cursor() as cur:
+            if tier is None:
+                cur.execute("DELETE FROM monitor_schedule WHERE movie_id = %s AND source = %s;",
+                            (movie['id'], source))
+                return None
+            interval_minutes = self.policy.interval_for(movie, source, tier[0]) if self.policy else tier[0]
+            deadline = next_deadline(due_at, interval_minutes, now)
+            # A single process owns its pairs, but ignores leases left by a dead worker
+            cur.execute("""
+                UPDATE monitor_schedule
+                SET next_due_at = %s, last_run_at = %s, interval_minutes = %s, tier_interval_minutes = %s,
+                    lease_until = NULL, leased_by = NULL
+                WHERE movie_id = %s AND source = %s
+                AND (leased_by = %s OR (%s::text IS NULL AND (leased_by IS NULL OR lease_until < NOW())));
+            """, (deadline, now, interval_minutes, tier[0], movie['id'], source, self.worker_id, self.worker_id))
+            if cur.rowcount == 0:
+                return None
+        if self.shared:
+            return deadline
+        with self._lock:
+            heapq.heappush(self._heaps[source], (deadline, str(movie['id'])))
+        return deadline
+
+    def savings_report(self):
+        """Scrapes per day under the current intervals vs the age tiers alone.
+
+        Covers pairs that have run at least once under the scheduler.
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT
+                    COUNT(*) AS pairs,
+                    COALESCE(SUM(1440.0 / interval_minutes), 0) AS policy_per_day,
+                    COALESCE(SUM(1440.0 / tier_interval_minutes), 0) AS age_per_day
+                FROM monitor_schedule
+                WHERE source = ANY(%s) AND interval_minutes > 0 AND tier_interval_minutes > 0;
+            """, (self.sources,))
+            row = cur.fetchone()
+        policy_per_day = float(row['policy_per_day'])
+        age_per_day = float(row['age_per_day'])
+        return {
+            'pairs': row['pairs'],
+            'policy_requests_per_day': round(policy_per_day, 1),
+            'age_requests_per_day': round(age_per_day, 1),
+            'requests_saved_per_day': round(age_per_day - policy_per_day, 1),
+            'saved_pct': round(100 * (1 - policy_per_day / age_per_day), 1) if age_per_day else 0.0
+        }
@@ -1,45 +1,40 @@
 import sys
+import argparse
 from datetime import datetime, timedelta
 from tmdb_client import TMDBClient
 from database import Database
+from profiling import add_profile_arguments, profiled
 
-def movie_release_agent():
-    tmdb = TMDBClient()
-    db = Database()
-    
-    # Calculate yesterday's date
-    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-    print(f"Fetching global releases for date: {yesterday}")
-    
-    # Top 12 Movie Markets
-    regions = [
-        {'code': 'US', 'lang': 'en'}, # United States
-        {'code': 'GB', 'lang': 'en'}, # United Kingdom
-        {'code': 'FR', 'lang': 'fr'}, # France
-        {'code': 'IN', 'lang': 'hi'}, # India
-        {'code': 'ES', 'lang': 'es'}, # Spain
-        {'code': 'DE', 'lang': 'de'}, # Germany
-        {'code': 'JP', 'lang': 'ja'}, # Japan
-        {'code': 'KR', 'lang': 'ko'}, # South Korea
-        {'code': 'CN', 'lang': 'zh'}, # China
-        {'code': 'BR', 'lang': 'pt'}, # Brazil
-        {'code': 'MX', 'lang': 'es'}, # Mexico
-        {'code': 'IT', 'lang': 'it'}  # Italy
-    ]
-    
-    total_new_movies = 0
-    
-    for r in regions:
+# Top 12 Movie Markets
+REGIONS = [
+    {'code': 'US', 'lang': 'en'}, # United States
+    {'code': 'GB', 'lang': 'en'}, # United Kingdom
+    {'code': 'FR', 'lang': 'fr'}, # France
+    {'code': 'IN', 'lang': 'hi'}, # India
+    {'code': 'ES', 'lang': 'es'}, # Spain
+    {'code': 'DE', 'lang': 'de'}, # Germany
+    {'code': 'JP', 'lang': 'ja'}, # Japan
+    {'code': 'KR', 'lang': 'ko'}, # South Korea
+    {'code': 'CN', 'lang': 'zh'}, # China
+    {'code': 'BR', 'lang': 'pt'}, # Brazil
+    {'code': 'MX', 'lang': 'es'}, # Mexico
+    {'code': 'IT', 'lang': 'it'}  # Italy
+]
+
+def ingest_releases(tmdb, db, date):
+    """Fetch one day's releases for every market and write them in two bulk statements."""
+    movie_rows = []
+    region_rows = []
+
+    for r in REGIONS:
         print(f"Processing Region: {r['code']} ({r['lang']})...")
-        movies = tmdb.get_movies_by_date(yesterday, r_region=r['code'], r_language=r['lang'])
-        
-        count = 0
+        movies = tmdb.get_movies_by_date(date, r_region=r['code'], r_language=r['lang'])
+
         for m in movies:
-            # 1. Upsert Movie (Base Data)
             # Default scoring for trending = popularity
             trending_score = m.get("popularity", 0)
-            
-            movie_data = {
+
+            movie_rows.append({
                 "tmdb_id": m.get("id"),
                 "title": m.get("title"),
                 "original_title": m.get("original_title"),
@@ -56,23 +51,48 @@ def movie_release_agent():
                 "adult": m.get("adult"),
                 "video": m.get("video"),
                 "trending_score": trending_score
-            }
-            stored_movie = db.upsert_movie(movie_data)
-            
-            if stored_movie:
-                # 2. Upsert Region Specific Entry
-                region_data = {
-                    "movie_id": stored_movie['id'],
-                    "region_code": r['code'],
-                    "release_date": m.get("release_date") or yesterday
-                }
-                db.upsert_movie_region(region_data)
-                count += 1
-                
-        print(f"  - Upserted {count} movies for {r['code']}.")
-        total_new_movies += count
+            })
+            region_rows.append({
+                "tmdb_id": m.get("id"),
+                "region_code": r['code'],
+                "release_date": m.get("release_date") or date
+            })
+
+        print(f"  - Fetched {len(movies)} movies for {r['code']}.")
+
+    # 1. Upsert Movies (Base Data), once per unique title
+    movie_ids = db.upsert_movies_bulk(movie_rows)
+
+    # 2. Upsert Region Specific Entries
+    for row in region_rows:
+        row['movie_id'] = movie_ids.get(row.pop('tmdb_id'))
+    region_rows = [row for row in region_rows if row['movie_id']]
+    count = db.upsert_movie_regions_bulk(region_rows)
+
+    print(f"  - Upserted {len(movie_ids)} movies and {count} region-entries for {date}.")
+    return count
+
+def movie_release_agent(days=1):
+    tmdb = TMDBClient()
+    db = Database()
+
+    total_new_movies = 0
+
+    # Oldest first; days=1 is just yesterday
+    for offset in range(days, 0, -1):
+        date = (datetime.now() - timedelta(days=offset)).strftime('%Y-%m-%d')
+        print(f"Fetching global releases for date: {date}")
+        total_new_movies += ingest_releases(tmdb, db, date)
 
     print(f"Global fetch complete. Processed {total_new_movies} region-entries.")
+    db.close()
 
 if __name__ == "__main__":
-    movie_release_agent()
+    parser = argparse.ArgumentParser(description='Global Movie Release Agent')
+    parser.add_argument('--days', type=int, default=1,
+                        help='Number of past days to ingest, ending yesterday (default: 1)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiled('movie_release_agent', args):
+        movie_release_agent(days=args.days)
@@ -0,0 +1,155 @@
+"""
+Profiling hooks for agent entry points
+`--profile` wraps one agent cycle in cProfile (deterministic) or a stack
+sampler (low overhead, safe for production), and writes:
+
+    <out>.prof         cProfile stats for pstats / snakeviz (cprofile mode)
+    <out>.txt          top functions by cumulative time (cprofile mode)
+    <out>.folded       collapsed stacks for flamegraph.pl / speedscope
+    <out>.memory.txt   peak memory and top allocation sites (--profile-memory)
+
+cProfile only sees the calling thread; the sampler covers every thread, so
+use --profile sample for the concurrent monitor modes. Parse-pool worker
+processes are not profiled.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+DEFAULT_DIR = "profiles"
+
+
+def add_profile_arguments(parser):
+    """Add --profile, --profile-out and --profile-memory to an argparse parser"""
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=['cprofile', 'sample'], default=None,
+                        help='Profile one cycle: cprofile (deterministic, default) or sample (low overhead)')
+    parser.add_argument('--profile-out', default=None,
+                        help=f'Profile output path prefix (default: {DEFAULT_DIR}/<agent>-<timestamp>)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='With --profile, also record peak memory and top allocation sites')
+    parser.add_argument('--profile-interval', type=float, default=0.005,
+                        help='Stack sampling interval in seconds (default: 0.005)')
+
+
+class StackSampler:
+    """Samples every thread's stack on a background thread.
+
+    Each sample adds one count to the thread's root-to-leaf stack, giving
+    the collapsed ("folded") format flamegraph tools read.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ':')
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(self._frame_label(frame))
+                    frame = frame.f_back
+                # Pool threads share a root: scrape-IMDb_3 -> scrape-IMDb
+                thread = re.sub(r'_\d+$', '', names.get(ident, 'thread'))
+                self.stacks[";".join([thread] + labels[::-1])] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def collapsed(self):
+        """Lines of 'frame;frame;frame count', heaviest first"""
+        return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+
+def _write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def _memory_report(snapshot, peak, top=25):
+    lines = [f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB", "", f"Top {top} allocation sites:"]
+    for stat in snapshot.statistics('lineno')[:top]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}")
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profiled(agent, args):
+    """Profile the enclosed block when args.profile is set; otherwise do nothing"""
+    mode = getattr(args, 'profile', None)
+    if not mode:
+        yield
+        return
+
+    out = args.profile_out or os.path.join(DEFAULT_DIR, f"{agent}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+
+    if args.profile_memory:
+        tracemalloc.start(25)
+    sampler = StackSampler(interval=args.profile_interval)
+    profiler = cProfile.Profile() if mode == 'cprofile' else None
+
+    print(f"🔬 Profiling {agent} ({mode}{', memory' if args.profile_memory else ''})")
+    started = time.monotonic()
+    sampler.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        sampler.stop()
+        elapsed = time.monotonic() - started
+        written = []
+        if args.profile_memory:
+            # Before writing the reports, so their own allocations are not counted
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        if profiler:
+            profiler.dump_stats(f"{out}.prof")
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(40)
+            _write(f"{out}.txt", report.getvalue())
+            written += [f"{out}.prof", f"{out}.txt"]
+
+        _write(f"{out}.folded", "\n".join(sampler.collapsed()) + "\n")
+        written.append(f"{out}.folded")
+
+        if args.profile_memory:
+            _write(f"{out}.memory.txt", _memory_report(snapshot, peak))
+            written.append(f"{out}.memory.txt")
+            print(f"🔬 Peak traced memory: {peak / 1024 / 1024:.1f} MiB")
+
+        print(f"🔬 Profiled {elapsed:.1f}s ({sampler.samples} stack samples): {', '.join(written)}")
@@ -0,0 +1,14 @@
+from database import Database
+
+def rebuild_review_stats():
+    db = Database()
+    if not db.conn:
+        return
+
+    print("Rebuilding movie_review_stats from reviews...")
+    rebuilt = db.rebuild_movie_stats()
+    print(f"✅ Rebuilt review stats for {rebuilt} titles.")
+    db.close()
+
+if __name__ == "__main__":
+    rebuild_review_stats()
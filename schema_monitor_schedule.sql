@@ -0,0 +1,27 @@
+-- Monitor Schedule Migration
+-- Persistent per-(movie, source) deadlines for the adaptive rating monitor
+-- Run after schema_v2.sql: python3 apply_sql.py schema_monitor_schedule.sql
+
+SET search_path TO movie_platform;
+
+-- 1. Next scrape deadline per movie and source
+CREATE TABLE IF NOT EXISTS monitor_schedule (
+    movie_id UUID REFERENCES movies(id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    next_due_at TIMESTAMPTZ NOT NULL,
+    last_run_at TIMESTAMPTZ,
+    PRIMARY KEY (movie_id, source)
+);
+
+-- 2. Due-work lookups scan by deadline
+CREATE INDEX IF NOT EXISTS idx_monitor_schedule_due ON monitor_schedule(source, next_due_at);
+
+-- 3. Interval chosen by the scrape policy, next to what the age tier alone would give
+ALTER TABLE monitor_schedule ADD COLUMN IF NOT EXISTS interval_minutes INTEGER;
+ALTER TABLE monitor_schedule ADD COLUMN IF NOT EXISTS tier_interval_minutes INTEGER;
+
+-- 4. Leases for --worker mode: a claimed pair belongs to leased_by until lease_until
+ALTER TABLE monitor_schedule ADD COLUMN IF NOT EXISTS lease_until TIMESTAMPTZ;
+ALTER TABLE monitor_schedule ADD COLUMN IF NOT EXISTS leased_by TEXT;
+
+COMMENT ON TABLE monitor_schedule IS 'Deadline queue for RatingMonitor.run_adaptive and --worker processes; survives restarts';
@@ -0,0 +1,16 @@
+-- Movie Search Migration
+-- Trigram indexes behind Database.search_movies (ranked, paginated title search)
+-- Run after setup_schema.sql: python3 apply_sql.py schema_movie_search.sql
+
+SET search_path TO movie_platform;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- GIN trigram indexes serve both ILIKE '%q%' and the similarity operator (%)
+CREATE INDEX IF NOT EXISTS idx_movies_title_trgm ON movies USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_movies_original_title_trgm ON movies USING gin (original_title gin_trgm_ops);
+
+-- Default ordering for unfiltered listings
+CREATE INDEX IF NOT EXISTS idx_movies_popularity ON movies (popularity DESC NULLS LAST);
+
+ANALYZE movies;
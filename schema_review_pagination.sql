@@ -0,0 +1,19 @@
+-- Review Pagination Migration
+-- Links reviews to movies by id so get_movie_reviews is one indexed, keyset-paginated query
+-- Run after setup_schema.sql: python3 apply_sql.py schema_review_pagination.sql
+
+SET search_path TO movie_platform;
+
+-- 1. Stable movie reference on reviews (movie_title is kept for get_movie_stats)
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS movie_id UUID REFERENCES movies(id) ON DELETE CASCADE;
+
+-- 2. Backfill from the title match the old lookup relied on
+UPDATE reviews r
+SET movie_id = m.id
+FROM movies m
+WHERE r.movie_id IS NULL
+AND m.title = r.movie_title;
+
+-- 3. Indexes: keyset pagination per movie, and the title lookup used by insert_review
+CREATE INDEX IF NOT EXISTS idx_reviews_movie_id_id ON reviews(movie_id, id);
+CREATE INDEX IF NOT EXISTS idx_movies_title ON movies(title);
@@ -0,0 +1,93 @@
+-- Review Stats Migration
+-- Per-movie review aggregates, maintained incrementally as reviews are written
+-- Run after setup_schema.sql: python3 apply_sql.py schema_review_stats.sql
+
+SET search_path TO movie_platform;
+
+-- 1. Aggregate table (one row per reviewed title)
+CREATE TABLE IF NOT EXISTS movie_review_stats (
+    movie_title TEXT PRIMARY KEY,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    fresh_count INTEGER NOT NULL DEFAULT 0,
+    rotten_count INTEGER NOT NULL DEFAULT 0,
+    other_count INTEGER NOT NULL DEFAULT 0, -- star ratings, scores, NULL
+    last_review_date DATE,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 2. Apply a +1 / -1 delta for one review
+CREATE OR REPLACE FUNCTION apply_review_stats_delta(p_title TEXT, p_rating TEXT, p_review_date DATE, p_sign INTEGER)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO movie_review_stats AS s (
+        movie_title, review_count, fresh_count, rotten_count, other_count, last_review_date
+    ) VALUES (
+        p_title,
+        p_sign,
+        CASE WHEN p_rating = 'Fresh' THEN p_sign ELSE 0 END,
+        CASE WHEN p_rating = 'Rotten' THEN p_sign ELSE 0 END,
+        CASE WHEN p_rating IS DISTINCT FROM 'Fresh' AND p_rating IS DISTINCT FROM 'Rotten' THEN p_sign ELSE 0 END,
+        CASE WHEN p_sign > 0 THEN p_review_date END
+    )
+    ON CONFLICT (movie_title) DO UPDATE SET
+        review_count = s.review_count + EXCLUDED.review_count,
+        fresh_count = s.fresh_count + EXCLUDED.fresh_count,
+        rotten_count = s.rotten_count + EXCLUDED.rotten_count,
+        other_count = s.other_count + EXCLUDED.other_count,
+        last_review_date = GREATEST(s.last_review_date, EXCLUDED.last_review_date),
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- 3. Keep the aggregate in step with every write to reviews
+-- Note: deletes do not roll back last_review_date; run the rebuild if that matters
+CREATE OR REPLACE FUNCTION maintain_movie_review_stats()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_review_stats_delta(OLD.movie_title, OLD.rating, NULL, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_review_stats_delta(NEW.movie_title, NEW.rating, NEW.review_date, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_reviews_stats ON reviews;
+CREATE TRIGGER trg_reviews_stats
+    AFTER INSERT OR DELETE OR UPDATE OF movie_title, rating, review_date ON reviews
+    FOR EACH ROW EXECUTE FUNCTION maintain_movie_review_stats();
+
+-- 4. Full rebuild from existing reviews (backfill / repair)
+CREATE OR REPLACE FUNCTION rebuild_movie_review_stats()
+RETURNS INTEGER AS $$
+DECLARE
+    rebuilt_count INTEGER := 0;
+BEGIN
+    -- Block concurrent review writes so no delta is lost between the wipe and the reload
+    LOCK TABLE reviews IN SHARE MODE;
+    DELETE FROM movie_review_stats;
+
+    INSERT INTO movie_review_stats (
+        movie_title, review_count, fresh_count, rotten_count, other_count, last_review_date
+    )
+    SELECT
+        movie_title,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE rating = 'Fresh'),
+        COUNT(*) FILTER (WHERE rating = 'Rotten'),
+        COUNT(*) FILTER (WHERE rating IS DISTINCT FROM 'Fresh' AND rating IS DISTINCT FROM 'Rotten'),
+        MAX(review_date)
+    FROM reviews
+    GROUP BY movie_title;
+    GET DIAGNOSTICS rebuilt_count = ROW_COUNT;
+
+    RETURN rebuilt_count;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_movie_review_stats();
+
+COMMENT ON TABLE movie_review_stats IS 'Per-title review counts maintained by trg_reviews_stats; backs Database.get_movie_stats';
+COMMENT ON FUNCTION rebuild_movie_review_stats IS 'Recomputes movie_review_stats from the reviews table';
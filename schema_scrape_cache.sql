@@ -0,0 +1,24 @@
+-- Scrape Cache Migration
+-- Per-(movie, source) state kept by the rating monitor between cycles
+-- Run after schema_v2.sql: python3 apply_sql.py schema_scrape_cache.sql
+
+SET search_path TO movie_platform;
+
+-- 1. Canonical page URL per movie and source (url NULL = search found nothing)
+CREATE TABLE IF NOT EXISTS movie_source_urls (
+    movie_id UUID REFERENCES movies(id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    url TEXT,
+    resolved_at TIMESTAMPTZ DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (movie_id, source)
+);
+
+CREATE INDEX IF NOT EXISTS idx_movie_source_urls_expires ON movie_source_urls(expires_at);
+
+-- 2. HTTP validators from the last full fetch of url, for conditional GETs
+ALTER TABLE movie_source_urls ADD COLUMN IF NOT EXISTS etag TEXT;
+ALTER TABLE movie_source_urls ADD COLUMN IF NOT EXISTS last_modified TEXT;
+
+-- 3. Digest of the score-bearing region of the last parsed page
+ALTER TABLE movie_source_urls ADD COLUMN IF NOT EXISTS content_digest TEXT;
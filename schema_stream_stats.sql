@@ -0,0 +1,37 @@
+-- Streaming Review Statistics Migration
+-- Per-(movie, source) running statistics so the monitor flags review spikes on ingest
+-- Run after schema_trend_analysis.sql: python3 apply_sql.py schema_stream_stats.sql
+
+SET search_path TO movie_platform;
+
+-- 1. Welford and EWMA accumulators over daily_review_snapshots.new_reviews_today
+CREATE TABLE IF NOT EXISTS review_stream_stats (
+    movie_id UUID REFERENCES movies(id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+
+    -- Welford running mean and sum of squared deviations
+    n INTEGER NOT NULL DEFAULT 0,
+    mean DOUBLE PRECISION NOT NULL DEFAULT 0,
+    m2 DOUBLE PRECISION NOT NULL DEFAULT 0,
+
+    -- Exponentially weighted mean/variance, and their values before last_value
+    ewma_mean DOUBLE PRECISION,
+    ewma_var DOUBLE PRECISION,
+    prev_ewma_mean DOUBLE PRECISION,
+    prev_ewma_var DOUBLE PRECISION,
+
+    -- Newest period folded in; a re-upsert of this period replaces last_value
+    last_period TIMESTAMPTZ,
+    last_value DOUBLE PRECISION,
+
+    -- Bumped on every write (optimistic locking between monitor workers)
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (movie_id, source)
+);
+
+-- 2. When the monitor last flagged a spike on ingest; TrendAnalyzer keeps such a
+--    spike while it is inside the analysis window and clears the flag once it
+--    rewrites the spike columns
+ALTER TABLE movie_trends ADD COLUMN IF NOT EXISTS spike_flagged_at TIMESTAMPTZ;
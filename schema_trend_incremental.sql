@@ -0,0 +1,15 @@
+-- Incremental Trend Analysis Migration
+-- Lets TrendAnalyzer skip movies whose snapshot window has not changed
+-- Run after schema_trend_analysis.sql and schema_safe_migration.sql: python3 apply_sql.py schema_trend_incremental.sql
+
+SET search_path TO movie_platform;
+
+-- 1. Last write time per snapshot row (store_daily_snapshot bumps it on upsert)
+ALTER TABLE daily_review_snapshots ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+-- 2. High-water mark of the snapshot window each classification was computed from:
+--    newest updated_at and row count; either changing means the window changed
+ALTER TABLE movie_trends ADD COLUMN IF NOT EXISTS snapshots_through TIMESTAMPTZ;
+ALTER TABLE movie_trends ADD COLUMN IF NOT EXISTS snapshot_count INTEGER;
+
+COMMENT ON COLUMN movie_trends.snapshots_through IS 'MAX(daily_review_snapshots.updated_at) in the window at last_calculated_at';
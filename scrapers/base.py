@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-import requests
 from bs4 import BeautifulSoup
+from http_client import get_http_client
 
 class BaseScraper(ABC):
     def __init__(self, region, language):
@@ -17,10 +17,13 @@ class BaseScraper(ABC):
         """Fetches the latest reviews for a specific reviewer."""
         pass
 
-    def _get_soup(self, url):
+    def _get_html(self, url):
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = get_http_client().get(url, headers=headers)
         response.raise_for_status()
-        return BeautifulSoup(response.text, 'html.parser')
+        return response.text
+
+    def _get_soup(self, url):
+        return BeautifulSoup(self._get_html(url), 'html.parser')
@@ -0,0 +1,110 @@
+"""
+Per-source circuit breaker
+Stops sending requests to a host that is failing or blocking us, so a bad
+hour for one site costs a handful of timeouts instead of one per movie.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while a source's circuit is open"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"circuit open for {name}, retrying in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a sliding window of outcomes.
+
+    Closed: requests flow; once at least CIRCUIT_MIN_REQUESTS of the last
+    `window` outcomes are in and CIRCUIT_FAILURE_RATE of them failed, the
+    circuit opens. Open: allow() refuses for CIRCUIT_OPEN_SECONDS, then the
+    circuit goes half-open. Half-open: one probe at a time is let through;
+    a success closes the circuit, a failure reopens it with the wait doubled
+    (up to `max_open_seconds`).
+    """
+
+    def __init__(self, name, failure_rate=None, min_requests=None, open_seconds=None,
+                 window=20, max_open_seconds=1800, clock=time.monotonic):
+        self.name = name
+        self.failure_rate = float(os.environ.get("CIRCUIT_FAILURE_RATE", 0.5)) if failure_rate is None else failure_rate
+        self.min_requests = int(os.environ.get("CIRCUIT_MIN_REQUESTS", 10)) if min_requests is None else min_requests
+        self.base_open_seconds = float(os.environ.get("CIRCUIT_OPEN_SECONDS", 120)) if open_seconds is None else open_seconds
+        self.max_open_seconds = max(max_open_seconds, self.base_open_seconds)
+        self._clock = clock
+        self._outcomes = deque(maxlen=max(window, self.min_requests))
+        self._lock = threading.Lock()
+
+        self.state = CLOSED
+        self.open_seconds = self.base_open_seconds
+        self.opened_at = None
+        self._probe_started = None
+
+    def retry_in(self):
+        """Seconds until an open circuit lets a probe through (0 when not open)"""
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(self.opened_at + self.open_seconds - self._clock(), 0.0)
+
+    def allow(self):
+        """Whether a request may be sent now; in half-open state this claims the probe"""
+        with self._lock:
+            now = self._clock()
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if now < self.opened_at + self.open_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self._probe_started = None
+                print(f"   🔌 {self.name} circuit half-open, probing")
+            # A probe that never reported back (e.g. no request was needed) expires
+            if self._probe_started is None or now - self._probe_started >= self.base_open_seconds:
+                self._probe_started = now
+                return True
+            return False
+
+    def record(self, success):
+        """Record one request outcome; returns the resulting state"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if success:
+                    self.state = CLOSED
+                    self.open_seconds = self.base_open_seconds
+                    self._outcomes.clear()
+                    print(f"   🔌 {self.name} circuit closed, source recovered")
+                else:
+                    self._open(min(self.open_seconds * 2, self.max_open_seconds))
+                return self.state
+
+            if self.state == OPEN:
+                return self.state  # Stragglers sent before the circuit opened
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_requests and failures >= self.failure_rate * len(self._outcomes):
+                print(f"   🔌 {self.name} circuit open: {failures}/{len(self._outcomes)} recent requests failed")
+                self._open(self.base_open_seconds)
+            return self.state
+
+    def _open(self, seconds):
+        self.state = OPEN
+        self.open_seconds = seconds
+        self.opened_at = self._clock()
+        self._probe_started = None
+        self._outcomes.clear()
+        print(f"   🔌 {self.name} paused for {seconds:.0f}s")
@@ -0,0 +1,242 @@
+"""
+Fast-path extraction for movie pages
+Reads JSON-LD blocks and known score elements with a regex scan of the raw
+HTML, so the common case never builds a BeautifulSoup tree. Each extractor
+returns None when a required field is missing; callers then fall back to the
+full parse. Hits and misses are counted per extractor in `stats`.
+"""
+import hashlib
+import json
+import re
+import threading
+
+_JSON_LD = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+_TAGS = re.compile(r'<[^>]+>')
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+_RELEASE_DATE = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d+,\s+\d{4}')
+_LANGUAGE = re.compile(
+    r'class="(?:label|meta-label)"[^>]*>[^<]*Language[^<]*</[^>]+>\s*<[^>]*class="(?:value|meta-value)"[^>]*>\s*([^<]+)<',
+    re.IGNORECASE
+)
+
+
+def _class(name):
+    return r'class="[^"]*\b' + re.escape(name) + r'\b[^"]*"'
+
+
+# Score-bearing elements, shared by the extractors and score_digest
+RT_CRITIC_SCORE = r'(?:slot="criticsScore"|data-qa="tomatometer")'
+RT_AUDIENCE_SCORE = r'(?:slot="audienceScore"|data-qa="audience-score")'
+RT_CRITIC_COUNT = r'(?:data-qa="tomatometer-review-count"|' + _class('scoreboard__info--reviews') + ')'
+RT_AUDIENCE_COUNT = r'data-qa="audience-rating-count"'
+IMDB_SCORE = r'data-testid="hero-rating-bar__aggregate-rating__score"'
+METACRITIC_SCORE = r'(?:' + _class('c-siteReviewScore_background-critic_medium') + '|' + _class('metascore_w') + ')'
+METACRITIC_USER_SCORE = _class('c-siteReviewScore_background-user')
+
+SCORE_ELEMENTS = {
+    'rt': [RT_CRITIC_SCORE, RT_AUDIENCE_SCORE, RT_CRITIC_COUNT, RT_AUDIENCE_COUNT],
+    'imdb': [IMDB_SCORE],
+    'metacritic': [METACRITIC_SCORE, METACRITIC_USER_SCORE],
+}
+
+LANGUAGE_CODES = {'english': 'en', 'spanish': 'es', 'french': 'fr', 'german': 'de', 'japanese': 'ja', 'korean': 'ko', 'hindi': 'hi'}
+
+
+class FastPathStats:
+    """Thread-safe hit/miss counters per extractor"""
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, hit):
+        with self._lock:
+            hits, misses = self._counts.get(name, (0, 0))
+            self._counts[name] = (hits + 1, misses) if hit else (hits, misses + 1)
+
+    def merge(self, counts):
+        """Add counts from another process, as returned by snapshot()"""
+        with self._lock:
+            for name, (hits, misses) in counts.items():
+                h, m = self._counts.get(name, (0, 0))
+                self._counts[name] = (h + hits, m + misses)
+
+    def snapshot(self):
+        """{extractor: (hits, misses)}"""
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+    def summary(self):
+        """One-line summary, e.g. 'rt 40/42, imdb 12/12' (hits/total)"""
+        return ", ".join(
+            f"{name} {hits}/{hits + misses}" for name, (hits, misses) in sorted(self.snapshot().items())
+        )
+
+
+stats = FastPathStats()
+
+
+def json_ld_objects(html):
+    """Yield every JSON-LD object on the page, flattening lists and @graph"""
+    for block in _JSON_LD.findall(html):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            item = pending.pop(0)
+            if isinstance(item, dict):
+                pending.extend(item.get('@graph', []))
+                yield item
+
+
+def find_movie(html):
+    """First JSON-LD object typed Movie, or None"""
+    for item in json_ld_objects(html):
+        types = item.get('@type')
+        if types == 'Movie' or (isinstance(types, list) and 'Movie' in types):
+            return item
+    return None
+
+
+def element_text(html, attr_pattern):
+    """Text of the first element whose opening tag matches attr_pattern.
+
+    Nested markup is stripped, so `<div data-x><span>7.5</span></div>` gives '7.5'.
+    """
+    match = re.search(r'<[a-zA-Z][\w-]*\b[^>]*?' + attr_pattern + r'[^>]*>(.*?)</', html, re.DOTALL)
+    if not match:
+        return None
+    return _TAGS.sub('', match.group(1)).strip() or None
+
+
+def _number(text, scale=1):
+    match = _NUMBER.search((text or '').replace(',', ''))
+    return float(match.group()) * scale if match else None
+
+
+def _count(text):
+    match = re.search(r'[\d,]+', text or '')
+    return int(match.group().replace(',', '')) if match and match.group().strip(',') else None
+
+
+def rt_ratings(html):
+    """Rotten Tomatoes ratings and review counts; needs both tomatometer and audience score"""
+    ratings = {}
+    review_counts = {}
+
+    movie = find_movie(html)
+    if movie:
+        agg = movie.get('aggregateRating') or {}
+        if agg.get('ratingValue'):
+            ratings['tomatometer'] = float(agg['ratingValue'])
+        if agg.get('reviewCount'):
+            review_counts['critic_reviews'] = int(agg['reviewCount'])
+
+    if 'tomatometer' not in ratings:
+        score = _number(element_text(html, RT_CRITIC_SCORE))
+        if score is not None:
+            ratings['tomatometer'] = score
+    audience = _number(element_text(html, RT_AUDIENCE_SCORE))
+    if audience is not None:
+        ratings['audience'] = audience
+
+    if 'tomatometer' not in ratings or 'audience' not in ratings:
+        stats.record('rt', False)
+        return None
+
+    critic_count = _count(element_text(html, RT_CRITIC_COUNT))
+    if critic_count is not None:
+        review_counts['critic_reviews'] = critic_count
+    audience_count = _count(element_text(html, RT_AUDIENCE_COUNT))
+    if audience_count is not None:
+        review_counts['audience_reviews'] = audience_count
+    if review_counts:
+        ratings['review_counts'] = review_counts
+
+    stats.record('rt', True)
+    return ratings
+
+
+def imdb_ratings(html):
+    """IMDb aggregate rating as a percentage"""
+    movie = find_movie(html)
+    score = None
+    if movie:
+        score = _number(str((movie.get('aggregateRating') or {}).get('ratingValue', '')), scale=10)
+    if score is None:
+        score = _number(element_text(html, IMDB_SCORE), scale=10)
+
+    stats.record('imdb', score is not None)
+    return {'imdb_score': score} if score is not None else None
+
+
+def metacritic_ratings(html):
+    """Metascore and user score; needs both"""
+    metascore = _number(element_text(html, METACRITIC_SCORE))
+    user_score = _number(element_text(html, METACRITIC_USER_SCORE), scale=10)
+
+    if metascore is None or user_score is None:
+        stats.record('metacritic', False)
+        return None
+    stats.record('metacritic', True)
+    return {'metascore': metascore, 'user_score': user_score}
+
+
+def rt_movie_details(html):
+    """Poster, genres and overview from RT's JSON-LD; needs all three"""
+    movie = find_movie(html) or {}
+    details = {}
+
+    release = _RELEASE_DATE.search(html)
+    if release:
+        details['release_date'] = release.group()
+
+    poster = movie.get('image')
+    if isinstance(poster, dict):
+        poster = poster.get('url')
+    if not poster:
+        og = re.search(r'<meta[^>]*property="og:image"[^>]*content="([^"]+)"', html)
+        poster = og.group(1) if og else None
+    if poster:
+        details['poster_url'] = poster
+
+    genres = movie.get('genre')
+    if genres:
+        details['genres'] = ([genres] if isinstance(genres, str) else list(genres))[:3]
+    if movie.get('description'):
+        details['overview'] = movie['description'].strip()
+
+    language = _LANGUAGE.search(html)
+    if language:
+        name = language.group(1).strip().split()[0].lower()
+        details['original_language'] = LANGUAGE_CODES.get(name, name[:2])
+
+    hit = all(key in details for key in ('poster_url', 'genres', 'overview'))
+    stats.record('rt_details', hit)
+    return details if hit else None
+
+
+def score_digest(kind, html):
+    """SHA-256 over a page's score-bearing region ('rt', 'imdb' or 'metacritic').
+
+    Covers the JSON-LD aggregateRating and the score/count elements the
+    parsers read, whitespace-normalised, so layout churn elsewhere on the page
+    does not count as a change. None when none of it is found, in which case
+    the page should always be parsed.
+    """
+    movie = find_movie(html)
+    parts = [json.dumps(movie.get('aggregateRating'), sort_keys=True) if movie else None]
+    parts += [element_text(html, pattern) for pattern in SCORE_ELEMENTS[kind]]
+    if not any(parts):
+        return None
+    region = "\x1f".join(" ".join(part.split()) if part else "" for part in parts)
+    return hashlib.sha256(region.encode("utf-8")).hexdigest()
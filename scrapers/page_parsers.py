@@ -0,0 +1,282 @@
+"""
+Page parsers shared by the scrapers
+Pure functions from raw HTML to plain dicts, so they can run in a ParsePool
+worker. Each tries the fast_extract path first and builds a BeautifulSoup tree
+only when it misses.
+"""
+import json
+import re
+
+from bs4 import BeautifulSoup
+
+from . import fast_extract
+
+RT_BASE_URL = "https://www.rottentomatoes.com"
+
+
+def parse_rt_page(html):
+    """Ratings and review counts from a Rotten Tomatoes movie page"""
+    # Fast path: JSON-LD and score elements without building a tree
+    ratings = fast_extract.rt_ratings(html)
+    if ratings is not None:
+        return ratings
+
+    movie_soup = BeautifulSoup(html, 'html.parser')
+    ratings = {}
+    review_counts = {}
+
+    # PRIMARY METHOD: Extract from JSON-LD schema data (most reliable)
+    for script in movie_soup.select('script[type="application/ld+json"]'):
+        try:
+            data = json.loads(script.string)
+            if data.get('@type') == 'Movie':
+                agg = data.get('aggregateRating', {})
+                if agg.get('ratingValue'):
+                    ratings['tomatometer'] = float(agg['ratingValue'])
+                if agg.get('reviewCount'):
+                    review_counts['critic_reviews'] = int(agg['reviewCount'])
+                break
+        except Exception:
+            pass
+
+    # FALLBACK: CSS selectors for audience score (not in JSON-LD)
+    if 'tomatometer' not in ratings:
+        tomatometer = movie_soup.select_one('rt-text[slot="criticsScore"], [data-qa="tomatometer"]')
+        if tomatometer:
+            score_text = tomatometer.text.strip().replace('%', '')
+            try:
+                ratings['tomatometer'] = float(score_text)
+            except Exception as e:
+                print(f"      Failed to parse tomatometer '{score_text}': {e}")
+
+    audience_score = movie_soup.select_one('rt-text[slot="audienceScore"], [data-qa="audience-score"]')
+    if audience_score:
+        score_text = audience_score.text.strip().replace('%', '')
+        try:
+            ratings['audience'] = float(score_text)
+        except Exception as e:
+            print(f"      Failed to parse audience score '{score_text}': {e}")
+
+    # Additional review counts from page scraping
+    page_review_counts = parse_review_counts(movie_soup)
+    if page_review_counts:
+        review_counts.update(page_review_counts)
+
+    if review_counts:
+        ratings['review_counts'] = review_counts
+
+    return ratings
+
+
+def parse_review_counts(soup):
+    """Extract review counts from an RT movie page tree"""
+    try:
+        counts = {}
+
+        # Try to find critic review count
+        critic_count_elem = soup.select_one('[data-qa="tomatometer-review-count"], .scoreboard__info--reviews')
+        if critic_count_elem:
+            text = critic_count_elem.text.strip()
+            # Extract number from text like "150 Reviews"
+            match = re.search(r'(\d+)', text)
+            if match:
+                counts['critic_reviews'] = int(match.group(1))
+
+        # Try to find audience review count
+        audience_count_elem = soup.select_one('[data-qa="audience-rating-count"]')
+        if audience_count_elem:
+            text = audience_count_elem.text.strip()
+            match = re.search(r'([\d,]+)', text)
+            if match:
+                counts['audience_reviews'] = int(match.group(1).replace(',', ''))
+
+        return counts if counts else None
+    except Exception as e:
+        print(f"      Failed to extract review counts: {e}")
+        return None
+
+
+def parse_imdb_page(html):
+    """Aggregate rating from an IMDb title page, as a percentage"""
+    fast = fast_extract.imdb_ratings(html)
+    if fast is not None:
+        return fast
+
+    movie_soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract rating
+    rating_elem = movie_soup.select_one('[data-testid="hero-rating-bar__aggregate-rating__score"] span')
+    if rating_elem:
+        score_text = rating_elem.text.strip()
+        try:
+            # IMDb uses 0-10 scale, convert to percentage
+            score = float(score_text) * 10
+            return {'imdb_score': score}
+        except:
+            pass
+
+    return None
+
+
+def parse_metacritic_page(html):
+    """Metascore and user score from a Metacritic movie page"""
+    fast = fast_extract.metacritic_ratings(html)
+    if fast is not None:
+        return fast
+
+    movie_soup = BeautifulSoup(html, 'html.parser')
+
+    ratings = {}
+
+    # Metascore (critic score)
+    metascore = movie_soup.select_one('.c-siteReviewScore_background-critic_medium span, .metascore_w')
+    if metascore:
+        try:
+            ratings['metascore'] = float(metascore.text.strip())
+        except:
+            pass
+
+    # User score
+    user_score = movie_soup.select_one('.c-siteReviewScore_background-user span')
+    if user_score:
+        try:
+            # User score is 0-10, convert to percentage
+            ratings['user_score'] = float(user_score.text.strip()) * 10
+        except:
+            pass
+
+    return ratings if ratings else None
+
+
+def parse_rt_movie_details(html, movie_title):
+    """Release date, poster, genres, overview and language from an RT movie page"""
+    # Fast path: JSON-LD without building a tree
+    details = fast_extract.rt_movie_details(html)
+    if details is not None:
+        print(f"    ✅ Got details from JSON-LD")
+        return details
+
+    soup = BeautifulSoup(html, 'html.parser')
+    details = {}
+
+    # Try to find release date
+    release_elem = soup.find(string=re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d+,\s+\d{4}'))
+    if release_elem:
+        details['release_date'] = release_elem.strip()
+
+    # POSTER EXTRACTION - Multiple methods for reliability
+    poster_url = None
+
+    # Method 1: JSON-LD schema (most reliable, unique per movie)
+    for script in soup.select('script[type="application/ld+json"]'):
+        try:
+            data = json.loads(script.string)
+            if data.get('@type') == 'Movie' and data.get('image'):
+                poster_url = data['image']
+                print(f"    ✅ Got poster from JSON-LD")
+                break
+        except:
+            pass
+
+    # Method 2: og:image meta tag
+    if not poster_url:
+        og_image = soup.select_one('meta[property="og:image"]')
+        if og_image and og_image.get('content'):
+            poster_url = og_image['content']
+            print(f"    ✅ Got poster from og:image")
+
+    # Method 3: Fallback to rt-img with movie title in alt
+    if not poster_url:
+        # Look for poster image matching movie title
+        for img in soup.select('rt-img'):
+            alt = img.get('alt', '').lower()
+            if 'poster' in alt and movie_title.lower().split()[0] in alt:
+                src = img.get('src') or img.get('srcset', '').split(',')[0].split(' ')[0]
+                if src and 'flixster' in src:
+                    poster_url = src
+                    print(f"    ✅ Got poster from rt-img")
+                    break
+
+    if poster_url:
+        details['poster_url'] = poster_url
+    else:
+        print(f"    ⚠️ No poster found")
+
+    # Try to find genre
+    genre_elems = soup.select('[data-qa="movie-info-item-value"]')
+    if genre_elems:
+        details['genres'] = [g.text.strip() for g in genre_elems[:3]]
+
+    # Try to find overview/synopsis
+    overview = soup.select_one('[data-qa="movie-info-synopsis"], .movie_synopsis')
+    if overview:
+        details['overview'] = overview.text.strip()
+
+    # Try to find "Original Language"
+    # It's usually in a list of info items. We need to find the label "Original Language" and get the value.
+    # RT struture: <li class="info-item"> <span class="label">Original Language:</span> <span class="value">English</span> </li>
+
+    # Generic finder for info items
+    info_items = soup.select('li.info-item, .meta-row')
+    for item in info_items:
+        label = item.select_one('.label, .meta-label')
+        value = item.select_one('.value, .meta-value')
+
+        if label and value and 'language' in label.text.lower():
+            details['original_language'] = value.text.strip().split()[0].lower() # "English" -> "english" -> "en" (simplified)
+            # Map common full names to codes if needed, or store full name
+            # For consistency with schema (varchar 10), store standardized if possible
+            details['original_language'] = fast_extract.LANGUAGE_CODES.get(details['original_language'].lower(), details['original_language'][:2])
+            print(f"    ✅ Found Language: {details['original_language']}")
+
+    return details
+
+
+def parse_critic_reviews(html, base_url=RT_BASE_URL):
+    """Latest reviews from an RT critic profile page"""
+    soup = BeautifulSoup(html, 'html.parser')
+    reviews = []
+
+    # Try primary selector
+    review_rows = soup.select('tr[data-qa="critic-review-row"]')
+
+    # Fallback: Find anything that looks like a movie link and has a rating nearby
+    if not review_rows:
+        # Look for links to movies
+        movie_links = soup.select('a[href*="/m/"]')
+        for link in movie_links[:10]:
+            # Try to find a rating icon or text in the parent containers
+            parent = link.find_parent(['tr', 'div', 'li'])
+            if parent:
+                rating_elem = parent.select_one('span.icon--fresh, span.icon--rotten, [class*="fresh"], [class*="rotten"]')
+                content_elem = parent.select_one('[class*="excerpt"], [class*="quote"], [class*="review"]')
+
+                rating = "Fresh"
+                if rating_elem and "rotten" in str(rating_elem).lower():
+                    rating = "Rotten"
+
+                reviews.append({
+                    "movie_title": link.text.strip(),
+                    "rating": rating,
+                    "content": content_elem.text.strip() if content_elem else "No excerpt available.",
+                    "review_date": None,
+                    "source_url": base_url + link['href'] if not link['href'].startswith('http') else link['href']
+                })
+    else:
+        for row in review_rows[:5]:
+            title_elem = row.select_one('a[data-qa="movie-link"]')
+            rating_elem = row.select_one('span.icon--fresh, span.icon--rotten')
+            content_elem = row.select_one('td.review-excerpt')
+            date_elem = row.select_one('td.review-date')
+
+            if title_elem:
+                rating = "Fresh" if "fresh" in str(rating_elem) else "Rotten"
+                reviews.append({
+                    "movie_title": title_elem.text.strip(),
+                    "rating": rating,
+                    "content": content_elem.text.strip() if content_elem else "",
+                    "review_date": date_elem.text.strip() if date_elem else None,
+                    "source_url": base_url + title_elem['href'] if not title_elem['href'].startswith('http') else title_elem['href']
+                })
+
+    return reviews
@@ -0,0 +1,88 @@
+"""
+Process pool for CPU-bound HTML parsing
+Scrapers fetch in threads and hand raw HTML to a parse function run here, so
+BeautifulSoup work spreads across cores instead of queuing behind the GIL.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from dotenv import load_dotenv
+
+from . import fast_extract
+
+load_dotenv()
+
+
+def _run_parser(func, args):
+    """Worker-side wrapper: also ships the worker's fast-path counts back"""
+    fast_extract.stats.reset()
+    result = func(*args)
+    return result, fast_extract.stats.snapshot()
+
+
+class ParsePool:
+    """Runs module-level parse functions (html -> plain dict) in worker processes.
+
+    Size comes from PARSE_POOL_SIZE (default: one worker per CPU). A size of 0
+    parses serially in the calling thread, which keeps tracebacks and
+    breakpoints simple when debugging. Workers start on first use.
+    """
+
+    def __init__(self, size=None):
+        if size is None:
+            size = int(os.environ.get("PARSE_POOL_SIZE", os.cpu_count() or 1))
+        self.size = max(size, 0)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def serial(self):
+        return self.size == 0
+
+    def parse(self, func, *args):
+        """Run func(*args) in a worker and return its result (blocking)"""
+        if self.serial:
+            return func(*args)
+
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that is running scraper threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.size, mp_context=multiprocessing.get_context("spawn")
+                )
+            executor = self._executor
+        result, counts = executor.submit(_run_parser, func, args).result()
+        fast_extract.stats.merge(counts)
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool(size=None):
+    """Return the process-wide parse pool, creating it on first use.
+
+    `size` only applies when the pool is created (e.g. from a --parse-workers flag).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool(size)
+        return _pool
+
+
+def close_parse_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
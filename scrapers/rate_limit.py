@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+
+class TokenBucket:
+    """Blocking token bucket shared by every thread hitting one host.
+
+    Tokens refill continuously at rate_per_minute up to `burst`; acquire()
+    takes one token, sleeping until it is available. A non-positive rate
+    disables limiting.
+    """
+
+    def __init__(self, rate_per_minute, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, blocking as needed. Returns seconds spent waiting."""
+        if self.rate_per_second <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate_per_second
+            self._sleep(delay)
+            waited += delay
+
+
+class AdaptiveConcurrency:
+    """AIMD cap on concurrent requests to one host.
+
+    Use as a context manager around each request, then record() its latency.
+    A throttled (429 / retried) or slow (over latency_target) response halves
+    the limit, at most once per `cooldown` seconds so one bad burst counts
+    once; `limit` healthy responses in a row add one slot, up to `maximum`.
+    """
+
+    def __init__(self, maximum, minimum=1, latency_target=None, decrease=0.5, cooldown=10.0,
+                 clock=time.monotonic):
+        self.maximum = max(maximum, 1)
+        self.minimum = min(max(minimum, 1), self.maximum)
+        self.latency_target = (float(os.environ.get("SCRAPE_LATENCY_TARGET_SECONDS", 5.0))
+                               if latency_target is None else latency_target)
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._clock = clock
+        self.limit = float(self.maximum)
+        self.in_use = 0
+        self._healthy = 0
+        self._last_decrease = None
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self.in_use >= int(self.limit):
+                self._cond.wait()
+            self.in_use += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self.in_use -= 1
+            self._cond.notify_all()
+        return False
+
+    def record(self, latency, throttled=False):
+        """Feed one response back; returns the (integer) limit afterwards"""
+        with self._cond:
+            if throttled or latency > self.latency_target:
+                self._healthy = 0
+                now = self._clock()
+                if self._last_decrease is None or now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+            else:
+                self._healthy += 1
+                if self._healthy >= int(self.limit) and self.limit < self.maximum:
+                    self.limit = min(self.maximum, int(self.limit) + 1)
+                    self._healthy = 0
+                    self._cond.notify_all()
+            return int(self.limit)
@@ -0,0 +1,103 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from psycopg2.extras import RealDictCursor
+
+
+class ResolutionCache:
+    """Persistent (movie, source) -> canonical page URL map, backed by movie_source_urls.
+
+    A NULL url is a negative entry: the site search found nothing, so the
+    source is skipped until the entry expires. Entries are held in memory
+    once read; load() pulls a whole batch of movies in one query. Each entry
+    also carries the page's HTTP validators (etag, last_modified) and the
+    digest of its score region from the last parse.
+    """
+
+    def __init__(self, conn, ttl_days=30, negative_ttl_hours=24):
+        self.conn = conn
+        self.ttl = timedelta(days=ttl_days)
+        self.negative_ttl = timedelta(hours=negative_ttl_hours)
+        self._entries = {}      # (movie_id, source) -> {'url': ..., 'expires_at': ...}
+        self._loaded = set()    # movie ids whose entries are all in memory
+        self._lock = threading.Lock()
+
+    def load(self, movie_ids):
+        """Read every unexpired entry for a batch of movies"""
+        movie_ids = [str(m) for m in movie_ids]
+        if not movie_ids:
+            return
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT movie_id, source, url, expires_at, etag, last_modified, content_digest
+                FROM movie_source_urls
+                WHERE movie_id = ANY(%s::uuid[]) AND expires_at > NOW();
+            """, (movie_ids,))
+            rows = cur.fetchall()
+        with self._lock:
+            for row in rows:
+                self._entries[(str(row['movie_id']), row['source'])] = {
+                    'url': row['url'], 'expires_at': row['expires_at'],
+                    'etag': row['etag'], 'last_modified': row['last_modified'],
+                    'content_digest': row['content_digest']
+                }
+            self._loaded.update(movie_ids)
+
+    def get(self, movie_id, source):
+        """Cached entry dict ({'url', 'expires_at', 'etag', 'last_modified', 'content_digest'}) or None on a miss/expiry"""
+        key = (str(movie_id), source)
+        with self._lock:
+            entry = self._entries.get(key)
+            loaded = key[0] in self._loaded
+        if entry is None and not loaded:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT url, expires_at, etag, last_modified, content_digest FROM movie_source_urls
+                    WHERE movie_id = %s AND source = %s AND expires_at > NOW();
+                """, key)
+                entry = cur.fetchone()
+            if entry:
+                with self._lock:
+                    self._entries[key] = dict(entry)
+        if entry is None or entry['expires_at'] <= datetime.now(timezone.utc):
+            return None
+        return entry
+
+    def put(self, movie_id, source, url):
+        """Record a resolved URL, or a negative entry when url is None (clears page state)"""
+        key = (str(movie_id), source)
+        expires_at = datetime.now(timezone.utc) + (self.ttl if url else self.negative_ttl)
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO movie_source_urls (movie_id, source, url, resolved_at, expires_at)
+                VALUES (%s, %s, %s, NOW(), %s)
+                ON CONFLICT (movie_id, source) DO UPDATE SET
+                    url = EXCLUDED.url,
+                    resolved_at = NOW(),
+                    expires_at = EXCLUDED.expires_at,
+                    etag = NULL,
+                    last_modified = NULL,
+                    content_digest = NULL;
+            """, (key[0], source, url, expires_at))
+        with self._lock:
+            self._entries[key] = {
+                'url': url, 'expires_at': expires_at,
+                'etag': None, 'last_modified': None, 'content_digest': None
+            }
+
+    def put_page_state(self, movie_id, source, validators, content_digest=None):
+        """Store the ETag / Last-Modified and score digest of the latest full fetch.
+
+        Skips the write when nothing changed.
+        """
+        key = (str(movie_id), source)
+        state = (validators.get('etag'), validators.get('last_modified'), content_digest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry['etag'], entry['last_modified'], entry['content_digest']) == state:
+                return
+            entry['etag'], entry['last_modified'], entry['content_digest'] = state
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE movie_source_urls SET etag = %s, last_modified = %s, content_digest = %s
+                WHERE movie_id = %s AND source = %s;
+            """, state + key)
@@ -0,0 +1,129 @@
+"""
+Buffered writer for the rating monitor's high-volume tables
+Batches rating_snapshots and scrape_logs rows into multi-row INSERTs
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from metrics import metrics
+
+SNAPSHOT_COLUMNS = ('movie_id', 'source', 'rating_type', 'rating_value', 'review_count', 'snapshot_time')
+LOG_COLUMNS = ('source_name', 'movie_id', 'status', 'error_message', 'snapshots_created', 'scraped_at')
+
+
+class SnapshotWriter:
+    """Collects rows in memory and flushes them when max_rows are pending,
+    when the oldest pending row is max_age_seconds old, or on flush()/close().
+    The age check runs on every add and on flush_if_stale(), which long-lived
+    loops call each pass so a partial buffer is written even when no more
+    rows arrive.
+
+    Timestamps are taken when a row is added, so buffering does not shift
+    snapshot_time or scraped_at.
+    """
+
+    def __init__(self, conn, max_rows=200, max_age_seconds=30):
+        self.conn = conn
+        self.max_rows = max_rows
+        self.max_age_seconds = max_age_seconds
+        self._snapshots = []
+        self._logs = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self.snapshots_written = 0
+        self.logs_written = 0
+
+    def add_snapshot(self, movie_id, source, rating_type, rating_value, review_count=0):
+        """Queue a rating snapshot; returns the row as it will be stored"""
+        row = {
+            'movie_id': movie_id,
+            'source': source,
+            'rating_type': rating_type,
+            'rating_value': rating_value,
+            'review_count': review_count,
+            'snapshot_time': datetime.now(timezone.utc)
+        }
+        self._add(self._snapshots, row)
+        return row
+
+    def add_log(self, source_name, movie_id, status, error_message=None, snapshots_created=0):
+        """Queue a scrape_logs row"""
+        self._add(self._logs, {
+            'source_name': source_name,
+            'movie_id': movie_id,
+            'status': status,
+            'error_message': error_message,
+            'snapshots_created': snapshots_created,
+            'scraped_at': datetime.now(timezone.utc)
+        })
+
+    def _add(self, buffer, row):
+        with self._lock:
+            buffer.append(row)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            pending = len(self._snapshots) + len(self._logs)
+            due = pending >= self.max_rows or time.monotonic() - self._oldest >= self.max_age_seconds
+        if due:
+            self.flush()
+
+    def flush_if_stale(self):
+        """Flush if the oldest pending row is max_age_seconds old. Returns (snapshots, logs) written."""
+        with self._lock:
+            due = self._oldest is not None and time.monotonic() - self._oldest >= self.max_age_seconds
+        return self.flush() if due else (0, 0)
+
+    def flush(self):
+        """Write everything pending. Returns (snapshots, logs) written."""
+        with self._lock:
+            snapshots, self._snapshots = self._snapshots, []
+            logs, self._logs = self._logs, []
+            self._oldest = None
+        if not snapshots and not logs:
+            return 0, 0
+
+        with metrics.timer('db_write'):
+            return self._write(snapshots, logs)
+
+    def _write(self, snapshots, logs):
+        snapshots_written = self._insert("""
+            INSERT INTO rating_snapshots (movie_id, source, rating_type, rating_value, review_count, snapshot_time)
+            VALUES %s
+            ON CONFLICT (movie_id, source, rating_type, snapshot_time) DO NOTHING
+            RETURNING 1;
+        """, SNAPSHOT_COLUMNS, snapshots)
+        logs_written = self._insert("""
+            INSERT INTO scrape_logs (source_name, movie_id, status, error_message, snapshots_created, scraped_at)
+            VALUES %s
+            RETURNING 1;
+        """, LOG_COLUMNS, logs)
+
+        self.snapshots_written += snapshots_written
+        self.logs_written += logs_written
+        return snapshots_written, logs_written
+
+    def _insert(self, query, columns, rows):
+        if not rows:
+            return 0
+        values = [tuple(row[c] for c in columns) for row in rows]
+        try:
+            with self.conn.cursor() as cur:
+                return len(execute_values(cur, query, values, page_size=len(values), fetch=True))
+        except psycopg2.Error as e:
+            # One bad row (e.g. a movie deleted mid-cycle) should not drop the batch
+            print(f"    ⚠️ Batch insert failed ({e.pgcode}), retrying {len(values)} rows individually")
+            written = 0
+            for value in values:
+                try:
+                    with self.conn.cursor() as cur:
+                        written += len(execute_values(cur, query, [value], fetch=True))
+                except psycopg2.Error as row_error:
+                    print(f"    ❌ Dropped row: {row_error}")
+            return written
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,198 @@
+"""
+Streaming review statistics for spike detection on ingest
+One accumulator per (movie, source) over new_reviews_today: Welford running
+mean/variance plus an exponentially weighted mean/variance. Each
+daily_review_snapshots row the monitor writes is folded in with O(1) work
+and checked against the statistics from before it arrived, so a spike is
+flagged within minutes instead of at the next analyzer sweep. With the state
+cached that is one UPDATE; a cache miss adds a SELECT, and a flagged spike
+one movie_trends upsert.
+
+The monitor upserts the current period's row several times as reviews come
+in, so a value for the same period replaces the previous one (Welford
+removal) rather than counting twice.
+"""
+import math
+import threading
+
+from psycopg2.extras import RealDictCursor
+
+# Same threshold as TrendAnalyzer.detect_anomalies
+SPIKE_SIGMA = 5.0
+# Observations needed before a z-score is trusted
+MIN_SAMPLES = 3
+# Weight of the newest observation in the EWMA
+EWMA_ALPHA = 0.3
+
+STATE_FIELDS = ('n', 'mean', 'm2', 'ewma_mean', 'ewma_var', 'prev_ewma_mean', 'prev_ewma_var',
+                'last_period', 'last_value')
+
+
+class RunningStats:
+    """Welford and EWMA accumulators for one series"""
+
+    def __init__(self, n=0, mean=0.0, m2=0.0, ewma_mean=None, ewma_var=None,
+                 prev_ewma_mean=None, prev_ewma_var=None, last_period=None, last_value=None, version=0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+        self.ewma_mean = ewma_mean
+        self.ewma_var = ewma_var
+        # EWMA state before last_value, so a revised period can be re-applied
+        self.prev_ewma_mean = prev_ewma_mean
+        self.prev_ewma_var = prev_ewma_var
+        self.last_period = last_period
+        self.last_value = last_value
+        self.version = version
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**{field: row[field] for field in STATE_FIELDS + ('version',)})
+
+    def as_row(self):
+        return {field: getattr(self, field) for field in STATE_FIELDS}
+
+    def copy(self):
+        return RunningStats(version=self.version, **self.as_row())
+
+    @property
+    def variance(self):
+        """Sample variance (0 until two observations)"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def _add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+        self.prev_ewma_mean, self.prev_ewma_var = self.ewma_mean, self.ewma_var
+        if self.ewma_mean is None:
+            self.ewma_mean, self.ewma_var = float(x), 0.0
+        else:
+            delta = x - self.ewma_mean
+            self.ewma_mean += EWMA_ALPHA * delta
+            self.ewma_var = (1 - EWMA_ALPHA) * (self.ewma_var + EWMA_ALPHA * delta * delta)
+
+    def _remove_last(self):
+        x = self.last_value
+        if self.n <= 1:
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        else:
+            mean_without = (self.n * self.mean - x) / (self.n - 1)
+            self.m2 = max(self.m2 - (x - mean_without) * (x - self.mean), 0.0)
+            self.mean = mean_without
+            self.n -= 1
+        self.ewma_mean, self.ewma_var = self.prev_ewma_mean, self.prev_ewma_var
+
+    def z_scores(self, x):
+        """(Welford z, EWMA z) of x against the current state; None where not yet meaningful"""
+        if self.n < MIN_SAMPLES:
+            return None, None
+        welford = (x - self.mean) / math.sqrt(self.variance) if self.variance > 0 else None
+        ewma = (x - self.ewma_mean) / math.sqrt(self.ewma_var) if self.ewma_var else None
+        return welford, ewma
+
+    def observe(self, period, x):
+        """Fold in the value for `period`, replacing an earlier value for the same period.
+
+        Returns the spike magnitude in σ (the larger of the two z-scores) if x
+        is more than SPIKE_SIGMA above what came before, else None.
+        """
+        if self.last_period is not None and period == self.last_period:
+            self._remove_last()
+        elif self.last_period is not None and period < self.last_period:
+            return None  # Late row for a closed period; the stream has moved on
+
+        scores = [z for z in self.z_scores(x) if z is not None]
+        self._add(x)
+        self.last_period, self.last_value = period, x
+
+        magnitude = max(scores, default=None)
+        return magnitude if magnitude is not None and magnitude > SPIKE_SIGMA else None
+
+
+class ReviewStreamStats:
+    """RunningStats per (movie, source), persisted in review_stream_stats.
+
+    State is cached after the first read; writes are guarded by a version
+    column so monitor workers in other processes never lose an update (a
+    conflict reloads the row and folds again).
+    """
+
+    def __init__(self, conn, max_attempts=3):
+        self.conn = conn
+        self.max_attempts = max_attempts
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _load(self, movie_id, source):
+        key = (str(movie_id), source)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key].copy()
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT * FROM review_stream_stats WHERE movie_id = %s AND source = %s;
+            """, (str(movie_id), source))
+            row = cur.fetchone()
+        return RunningStats.from_row(row) if row else None
+
+    def _save(self, movie_id, source, state, expected_version):
+        row = state.as_row()
+        with self.conn.cursor() as cur:
+            if expected_version is None:
+                cur.execute(f"""
+                    INSERT INTO review_stream_stats (movie_id, source, {', '.join(STATE_FIELDS)}, version)
+                    VALUES (%s, %s, {', '.join(['%s'] * len(STATE_FIELDS))}, 1)
+                    ON CONFLICT (movie_id, source) DO NOTHING;
+                """, (str(movie_id), source, *row.values()))
+            else:
+                cur.execute(f"""
+                    UPDATE review_stream_stats
+                    SET {', '.join(f'{field} = %s' for field in STATE_FIELDS)},
+                        version = version + 1, updated_at = NOW()
+                    WHERE movie_id = %s AND source = %s AND version = %s;
+                """, (*row.values(), str(movie_id), source, expected_version))
+            saved = cur.rowcount == 1
+        with self._lock:
+            if saved:
+                state.version = (expected_version or 0) + 1
+                self._cache[(str(movie_id), source)] = state.copy()
+            else:
+                self._cache.pop((str(movie_id), source), None)
+        return saved
+
+    def observe(self, snapshot):
+        """Fold a daily_review_snapshots row in; returns the spike magnitude or None"""
+        movie_id, source = snapshot['movie_id'], snapshot['source']
+        value = snapshot['new_reviews_today'] or 0
+        for _ in range(self.max_attempts):
+            state = self._load(movie_id, source)
+            expected = state.version if state else None
+            state = state or RunningStats()
+            magnitude = state.observe(snapshot['snapshot_time'], value)
+            if self._save(movie_id, source, state, expected):
+                if magnitude is not None:
+                    self.flag_spike(movie_id, snapshot['snapshot_date'], magnitude)
+                return magnitude
+        raise RuntimeError(f"review_stream_stats for {movie_id}/{source} kept changing underneath us")
+
+    def flag_spike(self, movie_id, spike_date, magnitude):
+        """Mark the movie's trend row as spiking now, ahead of the next analyzer run"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO movie_trends (
+                    movie_id, has_suspicious_activity, spike_detected, spike_date, spike_magnitude, spike_flagged_at
+                )
+                VALUES (%s, true, true, %s, %s, NOW())
+                ON CONFLICT (movie_id) DO UPDATE SET
+                    has_suspicious_activity = true,
+                    spike_detected = true,
+                    spike_date = EXCLUDED.spike_date,
+                    spike_flagged_at = NOW(),
+                    spike_magnitude = GREATEST(
+                        CASE WHEN movie_trends.spike_date = EXCLUDED.spike_date THEN movie_trends.spike_magnitude END,
+                        EXCLUDED.spike_magnitude
+                    );
+            """, (str(movie_id), spike_date, magnitude))
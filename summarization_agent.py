@@ -1,5 +1,8 @@
+import argparse
 from database import Database
 from llm_client import LLMClient
+from metrics import metrics, start_metrics_server
+from profiling import add_profile_arguments, profiled
 import time
 
 def summarization_agent():
@@ -16,26 +19,22 @@ def summarization_agent():
 
     print(f"Found {len(movies_to_process)} movies to summarize.")
     
+    summarized = 0
     for movie in movies_to_process:
         tmdb_id = movie['tmdb_id']
         title = movie['title']
         
         print(f"Processing '{title}' (ID: {tmdb_id})...")
         
-        # Fetch reviews for this movie
-        # Note: Using get_movie_reviews logic which relies on title matching for now
-        # Ideally, we should fetch by ID if our scraping linked them correctly.
-        # Given the current scraper structure, we'll try to fetch by ID first if supported,
-        # but our database.get_movie_reviews uses ID to find title then looks up reviews.
-        # So we can use that.
-        reviews = db.get_movie_reviews(tmdb_id)
+        # Fetch the first page of reviews for this movie (joined on movie id)
+        reviews = db.get_movie_reviews(tmdb_id, limit=20) # Limit to 20 reviews context
         
         if not reviews:
             print(f"  - No reviews found for '{title}'. Skipping.")
             continue
             
         # Combine review content
-        reviews_text = "\n".join([f"- {r['content']}" for r in reviews[:20]]) # Limit to 20 reviews context
+        reviews_text = "\n".join([f"- {r['content']}" for r in reviews])
         
         if not reviews_text:
             print("  - Empty review content.")
@@ -46,9 +45,21 @@ def summarization_agent():
         
         db.update_movie_summary(tmdb_id, pos, neg)
         print(f"  - Summary updated for '{title}'.")
+        summarized += 1
         
         # Respect rate limits if needed
         time.sleep(1)
 
+    # LLM latency (llm_call) and the rest of the run as one JSON line
+    metrics.emit_cycle_summary('summarization_agent', movies=len(movies_to_process), summarized=summarized)
+
 if __name__ == "__main__":
-    summarization_agent()
+    parser = argparse.ArgumentParser(description='Review Summarization Agent')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics on this local port (default: METRICS_PORT, off if unset)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    start_metrics_server(args.metrics_port)
+    with profiled('summarization_agent', args):
+        summarization_agent()
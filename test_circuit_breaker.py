@@ -0,0 +1,51 @@
+import unittest
+from scrapers.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker('IMDb', failure_rate=0.5, min_requests=4, open_seconds=60, clock=self.clock)
+
+    def trip(self):
+        for success in (True, False, False, True):
+            self.breaker.record(success)
+
+    def test_opens_at_failure_rate_once_enough_requests(self):
+        for _ in range(3):
+            self.breaker.record(False)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.retry_in(), 60)
+
+    def test_half_open_allows_one_probe_and_success_closes(self):
+        self.trip()
+        self.clock.now = 60
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.record(True), CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens_with_longer_wait(self):
+        self.trip()
+        self.clock.now = 60
+        self.breaker.allow()
+        self.assertEqual(self.breaker.record(False), OPEN)
+        self.assertEqual(self.breaker.retry_in(), 120)
+
+    def test_mostly_healthy_source_stays_closed(self):
+        for i in range(40):
+            self.breaker.record(i % 4 != 0)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+if __name__ == '__main__':
+    unittest.main()
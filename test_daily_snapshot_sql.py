@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+import uuid
+from datetime import date, timedelta
+from unittest.mock import patch
+import psycopg2
+from db_pool import connect_kwargs_from_env
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agents'))
+from rating_monitor import RatingMonitor
+
+# Session-local tables that shadow the real ones (pg_temp is searched first)
+TEMP_TABLES = """
+    CREATE TEMP TABLE movies (id UUID PRIMARY KEY, release_date DATE);
+    CREATE TEMP TABLE daily_review_snapshots (
+        movie_id UUID, source TEXT, snapshot_date DATE, snapshot_time TIMESTAMPTZ,
+        total_reviews INTEGER, new_reviews_today INTEGER,
+        critic_score FLOAT, audience_score FLOAT, score_change FLOAT, review_velocity FLOAT,
+        updated_at TIMESTAMPTZ DEFAULT NOW(),
+        UNIQUE (movie_id, source, snapshot_time)
+    );
+"""
+
+class TestDailySnapshotSql(unittest.TestCase):
+    """store_daily_snapshot against the database in DB_* (skipped when it is unreachable)"""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            cls.conn = psycopg2.connect(connect_timeout=3, **connect_kwargs_from_env())
+        except psycopg2.OperationalError as e:
+            raise unittest.SkipTest(f"no database: {e}")
+        cls.conn.autocommit = True
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+
+    def setUp(self):
+        with self.conn.cursor() as cur:
+            cur.execute("DROP TABLE IF EXISTS pg_temp.movies, pg_temp.daily_review_snapshots;" + TEMP_TABLES)
+        with patch('rating_monitor.get_pool'), patch('rating_monitor.get_parse_pool'):
+            self.monitor = RatingMonitor()
+        self.monitor.conn = self.conn
+        self.movie_id = str(uuid.uuid4())
+        with self.conn.cursor() as cur:
+            cur.execute("INSERT INTO movies VALUES (%s, %s);", (self.movie_id, date.today() - timedelta(days=10)))
+
+    def previous(self, total_reviews, critic_score, interval='1 day', trunc='day'):
+        with self.conn.cursor() as cur:
+            cur.execute(f"""
+                INSERT INTO daily_review_snapshots (movie_id, source, snapshot_date, snapshot_time, total_reviews, critic_score)
+                VALUES (%s, 'RottenTomatoes', CURRENT_DATE, DATE_TRUNC('{trunc}', NOW()) - INTERVAL '{interval}', %s, %s);
+            """, (self.movie_id, total_reviews, critic_score))
+
+    def store(self, critic_score, critic_reviews, interval='daily'):
+        return self.monitor.store_daily_snapshot(
+            self.movie_id, 'RottenTomatoes', {'tomatometer': critic_score, 'audience': 90.0},
+            {'critic_reviews': critic_reviews, 'audience_reviews': 0}, interval=interval)
+
+    def test_first_snapshot_has_no_new_reviews(self):
+        row = self.store(85.0, 120)
+        self.assertEqual((row['total_reviews'], row['new_reviews_today'], row['score_change']), (120, 0, 0.0))
+        self.assertEqual(row['review_velocity'], 12.0)
+
+    def test_change_against_previous_period(self):
+        self.previous(100, 80.0)
+        row = self.store(85.0, 130)
+        self.assertEqual((row['new_reviews_today'], row['score_change']), (30, 5.0))
+
+    def test_zero_critic_score_gives_no_score_change(self):
+        self.previous(100, 0.0)
+        self.assertEqual(self.store(85.0, 130)['score_change'], 0.0)
+        self.previous(100, 80.0, interval='1 hour', trunc='hour')
+        self.assertEqual(self.store(0.0, 130, interval='hourly')['score_change'], 0.0)
+
+    def test_same_period_is_updated_in_place(self):
+        self.previous(100, 80.0)
+        self.store(85.0, 110)
+        row = self.store(86.0, 125)
+        self.assertEqual((row['new_reviews_today'], row['score_change']), (25, 6.0))
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM daily_review_snapshots;")
+            self.assertEqual(cur.fetchone()[0], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from database import Database
+
+class TestSearchMovies(unittest.TestCase):
+    def setUp(self):
+        with patch('database.get_pool'):
+            self.db = Database()
+        self.cur = self.db.conn.cursor.return_value.__enter__.return_value
+
+    def test_short_page_gives_exact_total(self):
+        self.cur.fetchall.return_value = [{'title': 'Inception'}]
+        result = self.db.search_movies("Inception", limit=20, offset=40)
+        self.assertEqual(result['total_estimate'], 41)
+        self.assertEqual(self.cur.execute.call_count, 1)
+
+    def test_offset_past_the_end_counts_matches(self):
+        self.cur.fetchall.return_value = []
+        self.cur.fetchone.return_value = {'total': 12}
+        result = self.db.search_movies("Inception", limit=20, offset=100)
+        self.assertEqual(result['movies'], [])
+        self.assertEqual(result['total_estimate'], 12)
+        self.assertIn('COUNT(*)', self.cur.execute.call_args.args[0])
+
+class TestMovieStats(unittest.TestCase):
+    def setUp(self):
+        with patch('database.get_pool'):
+            self.db = Database()
+        self.cur = self.db.conn.cursor.return_value.__enter__.return_value
+
+    def test_reads_only_the_aggregate(self):
+        self.cur.fetchone.return_value = {'review_count': 4, 'fresh_count': 3, 'rotten_count': 1,
+                                          'last_review_date': '2026-03-10'}
+        stats = self.db.get_movie_stats("Inception")
+        self.assertEqual((stats['count'], stats['fresh_score'], stats['rotten_count']), (4, 75.0, 1))
+        self.assertEqual(self.cur.execute.call_count, 1)
+        sql, params = self.cur.execute.call_args.args
+        self.assertIn('FROM movie_review_stats', sql)
+        self.assertNotIn('FROM reviews', sql)
+        self.assertNotIn('JOIN reviews', sql)
+        self.assertEqual(params, ("Inception",))
+
+    def test_missing_or_empty_row_is_zero(self):
+        for row in (None, {'review_count': 0, 'fresh_count': 0, 'rotten_count': 0, 'last_review_date': None}):
+            self.cur.fetchone.return_value = row
+            self.assertEqual(self.db.get_movie_stats("Inception"), {"count": 0, "fresh_score": 0})
+
+    def test_rebuild_calls_server_function(self):
+        self.cur.fetchone.return_value = (12,)
+        self.assertEqual(self.db.rebuild_movie_stats(), 12)
+        self.assertIn('rebuild_movie_review_stats()', self.cur.execute.call_args.args[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from db_pool import ConnectionPool
+
+def fake_connect(**kwargs):
+    conn = MagicMock()
+    conn.closed = 0
+    conn.autocommit = False
+    conn.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('db_pool.psycopg2.connect', side_effect=fake_connect)
+        self.mock_connect = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_connections_are_reused(self):
+        pool = ConnectionPool(minconn=1, maxconn=2)
+        conn = pool.getconn()
+        self.assertTrue(conn.autocommit)
+        pool.putconn(conn)
+        self.assertIs(pool.getconn(), conn)
+        self.assertEqual(self.mock_connect.call_count, 1)
+
+    def test_blocks_until_connection_returned(self):
+        pool = ConnectionPool(minconn=0, maxconn=1, acquire_timeout=2)
+        first = pool.getconn()
+        threading.Timer(0.05, pool.putconn, args=(first,)).start()
+        self.assertIs(pool.getconn(), first)
+        self.assertEqual(pool.stats()['waits'], 1)
+
+    def test_exhausted_pool_times_out(self):
+        pool = ConnectionPool(minconn=0, maxconn=1, acquire_timeout=0.05)
+        pool.getconn()
+        with self.assertRaises(PoolError):
+            pool.getconn()
+
+    def test_failed_healthcheck_replaces_connection(self):
+        pool = ConnectionPool(minconn=1, maxconn=1, healthcheck_interval=0)
+        stale = pool.getconn()
+        pool.putconn(stale)
+        stale.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError()
+        fresh = pool.getconn()
+        self.assertIsNot(fresh, stale)
+        stats = pool.stats()
+        self.assertEqual(stats['healthcheck_failures'], 1)
+        self.assertEqual(stats['open'], 1)
+        self.assertEqual(stats['in_use'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from scrapers import fast_extract
+
+RT_PAGE = """
+<html><head>
+<script type="application/ld+json">{"@context": "http://schema.org", "@type": "Movie", "name": "Wicked",
+ "image": "https://resizing.flixster.com/wicked.jpg", "genre": ["Fantasy", "Musical", "Drama", "Romance"],
+ "description": " Elphaba meets Glinda. ",
+ "aggregateRating": {"@type": "AggregateRating", "ratingValue": "88", "reviewCount": 312}}</script>
+</head><body>
+<rt-text slot="criticsScore" context="label">88%</rt-text>
+<rt-text slot="audienceScore" context="label">96%</rt-text>
+<rt-link data-qa="audience-rating-count">10,000+ Verified Ratings</rt-link>
+<li class="info-item"><span class="label">Original Language:</span> <span class="value">English</span></li>
+<p>Released Nov 22, 2024</p>
+</body></html>
+"""
+
+class TestFastExtract(unittest.TestCase):
+    def setUp(self):
+        fast_extract.stats.reset()
+
+    def test_rt_ratings_from_json_ld_and_slots(self):
+        ratings = fast_extract.rt_ratings(RT_PAGE)
+        self.assertEqual(ratings['tomatometer'], 88.0)
+        self.assertEqual(ratings['audience'], 96.0)
+        self.assertEqual(ratings['review_counts'], {'critic_reviews': 312, 'audience_reviews': 10000})
+        self.assertEqual(fast_extract.stats.snapshot(), {'rt': (1, 0)})
+
+    def test_rt_miss_without_audience_score(self):
+        page = RT_PAGE.replace('slot="audienceScore"', 'slot="somethingElse"')
+        self.assertIsNone(fast_extract.rt_ratings(page))
+        self.assertEqual(fast_extract.stats.snapshot(), {'rt': (0, 1)})
+
+    def test_imdb_score_from_nested_span(self):
+        page = '<div data-testid="hero-rating-bar__aggregate-rating__score"><span class="sc">7.5</span><span>/10</span></div>'
+        self.assertEqual(fast_extract.imdb_ratings(page), {'imdb_score': 75.0})
+
+    def test_metacritic_needs_both_scores(self):
+        page = ('<div class="c-siteReviewScore c-siteReviewScore_background-critic_medium"><span>73</span></div>'
+                '<div class="c-siteReviewScore c-siteReviewScore_background-user"><span>8.1</span></div>')
+        self.assertEqual(fast_extract.metacritic_ratings(page), {'metascore': 73.0, 'user_score': 81.0})
+        self.assertIsNone(fast_extract.metacritic_ratings(page.split('</div>')[0] + '</div>'))
+        self.assertEqual(fast_extract.stats.snapshot(), {'metacritic': (1, 1)})
+
+    def test_rt_movie_details(self):
+        details = fast_extract.rt_movie_details(RT_PAGE)
+        self.assertEqual(details['poster_url'], 'https://resizing.flixster.com/wicked.jpg')
+        self.assertEqual(details['genres'], ['Fantasy', 'Musical', 'Drama'])
+        self.assertEqual(details['overview'], 'Elphaba meets Glinda.')
+        self.assertEqual(details['release_date'], 'Nov 22, 2024')
+        self.assertEqual(details['original_language'], 'en')
+
+    def test_graph_and_list_json_ld(self):
+        page = '<script type="application/ld+json">[{"@graph": [{"@type": ["Movie"], "name": "X"}]}]</script>'
+        self.assertEqual(fast_extract.find_movie(page)['name'], 'X')
+
+    def test_score_digest_ignores_markup_outside_score_region(self):
+        digest = fast_extract.score_digest('rt', RT_PAGE)
+        self.assertEqual(digest, fast_extract.score_digest('rt', RT_PAGE.replace('<p>Released', '<p class="x">Out')))
+        self.assertEqual(digest, fast_extract.score_digest('rt', RT_PAGE.replace('>96%<', '>  96%\n<')))
+        self.assertNotEqual(digest, fast_extract.score_digest('rt', RT_PAGE.replace('96%', '97%')))
+        self.assertNotEqual(digest, fast_extract.score_digest('rt', RT_PAGE.replace('312', '313')))
+        self.assertIsNone(fast_extract.score_digest('imdb', '<html>No scores</html>'))
+
+if __name__ == '__main__':
+    unittest.main()
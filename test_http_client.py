@@ -0,0 +1,64 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+import requests
+from http_client import HttpClient, retry_after_seconds, validators_from
+
+def response(status, headers=None):
+    resp = MagicMock(status_code=status)
+    resp.headers = headers or {}
+    return resp
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.sleeps = []
+        self.client = HttpClient(max_retries=2, backoff=1.0, backoff_max=30, sleep=self.sleeps.append)
+
+    def test_retries_server_errors_with_capped_backoff(self):
+        with patch.object(self.client.session, 'get', side_effect=[response(503), response(502), response(200)]) as get:
+            self.assertEqual(self.client.get('https://example.com/a').status_code, 200)
+        self.assertEqual(get.call_count, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertLessEqual(self.sleeps[0], 1.0)
+        self.assertLessEqual(self.sleeps[1], 2.0)
+
+    def test_honours_retry_after(self):
+        with patch.object(self.client.session, 'get', side_effect=[response(429, {'Retry-After': '7'}), response(200)]):
+            self.client.get('https://example.com/a')
+        self.assertEqual(self.sleeps, [7.0])
+
+    def test_returns_last_response_when_retries_run_out(self):
+        with patch.object(self.client.session, 'get', return_value=response(503)) as get:
+            self.assertEqual(self.client.get('https://example.com/a').status_code, 503)
+        self.assertEqual(get.call_count, 3)
+
+    def test_connection_errors_are_retried_then_raised(self):
+        with patch.object(self.client.session, 'get', side_effect=requests.ConnectionError('boom')):
+            with self.assertRaises(requests.ConnectionError):
+                self.client.get('https://example.com/a')
+        self.assertEqual(self.client.stats()['retries'], 2)
+
+    def test_conditional_get_sends_validators(self):
+        with patch.object(self.client.session, 'get', return_value=response(304)) as get:
+            resp = self.client.get('https://example.com/a', validators={'etag': '"v1"', 'last_modified': None})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        self.assertEqual(self.client.stats()['not_modified'], 1)
+
+    def test_before_attempt_runs_for_every_try(self):
+        attempts = []
+        with patch.object(self.client.session, 'get', side_effect=[response(429), response(503), response(200)]):
+            self.client.get('https://example.com/a', before_attempt=attempts.append)
+        self.assertEqual(attempts, [0, 1, 2])
+
+    def test_validators_from_response(self):
+        resp = response(200, {'ETag': '"v2"', 'Last-Modified': 'Tue, 10 Mar 2026 12:00:00 GMT'})
+        self.assertEqual(validators_from(resp), {'etag': '"v2"', 'last_modified': 'Tue, 10 Mar 2026 12:00:00 GMT'})
+
+    def test_retry_after_http_date(self):
+        now = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+        self.assertEqual(retry_after_seconds('Tue, 10 Mar 2026 12:00:30 GMT', now=now), 30.0)
+        self.assertIsNone(retry_after_seconds('soon'))
+
+if __name__ == '__main__':
+    unittest.main()
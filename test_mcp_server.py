@@ -9,20 +9,45 @@ class TestMCPServer(unittest.TestCase):
             {"title": "Inception", "release_date": "2010-07-16", "tmdb_id": 27205}
         ]
         
+        result = list_movies(region="US")
+        self.assertIn("Inception", result)
+        self.assertIn("27205", result)
+
+    @patch('mcp_server.db')
+    def test_list_movies_title_search(self, mock_db):
+        mock_db.search_movies.return_value = {
+            "movies": [{"title": "Inception", "release_date": "2010-07-16", "tmdb_id": 27205}],
+            "total_estimate": 1, "limit": 20, "offset": 0
+        }
+        
         result = list_movies(title="Inception")
+        mock_db.search_movies.assert_called_once_with("Inception", region=None, language=None, limit=20, offset=0)
         self.assertIn("Inception", result)
         self.assertIn("27205", result)
+        self.assertIn("of ~1 matches", result)
 
     @patch('mcp_server.db')
     def test_get_movie_reviews(self, mock_db):
         mock_db.get_movie_reviews.return_value = [
-            {"rating": "Fresh", "content": "Masterpiece!", "reviewers": {"name": "Critic A"}}
+            {"id": "r1", "rating": "Fresh", "content": "Masterpiece!", "reviewer_name": "Critic A"}
         ]
         
         result = get_movie_reviews(27205)
         self.assertIn("Critic A", result)
         self.assertIn("Fresh", result)
         self.assertIn("Masterpiece", result)
+        self.assertNotIn("after_id=", result)
+
+    @patch('mcp_server.db')
+    def test_get_movie_reviews_next_page(self, mock_db):
+        mock_db.get_movie_reviews.return_value = [
+            {"id": "r1", "rating": "Fresh", "content": "Great", "reviewer_name": "Critic A"},
+            {"id": "r2", "rating": "Rotten", "content": "Dull", "reviewer_name": "Critic B"}
+        ]
+        
+        result = get_movie_reviews(27205, limit=2)
+        mock_db.get_movie_reviews.assert_called_once_with(27205, after_id=None, limit=2)
+        self.assertIn("after_id=r2", result)
 
     @patch('mcp_server.db')
     def test_get_movie_insights(self, mock_db):
@@ -0,0 +1,66 @@
+import json
+import unittest
+import urllib.request
+from contextlib import redirect_stdout
+from io import StringIO
+from metrics import Metrics, percentile, start_metrics_server
+import metrics as metrics_module
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertIsNone(percentile([], 50))
+
+    def test_cycle_summary_per_phase_and_source(self):
+        for seconds in (0.1, 0.2, 0.3, 0.4):
+            self.metrics.observe('page_fetch', seconds, 'IMDb')
+        self.metrics.observe('page_fetch', 2.0, 'RottenTomatoes')
+        self.metrics.observe('db_write', 0.05)
+        self.metrics.inc('requests', 'IMDb', 4)
+
+        summary = self.metrics.cycle_summary()
+        self.assertEqual(summary['phases']['page_fetch']['count'], 5)
+        self.assertEqual(summary['phases']['page_fetch']['total_s'], 3.0)
+        self.assertEqual(summary['sources']['IMDb']['page_fetch']['p50_s'], 0.2)
+        self.assertEqual(summary['sources']['IMDb']['page_fetch']['p95_s'], 0.4)
+        self.assertNotIn('', summary['sources'])
+        self.assertEqual(summary['counters'], {'requests.IMDb': 4})
+        # The cycle window resets; cumulative histograms do not
+        self.assertEqual(self.metrics.cycle_summary()['phases'], {})
+        self.assertIn('agent_phase_seconds_count{phase="page_fetch",source="IMDb"} 4', self.metrics.render_prometheus())
+
+    def test_prometheus_buckets_are_cumulative(self):
+        self.metrics.observe('parse', 0.003)
+        self.metrics.observe('parse', 0.2)
+        text = self.metrics.render_prometheus()
+        self.assertIn('agent_phase_seconds_bucket{phase="parse",source="",le="0.005"} 1', text)
+        self.assertIn('agent_phase_seconds_bucket{phase="parse",source="",le="0.25"} 2', text)
+        self.assertIn('agent_phase_seconds_bucket{phase="parse",source="",le="+Inf"} 2', text)
+
+    def test_emit_prints_one_json_line(self):
+        self.metrics.observe('llm_call', 1.5, 'openai')
+        out = StringIO()
+        with redirect_stdout(out):
+            self.metrics.emit_cycle_summary('summarizer', movies=3)
+        line = json.loads(out.getvalue())
+        self.assertEqual(line['agent'], 'summarizer')
+        self.assertEqual(line['movies'], 3)
+        self.assertEqual(line['sources']['openai']['llm_call']['count'], 1)
+
+    def test_endpoint_serves_registry(self):
+        metrics_module.metrics.observe('sleep', 1.0)
+        with redirect_stdout(StringIO()):
+            server = start_metrics_server(port=0)
+        try:
+            body = urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics").read().decode()
+        finally:
+            server.shutdown()
+        self.assertIn('phase="sleep"', body)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from monitor_schedule import MonitorSchedule, VolatilityPolicy, next_deadline, tier_for
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+class TestTiers(unittest.TestCase):
+    def test_tiers_by_age(self):
+        today = NOW.date()
+        self.assertEqual(tier_for(today - timedelta(days=2), today), (30, 'hourly'))
+        self.assertEqual(tier_for(today - timedelta(days=10), today), (240, 'daily'))
+        self.assertEqual(tier_for(today - timedelta(days=60), today), (1440, 'daily'))
+        self.assertIsNone(tier_for(today - timedelta(days=120), today))
+        self.assertIsNone(tier_for(today + timedelta(days=1), today))
+
+    def test_next_deadline_keeps_cadence(self):
+        due = NOW - timedelta(minutes=5)
+        self.assertEqual(next_deadline(due, 30, NOW), due + timedelta(minutes=30))
+
+    def test_next_deadline_does_not_queue_catch_up(self):
+        due = NOW - timedelta(hours=3)
+        self.assertEqual(next_deadline(due, 30, NOW), NOW + timedelta(minutes=30))
+
+class TestVolatilityPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = VolatilityPolicy(MagicMock(), min_minutes=30, max_minutes=1440)
+        self.movie = {'id': 'a'}
+
+    def test_short_history_keeps_tier_interval(self):
+        self.policy.changes[('a', 'IMDb')] = (3, 0.5)
+        self.assertEqual(self.policy.interval_for(self.movie, 'IMDb', 30), 30)
+
+    def test_static_rating_backs_off_to_ceiling(self):
+        self.policy.changes[('a', 'IMDb')] = (0, 7.0)
+        self.assertEqual(self.policy.interval_for(self.movie, 'IMDb', 30), 1440)
+
+    def test_changes_and_velocity_shorten_interval(self):
+        # 2 changes/day + 20 reviews/day (2 expected changes) -> 4/day, sampled twice each
+        self.policy.changes[('a', 'IMDb')] = (14, 7.0)
+        self.policy.velocity['a'] = 20.0
+        self.assertEqual(self.policy.interval_for(self.movie, 'IMDb', 1440), 180)
+
+    def test_interval_respects_floor(self):
+        self.policy.changes[('a', 'IMDb')] = (700, 7.0)
+        self.assertEqual(self.policy.interval_for(self.movie, 'IMDb', 1440), 30)
+
+class TestMonitorSchedule(unittest.TestCase):
+    def setUp(self):
+        self.schedule = MonitorSchedule(MagicMock(), ['IMDb'])
+        self.hot = {'id': 'a', 'title': 'Hot', 'release_date': date(2026, 3, 8)}
+        self.old = {'id': 'b', 'title': 'Old', 'release_date': date(2025, 1, 1)}
+        self.schedule.movies = {'a': self.hot, 'b': self.old}
+
+    def test_complete_requeues_and_pop_due_respects_deadline(self):
+        deadline = self.schedule.complete(self.hot, 'IMDb', NOW - timedelta(minutes=1), now=NOW)
+        self.assertEqual(deadline, NOW + timedelta(minutes=29))
+        self.assertEqual(self.schedule.next_due_at(), deadline)
+        self.assertEqual(self.schedule.pop_due('IMDb', NOW, 5), [])
+        self.assertEqual(self.schedule.pop_due('IMDb', deadline, 5), [(deadline, self.hot)])
+
+    def test_aged_out_movie_is_dropped(self):
+        self.assertIsNone(self.schedule.complete(self.old, 'IMDb', NOW, now=NOW))
+        self.assertIsNone(self.schedule.next_due_at())
+
+    def test_complete_clears_lease_left_by_dead_worker(self):
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.rowcount = 1
+        schedule = MonitorSchedule(conn, ['IMDb'])
+        deadline = schedule.complete(self.hot, 'IMDb', NOW - timedelta(minutes=1), now=NOW)
+        self.assertEqual(deadline, NOW + timedelta(minutes=29))
+        sql, params = cur.execute.call_args.args
+        self.assertIn('lease_until < NOW()', sql)
+        self.assertIn('leased_by = NULL', sql)
+        self.assertEqual(params[-2:], (None, None))
+        self.assertEqual(schedule.next_due_at(), deadline)
+
+class TestSharedQueue(unittest.TestCase):
+    def setUp(self):
+        self.conn = MagicMock()
+        self.cur = self.conn.cursor.return_value.__enter__.return_value
+        self.schedule = MonitorSchedule(self.conn, ['IMDb'], worker_id='host:1', lease_seconds=60)
+        self.hot = {'id': 'a', 'title': 'Hot', 'release_date': date(2026, 3, 8)}
+
+    def test_pop_due_claims_with_skip_locked(self):
+        self.cur.fetchall.return_value = [dict(self.hot, claimed_due_at=NOW)]
+        self.assertEqual(self.schedule.pop_due('IMDb', NOW, 2), [(NOW, self.hot)])
+        sql, params = self.cur.execute.call_args.args
+        self.assertIn('FOR UPDATE SKIP LOCKED', sql)
+        self.assertEqual(params, ('IMDb', NOW, 2, 60, 'host:1'))
+
+    def test_complete_after_lost_lease_returns_none(self):
+        self.cur.rowcount = 0
+        self.assertIsNone(self.schedule.complete(self.hot, 'IMDb', NOW, now=NOW))
+        self.assertEqual(self.cur.execute.call_args.args[1][-2:], ('host:1', 'host:1'))
+        self.cur.rowcount = 1
+        self.assertEqual(self.schedule.complete(self.hot, 'IMDb', NOW, now=NOW), NOW + timedelta(minutes=30))
+
+    def test_sync_filters_on_utc_dates(self):
+        self.cur.fetchall.return_value = []
+        self.schedule.sync()
+        today = datetime.now(timezone.utc).date()
+        select_params = self.cur.execute.call_args_list[0].args[1]
+        self.assertEqual(select_params, (today, today - timedelta(days=90)))
+
+    def test_sync_leaves_leased_pairs_to_their_worker(self):
+        self.cur.fetchall.return_value = []
+        self.schedule.sync()
+        delete_sql = next(c.args[0] for c in self.cur.execute.call_args_list if 'DELETE' in c.args[0])
+        self.assertIn('lease_until < NOW()', delete_sql)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ class TestTMDBClient(unittest.TestCase):
     def setUp(self):
         self.client = TMDBClient()
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_movies_by_date(self, mock_get):
         # Mock API response
         mock_response = MagicMock()
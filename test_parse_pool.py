@@ -0,0 +1,30 @@
+import unittest
+from scrapers import fast_extract
+from scrapers.page_parsers import parse_rt_page
+from scrapers.parse_pool import ParsePool
+from test_fast_extract import RT_PAGE
+
+class TestParsePool(unittest.TestCase):
+    def setUp(self):
+        fast_extract.stats.reset()
+
+    def test_serial_mode_parses_in_process(self):
+        pool = ParsePool(size=0)
+        self.assertTrue(pool.serial)
+        self.assertEqual(pool.parse(parse_rt_page, RT_PAGE)['tomatometer'], 88.0)
+        self.assertEqual(fast_extract.stats.snapshot(), {'rt': (1, 0)})
+
+    def test_worker_results_and_fast_path_counts_come_back(self):
+        pool = ParsePool(size=1)
+        try:
+            ratings = pool.parse(parse_rt_page, RT_PAGE)
+            missing = pool.parse(parse_rt_page, '<html><body>Not found</body></html>')
+        finally:
+            pool.close()
+        self.assertEqual(ratings['audience'], 96.0)
+        self.assertEqual(missing, {})
+        # Counted in the worker, merged into this process
+        self.assertEqual(fast_extract.stats.snapshot(), {'rt': (1, 1)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from profiling import add_profile_arguments, profiled
+
+def busy():
+    time.sleep(0.02)  # Long enough for the sampler to see it
+    return sum(i * i for i in range(20000))
+
+class TestProfiling(unittest.TestCase):
+    def parse(self, *argv):
+        parser = argparse.ArgumentParser()
+        add_profile_arguments(parser)
+        return parser.parse_args(list(argv))
+
+    def test_no_flag_is_a_no_op(self):
+        out = StringIO()
+        with redirect_stdout(out), profiled('agent', self.parse()):
+            busy()
+        self.assertEqual(out.getvalue(), '')
+
+    def test_cprofile_writes_stats_folded_stacks_and_memory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, 'cycle')
+            args = self.parse('--profile', '--profile-memory', '--profile-out', prefix, '--profile-interval', '0.002')
+            with redirect_stdout(StringIO()), profiled('agent', args):
+                busy()
+            for suffix in ('.prof', '.txt', '.folded', '.memory.txt'):
+                self.assertTrue(os.path.exists(prefix + suffix), suffix)
+            with open(prefix + '.folded') as f:
+                line = f.readline()
+            self.assertTrue(line.startswith('MainThread;'))
+            self.assertTrue(line.rstrip().rsplit(' ', 1)[1].isdigit())
+            with open(prefix + '.txt') as f:
+                self.assertIn('busy', f.read())
+
+    def test_sample_mode_skips_cprofile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, 'cycle')
+            with redirect_stdout(StringIO()), profiled('agent', self.parse('--profile', 'sample', '--profile-out', prefix)):
+                busy()
+            self.assertFalse(os.path.exists(prefix + '.prof'))
+            self.assertTrue(os.path.exists(prefix + '.folded'))
+
+if __name__ == '__main__':
+    unittest.main()
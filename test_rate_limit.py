@@ -0,0 +1,68 @@
+import unittest
+from scrapers.rate_limit import TokenBucket, AdaptiveConcurrency
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_first_request_is_immediate(self):
+        bucket = TokenBucket(10, clock=self.clock, sleep=self.clock.sleep)
+        self.assertEqual(bucket.acquire(), 0.0)
+
+    def test_requests_are_spaced_by_rate(self):
+        bucket = TokenBucket(10, clock=self.clock, sleep=self.clock.sleep)
+        for _ in range(4):
+            bucket.acquire()
+        # 10/min -> one token every 6 s after the initial burst of 1
+        self.assertAlmostEqual(self.clock.now, 18.0)
+
+    def test_burst_allows_back_to_back_requests(self):
+        bucket = TokenBucket(6, burst=3, clock=self.clock, sleep=self.clock.sleep)
+        for _ in range(3):
+            self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 10.0)
+
+    def test_zero_rate_disables_limiting(self):
+        bucket = TokenBucket(0, clock=self.clock, sleep=self.clock.sleep)
+        for _ in range(5):
+            bucket.acquire()
+        self.assertEqual(self.clock.now, 0.0)
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = AdaptiveConcurrency(8, latency_target=2.0, cooldown=10, clock=self.clock)
+
+    def test_slow_or_throttled_responses_halve_once_per_cooldown(self):
+        self.assertEqual(self.limiter.record(5.0), 4)
+        self.assertEqual(self.limiter.record(0.1, throttled=True), 4)
+        self.clock.sleep(10)
+        self.assertEqual(self.limiter.record(0.1, throttled=True), 2)
+
+    def test_healthy_responses_probe_back_up(self):
+        self.limiter.record(5.0)
+        for _ in range(4):
+            limit = self.limiter.record(0.5)
+        self.assertEqual(limit, 5)
+        for _ in range(100):
+            limit = self.limiter.record(0.5)
+        self.assertEqual(limit, 8)
+
+    def test_never_below_minimum(self):
+        for _ in range(10):
+            self.clock.sleep(10)
+            self.limiter.record(9.0)
+        self.assertEqual(int(self.limiter.limit), 1)
+
+if __name__ == '__main__':
+    unittest.main()
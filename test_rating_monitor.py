@@ -0,0 +1,95 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+import requests
+from scrapers import fast_extract
+from test_fast_extract import RT_PAGE
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agents'))
+from rating_monitor import NOT_MODIFIED, RatingMonitor
+
+MOVIE = {'id': 'm1', 'title': 'Wicked'}
+URL = 'https://www.rottentomatoes.com/m/wicked'
+
+def page_response(text):
+    response = MagicMock(status_code=200, text=text)
+    response.headers = {'ETag': '"v2"'}
+    return response
+
+class TestPageStateSkip(unittest.TestCase):
+    def setUp(self):
+        with patch('rating_monitor.get_pool'), patch('rating_monitor.get_parse_pool'):
+            self.monitor = RatingMonitor()
+        self.monitor.fetch = MagicMock(return_value=page_response(RT_PAGE))
+        self.monitor.parse_pool.parse.return_value = {'tomatometer': 88.0, 'review_counts': {'critic_reviews': 312}}
+        self.monitor.writer.flush = MagicMock()
+        self.monitor.latest_loaded.add('m1')
+        self.cached = {
+            'url': URL, 'expires_at': datetime.now(timezone.utc) + timedelta(days=1),
+            'etag': '"v1"', 'last_modified': None, 'content_digest': 'old'
+        }
+        self.monitor.url_cache._entries[('m1', 'RottenTomatoes')] = self.cached
+
+    def test_matching_digest_skips_parse(self):
+        self.cached['content_digest'] = fast_extract.score_digest('rt', RT_PAGE)
+        self.assertIs(self.monitor.scrape_page(MOVIE, 'RottenTomatoes', URL, cached=self.cached), NOT_MODIFIED)
+        self.monitor.parse_pool.parse.assert_not_called()
+        self.assertEqual(self.monitor.page_stats['unchanged'], 1)
+
+    def test_digest_saved_only_after_ratings_are_flushed(self):
+        self.monitor.store_daily_snapshot = MagicMock(return_value=None)
+        self.monitor.url_cache.put_page_state = MagicMock(
+            side_effect=lambda *args: self.assertTrue(self.monitor.writer.flush.called))
+        self.assertEqual(self.monitor.monitor_source(MOVIE, 'RottenTomatoes'), 1)
+        self.monitor.url_cache.put_page_state.assert_called_once_with(
+            'm1', 'RottenTomatoes', {'etag': '"v2"', 'last_modified': None}, fast_extract.score_digest('rt', RT_PAGE))
+
+    def test_failed_store_clears_digest(self):
+        self.monitor.store_daily_snapshot = MagicMock(side_effect=RuntimeError('db down'))
+        self.monitor.monitor_source(MOVIE, 'RottenTomatoes')
+        self.assertEqual(self.cached['content_digest'], None)
+        self.assertEqual(self.cached['etag'], None)
+        self.assertEqual(self.monitor.pending_page_state, {})
+
+class TestUrlCacheFallback(unittest.TestCase):
+    def setUp(self):
+        with patch('rating_monitor.get_pool'), patch('rating_monitor.get_parse_pool'):
+            self.monitor = RatingMonitor()
+        self.monitor.url_cache = MagicMock()
+        self.monitor.sources['RottenTomatoes'] = self.find_url = MagicMock(return_value=URL + '_2024')
+
+    def test_negative_entry_skips_source(self):
+        self.monitor.url_cache.get.return_value = {'url': None}
+        self.assertIsNone(self.monitor.scrape_source(MOVIE, 'RottenTomatoes'))
+        self.find_url.assert_not_called()
+
+    def test_cached_url_gone_searches_again(self):
+        gone = requests.HTTPError(response=MagicMock(status_code=404))
+        self.monitor.url_cache.get.return_value = {'url': URL}
+        self.monitor.scrape_page = MagicMock(side_effect=[gone, {'tomatometer': 88.0}])
+        self.assertEqual(self.monitor.scrape_source(MOVIE, 'RottenTomatoes'), {'tomatometer': 88.0})
+        self.monitor.url_cache.put.assert_called_once_with('m1', 'RottenTomatoes', URL + '_2024')
+        self.assertEqual(self.monitor.scrape_page.call_args.args, (MOVIE, 'RottenTomatoes', URL + '_2024'))
+
+class TestStoreDailySnapshot(unittest.TestCase):
+    def setUp(self):
+        with patch('rating_monitor.get_pool'), patch('rating_monitor.get_parse_pool'):
+            self.monitor = RatingMonitor()
+        self.cur = self.monitor.conn.cursor.return_value.__enter__.return_value
+
+    def test_one_statement_with_server_side_deltas(self):
+        self.monitor.store_daily_snapshot('m1', 'RottenTomatoes', {'tomatometer': 88.0},
+                                          {'critic_reviews': 312, 'audience_reviews': 10}, interval='hourly')
+        self.assertEqual(self.cur.execute.call_count, 1)
+        sql, params = self.cur.execute.call_args.args
+        self.assertEqual(params, {'movie_id': 'm1', 'source': 'RottenTomatoes', 'total_reviews': 322,
+                                  'critic_score': 88.0, 'audience_score': None})
+        self.assertIn("DATE_TRUNC('hour', NOW())", sql)
+        self.assertIn("INTERVAL '1 hour'", sql)
+        for column in ('new_reviews_today = EXCLUDED', 'score_change = EXCLUDED', 'review_velocity = EXCLUDED'):
+            self.assertIn(column, sql)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from scrapers.rotten_tomatoes import RottenTomatoesScraper
+from scrapers.parse_pool import ParsePool
 
 class TestRottenTomatoesScraper(unittest.TestCase):
     def setUp(self):
@@ -26,23 +27,25 @@ class TestRottenTomatoesScraper(unittest.TestCase):
         self.assertEqual(reviewers[0]['name'], 'John Doe')
         self.assertEqual(reviewers[0]['external_url'], 'https://www.rottentomatoes.com/critics/john-doe')
 
-    @patch('scrapers.base.BaseScraper._get_soup')
-    def test_get_latest_reviews(self, mock_get_soup):
-        mock_row = MagicMock()
-        mock_title = MagicMock(text='Inception')
-        mock_title.attrs = {'href': '/m/inception'}
-        mock_row.select_one.side_effect = lambda qa: {
-            'a[data-qa="movie-link"]': mock_title,
-            'span.icon--fresh, span.icon--rotten': MagicMock(),
-            'td.review-excerpt': MagicMock(text='Great movie!'),
-            'td.review-date': MagicMock(text='Jan 1, 2024')
-        }.get(qa)
-        
-        mock_get_soup.return_value.select.return_value = [mock_row]
+    @patch('scrapers.rotten_tomatoes.get_parse_pool', return_value=ParsePool(size=0))
+    @patch('scrapers.base.BaseScraper._get_html')
+    def test_get_latest_reviews(self, mock_get_html, mock_parse_pool):
+        mock_get_html.return_value = """
+        <table>
+            <tr data-qa="critic-review-row">
+                <td><a data-qa="movie-link" href="/m/inception">Inception</a></td>
+                <td><span class="icon--fresh"></span></td>
+                <td class="review-excerpt">Great movie!</td>
+                <td class="review-date">Jan 1, 2024</td>
+            </tr>
+        </table>
+        """
         
         reviews = self.scraper.get_latest_reviews('https://www.rottentomatoes.com/critics/john-doe')
         self.assertEqual(len(reviews), 1)
         self.assertEqual(reviews[0]['movie_title'], 'Inception')
+        self.assertEqual(reviews[0]['rating'], 'Fresh')
+        self.assertEqual(reviews[0]['source_url'], 'https://www.rottentomatoes.com/m/inception')
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from snapshot_writer import SnapshotWriter
+
+class TestSnapshotWriter(unittest.TestCase):
+    def setUp(self):
+        self.writer = SnapshotWriter(MagicMock(), max_rows=200, max_age_seconds=30)
+        self.writer._write = MagicMock(side_effect=lambda snapshots, logs: (len(snapshots), len(logs)))
+
+    @patch('snapshot_writer.time.monotonic')
+    def test_stale_buffer_is_flushed_without_further_writes(self, monotonic):
+        monotonic.return_value = 100.0
+        self.writer.add_snapshot('a', 'IMDb', 'user_score', 7.5)
+        self.assertEqual(self.writer.flush_if_stale(), (0, 0))
+        self.writer._write.assert_not_called()
+
+        monotonic.return_value = 130.0
+        self.assertEqual(self.writer.flush_if_stale(), (1, 0))
+        self.assertEqual(self.writer._write.call_args.args[0][0]['movie_id'], 'a')
+        self.assertEqual(self.writer.flush_if_stale(), (0, 0))
+
+    def test_full_buffer_flushes_on_add(self):
+        self.writer.max_rows = 2
+        self.writer.add_log('IMDb', 'a', 'success')
+        self.writer._write.assert_not_called()
+        self.writer.add_log('IMDb', 'b', 'success')
+        self.assertEqual(len(self.writer._write.call_args.args[1]), 2)
+
+if __name__ == '__main__':
+    unittest.main()
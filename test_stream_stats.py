@@ -0,0 +1,106 @@
+import statistics
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from stream_stats import ReviewStreamStats, RunningStats, EWMA_ALPHA
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+def period(i):
+    return START + timedelta(days=i)
+
+class TestRunningStats(unittest.TestCase):
+    def test_welford_matches_statistics(self):
+        values = [3, 7, 2, 9, 4, 4, 11, 0, 6]
+        stats = RunningStats()
+        for i, value in enumerate(values):
+            stats.observe(period(i), value)
+        self.assertEqual(stats.n, len(values))
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.variance, statistics.variance(values))
+
+    def test_ewma(self):
+        stats = RunningStats()
+        stats.observe(period(0), 10)
+        stats.observe(period(1), 20)
+        self.assertAlmostEqual(stats.ewma_mean, 10 + EWMA_ALPHA * 10)
+        self.assertAlmostEqual(stats.ewma_var, (1 - EWMA_ALPHA) * EWMA_ALPHA * 100)
+
+    def test_same_period_replaces_value(self):
+        revised, direct = RunningStats(), RunningStats()
+        for i, value in enumerate([5, 6, 4, 5]):
+            revised.observe(period(i), value)
+            direct.observe(period(i), value)
+        revised.observe(period(4), 3)
+        revised.observe(period(4), 8)  # Same period scraped again later
+        direct.observe(period(4), 8)
+        self.assertEqual(revised.n, direct.n)
+        self.assertAlmostEqual(revised.mean, direct.mean)
+        self.assertAlmostEqual(revised.m2, direct.m2)
+        self.assertAlmostEqual(revised.ewma_mean, direct.ewma_mean)
+        self.assertAlmostEqual(revised.ewma_var, direct.ewma_var)
+
+    def test_late_period_ignored(self):
+        stats = RunningStats()
+        stats.observe(period(1), 5)
+        self.assertIsNone(stats.observe(period(0), 500))
+        self.assertEqual((stats.n, stats.last_value), (1, 5))
+
+    def test_spike_against_prior_history(self):
+        stats = RunningStats()
+        for i, value in enumerate([10, 12, 9, 11, 10, 12]):
+            self.assertIsNone(stats.observe(period(i), value))
+        magnitude = stats.observe(period(6), 60)
+        self.assertGreater(magnitude, 5)
+
+    def test_no_spike_without_history(self):
+        stats = RunningStats()
+        stats.observe(period(0), 1)
+        stats.observe(period(1), 2)
+        self.assertIsNone(stats.observe(period(2), 500))
+
+class TestReviewStreamStats(unittest.TestCase):
+    def setUp(self):
+        self.conn = MagicMock()
+        self.cur = self.conn.cursor.return_value.__enter__.return_value
+        self.cur.fetchone.return_value = None
+        self.cur.rowcount = 1
+        self.store = ReviewStreamStats(self.conn)
+
+    def snapshot(self, i, value):
+        return {'movie_id': 'a', 'source': 'IMDb', 'snapshot_time': period(i),
+                'snapshot_date': date(2026, 3, 1) + timedelta(days=i), 'new_reviews_today': value}
+
+    def test_first_row_inserts_then_cached_updates(self):
+        self.store.observe(self.snapshot(0, 5))
+        self.assertIn("INSERT INTO review_stream_stats", self.cur.execute.call_args_list[-1][0][0])
+        self.store.observe(self.snapshot(1, 6))
+        sql, params = self.cur.execute.call_args_list[-1][0]
+        self.assertIn("UPDATE review_stream_stats", sql)
+        self.assertEqual(params[-1], 1)  # Expected version
+        # Cached after the insert: no second SELECT
+        selects = [c for c in self.cur.execute.call_args_list if "SELECT" in c[0][0]]
+        self.assertEqual(len(selects), 1)
+
+    def test_conflict_reloads_and_retries(self):
+        self.store.observe(self.snapshot(0, 5))
+        row = RunningStats(version=4, **RunningStats(n=1, mean=7.0, last_period=period(0), last_value=7,
+                                                     ewma_mean=7.0, ewma_var=0.0).as_row())
+        self.cur.fetchone.return_value = {**row.as_row(), 'version': 4}
+        rowcounts = iter([0, 1])
+        type(self.cur).rowcount = property(lambda _: next(rowcounts))
+        self.store.observe(self.snapshot(1, 9))
+        sql, params = self.cur.execute.call_args_list[-1][0]
+        self.assertEqual(params[-1], 4)
+        self.assertEqual(params[0], 2)  # n folded onto the reloaded row
+
+    def test_spike_flags_movie_trends(self):
+        for i, value in enumerate([10, 12, 9, 11, 10, 12]):
+            self.assertIsNone(self.store.observe(self.snapshot(i, value)))
+        self.assertGreater(self.store.observe(self.snapshot(6, 60)), 5)
+        sql, params = self.cur.execute.call_args_list[-1][0]
+        self.assertIn("INSERT INTO movie_trends", sql)
+        self.assertEqual(params[1], date(2026, 3, 7))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import random
+import sys
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+from trend_batch import SnapshotColumns, classify_columns, ordered_sum
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agents'))
+with patch('db_pool.get_pool'):
+    from trend_analyzer import TrendAnalyzer
+
+def random_movie(rng, movie_id):
+    """Snapshot rows (as dicts, oldest first) with the shapes the monitor writes"""
+    n = rng.choice([1, 2, 3, 4, 5, 6, 7, 8, 14, 21, 48, 168])
+    kind = rng.choice(['flat', 'noisy', 'sleeper', 'spike', 'sparse'])
+    start = date(2026, 3, 1)
+    rows = []
+    for i in range(n):
+        velocity = rng.uniform(0, 50) * (1 + i * 3 if kind == 'sleeper' and i >= n // 2 else 1)
+        new_reviews = rng.randint(0, 30)
+        if kind == 'spike' and i == n - 1:
+            new_reviews = rng.randint(200, 5000)
+        rows.append({
+            'movie_id': movie_id,
+            'snapshot_date': start + timedelta(days=i),
+            'review_velocity': None if kind == 'sparse' and rng.random() < 0.3 else (0.0 if kind == 'flat' else velocity),
+            'critic_score': None if rng.random() < 0.2 else (60 + i * 4 if kind == 'sleeper' else rng.uniform(0, 100)),
+            'new_reviews_today': None if kind == 'sparse' and rng.random() < 0.3 else new_reviews,
+            'score_change': None if rng.random() < 0.2 else rng.uniform(-3, 3),
+        })
+    return rows
+
+class TestTrendBatchParity(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = TrendAnalyzer()
+
+    def assert_parity(self, movies):
+        rows = [(r['movie_id'], r['snapshot_date'], r['review_velocity'], r['critic_score'],
+                 r['new_reviews_today'], r['score_change']) for movie in movies for r in movie]
+        batch = classify_columns(SnapshotColumns.from_rows(rows), self.analyzer.detect_anomalies)
+        for movie in movies:
+            expected = self.analyzer.classify_snapshots(movie)
+            self.assertEqual(batch[movie[0]['movie_id']], expected, movie[0]['movie_id'])
+
+    def test_matches_per_movie_path_exactly(self):
+        rng = random.Random(7)
+        movies = [random_movie(rng, f"m{i:04d}") for i in range(2000)]
+        self.assert_parity(movies)
+        statuses = {self.analyzer.classify_snapshots(m)['trend_status'] for m in movies}
+        self.assertTrue({'sleeper_hit', 'trending_up', 'trending_down', 'stable'} <= statuses)
+        self.assertTrue(any(self.analyzer.classify_snapshots(m)['spike_detected'] for m in movies))
+
+    def test_ordered_sum_matches_python_sum(self):
+        values = np.array([0.1, 0.2, 0.3, 1e16, 1.0, -1e16, 0.7])
+        self.assertEqual(ordered_sum(values, np.array([0, 3]), np.array([3, 4])).tolist(),
+                         [sum(values[:3].tolist()), sum(values[3:].tolist())])
+
+class TestStoreTrends(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = TrendAnalyzer()
+        self.trend = self.analyzer.classify_snapshots([])
+
+    def test_one_statement_per_page_without_returning(self):
+        trends = {f"m{i}": self.trend for i in range(2500)}
+        with patch('trend_analyzer.execute_values', return_value=[(1,)] * 2500) as bulk:
+            self.assertEqual(self.analyzer.store_trends(trends), 2500)
+        bulk.assert_called_once()
+        query, values = bulk.call_args.args[1:3]
+        self.assertIn('ON CONFLICT (movie_id) DO UPDATE', query)
+        self.assertIn('RETURNING 1', query)
+        self.assertEqual(bulk.call_args.kwargs['page_size'], 1000)
+        self.assertEqual(values[0], ('m0', 'stable', 0.0, 0.0, 0.0, 0.0, False, False, None, None, None, None))
+
+    def test_failed_batch_retries_rows_individually(self):
+        import psycopg2
+        calls = [psycopg2.Error('bad row'), [{'movie_id': 'a'}], psycopg2.Error('gone')]
+        with patch('trend_analyzer.execute_values', side_effect=calls), patch('builtins.print'):
+            stored = self.analyzer.store_trends({'a': self.trend, 'b': self.trend}, returning=True)
+        self.assertEqual(stored, [{'movie_id': 'a'}])
+
+class TestIncremental(unittest.TestCase):
+    def test_only_changed_movies_are_recomputed_with_their_marks(self):
+        analyzer = TrendAnalyzer()
+        movies = [{'id': 'a', 'title': 'A'}, {'id': 'b', 'title': 'B'}]
+        marks = {
+            'a': {'snapshots_through': date(2026, 3, 2), 'snapshot_count': 4, 'changed': True},
+            'b': {'snapshots_through': date(2026, 3, 1), 'snapshot_count': 7, 'changed': False},
+        }
+        with patch.object(analyzer, 'get_active_movies', return_value=movies), \
+                patch.object(analyzer, 'snapshot_marks', return_value=marks), \
+                patch.object(analyzer, 'classify_trend', return_value=analyzer.classify_snapshots([])) as classify, \
+                patch.object(analyzer, 'store_trends', return_value=1) as store, \
+                patch('builtins.print'):
+            analyzer.analyze_all(incremental=True)
+        classify.assert_called_once_with('a')
+        stored = store.call_args.args[0]
+        self.assertEqual(list(stored), ['a'])
+        self.assertEqual((stored['a']['snapshots_through'], stored['a']['snapshot_count']), (date(2026, 3, 2), 4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import math
+import os
+import random
+import sys
+import unittest
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from unittest.mock import patch
+import psycopg2
+from db_pool import connect_kwargs_from_env
+from test_trend_batch import random_movie
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agents'))
+with patch('db_pool.get_pool'):
+    from trend_analyzer import TrendAnalyzer
+
+FLOAT_FIELDS = ('trend_confidence', 'avg_daily_reviews', 'review_growth_rate', 'score_momentum', 'spike_magnitude')
+
+# Session-local tables that shadow the real ones (pg_temp is searched first)
+TEMP_TABLES = """
+    CREATE TEMP TABLE daily_review_snapshots (
+        movie_id UUID, source TEXT, snapshot_date DATE, snapshot_time TIMESTAMPTZ,
+        review_velocity FLOAT, critic_score FLOAT, new_reviews_today INTEGER, score_change FLOAT,
+        updated_at TIMESTAMPTZ DEFAULT NOW()
+    );
+    CREATE TEMP TABLE movie_trends (
+        movie_id UUID UNIQUE, trend_status TEXT, trend_confidence FLOAT,
+        avg_daily_reviews FLOAT, review_growth_rate FLOAT, score_momentum FLOAT,
+        has_suspicious_activity BOOLEAN, spike_detected BOOLEAN, spike_date DATE, spike_magnitude FLOAT,
+        snapshots_through TIMESTAMPTZ, snapshot_count INTEGER, spike_flagged_at TIMESTAMPTZ,
+        last_calculated_at TIMESTAMPTZ
+    );
+"""
+
+def in_window(rows):
+    """Spread a movie's rows over the last 7 days (analysis window), keeping their order"""
+    today = date.today()
+    for i, row in enumerate(rows):
+        day = today - timedelta(days=6 - i * 7 // len(rows))
+        row['snapshot_date'] = day
+        row['snapshot_time'] = datetime.combine(day, time(), timezone.utc) + timedelta(minutes=i)
+        row['source'] = 'RottenTomatoes'
+    return rows
+
+class TestTrendSqlParity(unittest.TestCase):
+    """Runs against the database in DB_* (skipped when it is unreachable)"""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            cls.conn = psycopg2.connect(connect_timeout=3, **connect_kwargs_from_env())
+        except psycopg2.OperationalError as e:
+            raise unittest.SkipTest(f"no database: {e}")
+        cls.conn.autocommit = True
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+
+    def setUp(self):
+        with self.conn.cursor() as cur:
+            cur.execute("DROP TABLE IF EXISTS pg_temp.daily_review_snapshots, pg_temp.movie_trends;" + TEMP_TABLES)
+        self.analyzer = TrendAnalyzer()
+        self.analyzer.conn = self.conn
+
+        rng = random.Random(11)
+        self.movies = [in_window(random_movie(rng, str(uuid.UUID(int=i + 1)))) for i in range(600)]
+        with self.conn.cursor() as cur:
+            cur.executemany("""
+                INSERT INTO daily_review_snapshots (movie_id, source, snapshot_date, snapshot_time,
+                    review_velocity, critic_score, new_reviews_today, score_change)
+                VALUES (%(movie_id)s, %(source)s, %(snapshot_date)s, %(snapshot_time)s,
+                    %(review_velocity)s, %(critic_score)s, %(new_reviews_today)s, %(score_change)s);
+            """, [row for movie in self.movies for row in movie])
+        self.no_snapshots = str(uuid.UUID(int=10 ** 6))
+        self.movie_ids = [movie[0]['movie_id'] for movie in self.movies] + [self.no_snapshots]
+
+    def assert_trend_equal(self, actual, expected, movie_id):
+        for field, value in expected.items():
+            if field in FLOAT_FIELDS and value is not None:
+                self.assertTrue(math.isclose(actual[field], value, rel_tol=1e-9, abs_tol=1e-9),
+                                f"{movie_id} {field}: {actual[field]} != {value}")
+            else:
+                self.assertEqual(actual[field], value, f"{movie_id} {field}")
+
+    def test_matches_python_classification(self):
+        trends = self.analyzer.classify_trends_sql(self.movie_ids)
+        self.assertEqual(len(trends), len(self.movie_ids))
+        for movie in self.movies:
+            movie_id = movie[0]['movie_id']
+            self.assert_trend_equal(trends[movie_id], self.analyzer.classify_snapshots(movie), movie_id)
+            self.assertEqual(trends[movie_id]['snapshot_count'], len(movie))
+        self.assert_trend_equal(trends[self.no_snapshots], self.analyzer.classify_snapshots([]), self.no_snapshots)
+        self.assertEqual(trends[self.no_snapshots]['snapshot_count'], 0)
+
+        statuses = {trend['trend_status'] for trend in trends.values()}
+        self.assertTrue({'sleeper_hit', 'trending_up', 'trending_down', 'stable'} <= statuses)
+        self.assertTrue(any(trend['spike_detected'] for trend in trends.values()))
+
+    def test_store_in_one_statement(self):
+        stored = self.analyzer.store_trends_sql(self.movie_ids)
+        self.assertEqual(len(stored), len(self.movie_ids))
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT movie_id, trend_status FROM movie_trends;")
+            rows = dict(cur.fetchall())
+        for movie in self.movies:
+            movie_id = movie[0]['movie_id']
+            self.assertEqual(rows[movie_id], self.analyzer.classify_snapshots(movie)['trend_status'])
+
+    def test_ingest_flag_kept_in_window_then_cleared(self):
+        quiet = [m[0]['movie_id'] for m in self.movies if not self.analyzer.classify_snapshots(m)['spike_detected']]
+        fresh, stale = quiet[:2]
+        self.analyzer.store_trends_sql(self.movie_ids)
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE movie_trends SET spike_detected = true, has_suspicious_activity = true, spike_magnitude = 9,
+                    spike_flagged_at = NOW(), spike_date = CASE WHEN movie_id = %s THEN CURRENT_DATE ELSE CURRENT_DATE - 30 END
+                WHERE movie_id IN (%s, %s);
+            """, (fresh, fresh, stale))
+        self.analyzer.store_trends_sql(self.movie_ids)
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT movie_id::text, spike_detected, spike_flagged_at IS NOT NULL FROM movie_trends WHERE movie_id IN (%s, %s);",
+                        (fresh, stale))
+            rows = {movie_id: (spike, flagged) for movie_id, spike, flagged in cur.fetchall()}
+        self.assertEqual(rows[fresh], (True, True))
+        self.assertEqual(rows[stale], (False, False))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from scrapers.url_cache import ResolutionCache
+
+def entry(url, expires_in=timedelta(days=1), **state):
+    row = {'url': url, 'expires_at': datetime.now(timezone.utc) + expires_in,
+           'etag': None, 'last_modified': None, 'content_digest': None}
+    row.update(state)
+    return row
+
+class TestResolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.conn = MagicMock()
+        self.cur = self.conn.cursor.return_value.__enter__.return_value
+        self.cache = ResolutionCache(self.conn, ttl_days=30, negative_ttl_hours=24)
+
+    def test_load_answers_batch_from_memory(self):
+        self.cur.fetchall.return_value = [dict(entry('https://imdb.com/title/tt1'), movie_id='a', source='IMDb')]
+        self.cache.load(['a', 'b'])
+        self.assertEqual(self.cur.execute.call_count, 1)
+        self.assertEqual(self.cache.get('a', 'IMDb')['url'], 'https://imdb.com/title/tt1')
+        # Loaded movies without an entry are misses, not per-key queries
+        self.assertIsNone(self.cache.get('a', 'Metacritic'))
+        self.assertIsNone(self.cache.get('b', 'IMDb'))
+        self.assertEqual(self.cur.execute.call_count, 1)
+
+    def test_unloaded_key_is_read_once(self):
+        self.cur.fetchone.return_value = entry('https://imdb.com/title/tt2')
+        self.assertEqual(self.cache.get('c', 'IMDb')['url'], 'https://imdb.com/title/tt2')
+        self.assertEqual(self.cache.get('c', 'IMDb')['url'], 'https://imdb.com/title/tt2')
+        self.assertEqual(self.cur.execute.call_count, 1)
+        self.assertEqual(self.cur.execute.call_args.args[1], ('c', 'IMDb'))
+
+    def test_expired_entries_are_misses(self):
+        self.cache._loaded.add('a')
+        self.cache._entries[('a', 'IMDb')] = entry('https://imdb.com/title/tt1', expires_in=-timedelta(seconds=1))
+        self.cache._entries[('a', 'Metacritic')] = entry(None, expires_in=-timedelta(seconds=1))
+        self.assertIsNone(self.cache.get('a', 'IMDb'))
+        self.assertIsNone(self.cache.get('a', 'Metacritic'))
+
+    def test_negative_entry_expires_sooner(self):
+        self.cache.put('a', 'IMDb', None)
+        self.cache.put('a', 'Metacritic', 'https://metacritic.com/movie/a')
+        negative, positive = self.cache.get('a', 'IMDb'), self.cache.get('a', 'Metacritic')
+        self.assertIsNone(negative['url'])
+        now = datetime.now(timezone.utc)
+        self.assertLessEqual(negative['expires_at'], now + timedelta(hours=24))
+        self.assertGreater(positive['expires_at'], now + timedelta(days=29))
+
+    def test_put_clears_page_state(self):
+        self.cache._entries[('a', 'IMDb')] = entry('https://imdb.com/old', etag='"v1"', content_digest='abc')
+        self.cache.put('a', 'IMDb', 'https://imdb.com/new')
+        sql = self.cur.execute.call_args.args[0]
+        for column in ('etag = NULL', 'last_modified = NULL', 'content_digest = NULL'):
+            self.assertIn(column, sql)
+        cached = self.cache.get('a', 'IMDb')
+        self.assertEqual((cached['url'], cached['etag'], cached['content_digest']), ('https://imdb.com/new', None, None))
+
+    def test_put_page_state_skips_unchanged_write(self):
+        self.cache._entries[('a', 'IMDb')] = entry('https://imdb.com/a', etag='"v1"', content_digest='abc')
+        self.cache.put_page_state('a', 'IMDb', {'etag': '"v1"', 'last_modified': None}, 'abc')
+        self.cur.execute.assert_not_called()
+        self.cache.put_page_state('a', 'IMDb', {'etag': '"v2"', 'last_modified': None}, 'def')
+        self.assertEqual(self.cur.execute.call_args.args[1], ('"v2"', None, 'def', 'a', 'IMDb'))
+
+if __name__ == '__main__':
+    unittest.main()
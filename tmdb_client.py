@@ -1,6 +1,6 @@
 import os
-import requests
 from dotenv import load_dotenv
+from http_client import get_http_client
 
 load_dotenv()
 
@@ -35,7 +35,7 @@ class TMDBClient:
         if r_language:
             params["with_original_language"] = r_language
 
-        response = requests.get(endpoint, params=params)
+        response = get_http_client().get(endpoint, params=params)
         if response.status_code == 200:
             return response.json().get("results", [])
         else:
@@ -45,7 +45,7 @@ class TMDBClient:
     def get_movie_details(self, movie_id):
         endpoint = f"{self.base_url}/movie/{movie_id}"
         params = {"api_key": self.api_key}
-        response = requests.get(endpoint, params=params)
+        response = get_http_client().get(endpoint, params=params)
         if response.status_code == 200:
             return response.json()
         return None
@@ -0,0 +1,196 @@
+"""
+Whole-catalog trend computation for TrendAnalyzer
+Loads every movie's snapshot window in one query into columnar NumPy arrays
+(rows grouped by movie, addressed by offset and length) and computes slope,
+half-window means, growth rate, momentum and spike candidates for all movies
+at once.
+
+Results match TrendAnalyzer.classify_snapshots bit for bit: float sums are
+accumulated left to right per movie, position by position across all
+movies, which is the order Python's sum() uses, and the rare spike candidates
+are re-checked with the exact per-movie statistics code.
+"""
+import numpy as np
+
+SNAPSHOT_COLUMNS = "movie_id, snapshot_date, review_velocity, critic_score, new_reviews_today, score_change"
+
+# Per-movie order shared with TrendAnalyzer.get_daily_snapshots
+SNAPSHOT_ORDER = "snapshot_date, snapshot_time, source"
+
+
+class SnapshotColumns:
+    """Snapshot rows for many movies as flat arrays; movie i owns rows offsets[i]:offsets[i]+lengths[i]"""
+
+    def __init__(self, movie_ids, lengths, velocity, critic, new_reviews, score_change, dates):
+        self.movie_ids = movie_ids
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(np.int64)
+        self.velocity = velocity          # review_velocity, None -> 0
+        self.critic = critic              # critic_score, None -> NaN
+        self.new_reviews = new_reviews    # new_reviews_today (int64), None -> 0
+        self.score_change = score_change  # score_change, None -> 0
+        self.dates = dates                # snapshot_date per row (list)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (movie_id, snapshot_date, review_velocity, critic_score,
+        new_reviews_today, score_change) tuples, sorted by movie"""
+        movie_ids, lengths = [], []
+        previous = object()
+        for row in rows:
+            if row[0] != previous:
+                previous = row[0]
+                movie_ids.append(row[0])
+                lengths.append(0)
+            lengths[-1] += 1
+
+        if rows:
+            _, dates, velocity, critic, new_reviews, score_change = zip(*rows)
+        else:
+            dates = velocity = critic = new_reviews = score_change = ()
+        return cls(
+            movie_ids,
+            lengths,
+            np.array([v or 0 for v in velocity], dtype=np.float64),
+            np.array([np.nan if c is None else c for c in critic], dtype=np.float64),
+            np.array([n or 0 for n in new_reviews], dtype=np.int64),
+            np.array([s or 0 for s in score_change], dtype=np.float64),
+            list(dates),
+        )
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+
+def load_snapshot_columns(conn, movie_ids, days=7):
+    """Every listed movie's snapshots from the last `days` days, in one query"""
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            SELECT {SNAPSHOT_COLUMNS}
+            FROM daily_review_snapshots
+            WHERE movie_id = ANY(%s::uuid[])
+            AND snapshot_date >= CURRENT_DATE - INTERVAL '%s days'
+            ORDER BY movie_id, {SNAPSHOT_ORDER};
+        """, ([str(m) for m in movie_ids], days))
+        rows = cur.fetchall()
+    return SnapshotColumns.from_rows(rows)
+
+
+def ordered_sum(values, starts, counts):
+    """Per-segment sum of values[starts[i]:starts[i]+counts[i]], added left to right.
+
+    Vectorised across segments but sequential within each, so the result is
+    identical to Python's sum() over the same floats.
+    """
+    total = np.zeros(len(starts), dtype=np.float64)
+    for j in range(int(counts.max()) if len(counts) else 0):
+        active = counts > j
+        total[active] += values[starts[active] + j]
+    return total
+
+
+def _int_sum(values, starts, counts):
+    """Exact per-segment sum of an int64 column"""
+    prefix = np.concatenate(([0], np.cumsum(values)))
+    return prefix[starts + counts] - prefix[starts]
+
+
+def _divide(numerator, denominator):
+    """numerator / denominator, 0.0 where the denominator is 0"""
+    out = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def classify_columns(cols, detect_anomalies):
+    """Trend classification for every movie in `cols`.
+
+    Args:
+        cols: SnapshotColumns
+        detect_anomalies: TrendAnalyzer.detect_anomalies, used to re-check
+            spike candidates exactly
+
+    Returns:
+        {movie_id: trend dict as returned by TrendAnalyzer.classify_snapshots}
+    """
+    if not len(cols):
+        return {}
+    n = cols.lengths
+    start = cols.offsets
+    mid = n // 2
+    rows = np.arange(len(cols.velocity))
+    position = rows - np.repeat(start, n)          # row's index within its movie
+    x_mean = np.repeat((n * (n - 1) // 2) / n, n)  # sum(range(n)) / n per row
+
+    # Least-squares slope of review_velocity against position
+    y_mean = ordered_sum(cols.velocity, start, n) / n
+    dx = position - x_mean
+    numerator = ordered_sum(dx * (cols.velocity - np.repeat(y_mean, n)), start, n)
+    denominator = ordered_sum(dx ** 2, start, n)
+    slope = np.where(n >= 2, _divide(numerator, denominator), 0.0)
+
+    # Sleeper hit: late-half velocity 3x the early half, and critic score up 5+
+    early_velocity = _divide(ordered_sum(cols.velocity, start, mid), mid)
+    late_velocity = ordered_sum(cols.velocity, start + mid, n - mid) / (n - mid)
+    ratio = _divide(late_velocity, early_velocity)
+    scored = ~np.isnan(cols.critic) & (cols.critic != 0)
+    scores = np.where(scored, cols.critic, 0.0)
+    early_count = _int_sum(scored.astype(np.int64), start, mid)
+    late_count = _int_sum(scored.astype(np.int64), start + mid, n - mid)
+    score_improvement = (_divide(ordered_sum(scores, start + mid, n - mid), late_count)
+                         - _divide(ordered_sum(scores, start, mid), early_count))
+    is_sleeper = ((n >= 5) & (early_velocity > 0) & (ratio >= 3.0)
+                  & (early_count > 0) & (late_count > 0) & (score_improvement >= 5.0))
+
+    # Review volume, growth (second half vs first) and score momentum
+    new_total = _int_sum(cols.new_reviews, start, n)
+    avg_daily_reviews = new_total / n
+    early_new = _divide(_int_sum(cols.new_reviews, start, mid).astype(np.float64), mid)
+    late_new = _int_sum(cols.new_reviews, start + mid, n - mid) / (n - mid)
+    growth = np.where((mid > 0) & (early_new > 0), _divide(late_new - early_new, early_new) * 100, 0.0)
+    momentum = ordered_sum(cols.score_change, start, n) / n
+
+    # Spikes: sample stdev from exact integer moments, then candidates checked exactly
+    squares = _int_sum(cols.new_reviews * cols.new_reviews, start, n)
+    spread = n * squares - new_total * new_total          # n(n-1) * variance, exact
+    stdev = np.sqrt(_divide(spread.astype(np.float64), (n * (n - 1)).astype(np.float64)))
+    peak = np.maximum.reduceat(cols.new_reviews, start)
+    threshold = avg_daily_reviews + 5 * stdev
+    threshold -= 1e-9 * np.abs(threshold) + 1e-9  # Margin for rounding; exact check follows
+    candidates = np.flatnonzero((n >= 3) & (spread > 0) & (peak > threshold))
+
+    conditions = [is_sleeper, slope > 0.5, slope < -0.5]
+    status = np.select(conditions, ['sleeper_hit', 'trending_up', 'trending_down'], 'stable')
+    confidence = np.select(conditions, [
+        np.minimum(ratio / 5.0, 1.0),
+        np.minimum(np.abs(slope) / 2.0, 1.0),
+        np.minimum(np.abs(slope) / 2.0, 1.0),
+    ], 1.0 - np.minimum(np.abs(slope), 1.0))
+
+    results = {}
+    for i, movie_id in enumerate(cols.movie_ids):
+        results[movie_id] = {
+            'trend_status': str(status[i]),
+            'trend_confidence': float(confidence[i]),
+            'avg_daily_reviews': float(avg_daily_reviews[i]),
+            'review_growth_rate': float(growth[i]),
+            'score_momentum': float(momentum[i]),
+            'has_suspicious_activity': False,
+            'spike_detected': False,
+            'spike_date': None,
+            'spike_magnitude': 0.0
+        }
+    for i in candidates:
+        lo, hi = start[i], start[i] + n[i]
+        snapshots = [
+            {'new_reviews_today': int(count), 'snapshot_date': date}
+            for count, date in zip(cols.new_reviews[lo:hi], cols.dates[lo:hi])
+        ]
+        has_spike, spike_date, magnitude = detect_anomalies(snapshots)
+        results[cols.movie_ids[i]].update({
+            'has_suspicious_activity': has_spike,
+            'spike_detected': has_spike,
+            'spike_date': spike_date,
+            'spike_magnitude': magnitude
+        })
+    return results
@@ -0,0 +1,112 @@
+"""
+Server-side trend computation for TrendAnalyzer
+One statement computes every movie's movie_trends row in Postgres (window
+functions for row position and half-window split, regr_slope, avg FILTER,
+stddev_samp), so no snapshot row leaves the database. Thresholds are those
+of TrendAnalyzer.classify_snapshots; statuses and spikes match it, float
+metrics agree to rounding (Postgres sums in its own order and averages
+integer counts in numeric).
+"""
+from psycopg2.extras import RealDictCursor
+
+from trend_batch import SNAPSHOT_ORDER
+
+# movie_id plus TrendAnalyzer's TREND_COLUMNS (window marks included), for
+# %(movie_ids)s (uuid list, one row each, in any order) and %(days)s
+TRENDS_QUERY = f"""
+    WITH ranked AS (
+        SELECT
+            s.movie_id,
+            s.snapshot_date,
+            s.updated_at,
+            COALESCE(s.review_velocity, 0)::float8 AS velocity,
+            NULLIF(s.critic_score, 0)::float8 AS critic,
+            COALESCE(s.new_reviews_today, 0) AS new_reviews,
+            COALESCE(s.score_change, 0)::float8 AS score_change,
+            ROW_NUMBER() OVER (PARTITION BY s.movie_id ORDER BY {SNAPSHOT_ORDER}) - 1 AS i,
+            COUNT(*) OVER (PARTITION BY s.movie_id) AS n,
+            AVG(COALESCE(s.new_reviews_today, 0)) OVER (PARTITION BY s.movie_id) AS new_mean,
+            STDDEV_SAMP(COALESCE(s.new_reviews_today, 0)) OVER (PARTITION BY s.movie_id) AS new_stdev
+        FROM daily_review_snapshots s
+        WHERE s.movie_id = ANY(%(movie_ids)s::uuid[])
+        AND s.snapshot_date >= CURRENT_DATE - INTERVAL '%(days)s days'
+    ),
+    flagged AS (
+        SELECT
+            *,
+            i >= n / 2 AS late,
+            -- More than 5 standard deviations above the window mean
+            n >= 3 AND new_stdev > 0 AND new_reviews > new_mean + 5 * new_stdev AS spike
+        FROM ranked
+    ),
+    windows AS (
+        SELECT
+            movie_id,
+            COUNT(*)::integer AS n,
+            MAX(updated_at) AS snapshots_through,
+            -- Least-squares slope of review velocity against position
+            COALESCE(REGR_SLOPE(velocity, i), 0) AS slope,
+            AVG(velocity) FILTER (WHERE NOT late) AS early_velocity,
+            AVG(velocity) FILTER (WHERE late) AS late_velocity,
+            AVG(critic) FILTER (WHERE NOT late) AS early_score,
+            AVG(critic) FILTER (WHERE late) AS late_score,
+            AVG(new_reviews) AS avg_daily_reviews,
+            AVG(new_reviews) FILTER (WHERE NOT late) AS early_new,
+            AVG(new_reviews) FILTER (WHERE late) AS late_new,
+            AVG(score_change) AS score_momentum,
+            -- First spike in snapshot order
+            (ARRAY_AGG(snapshot_date ORDER BY i) FILTER (WHERE spike))[1] AS spike_date,
+            (ARRAY_AGG((new_reviews - new_mean) / new_stdev ORDER BY i) FILTER (WHERE spike))[1] AS spike_magnitude
+        FROM flagged
+        GROUP BY movie_id
+    ),
+    classified AS (
+        SELECT
+            *,
+            -- Sleeper hit: late-half velocity 3x the early half, and critic score up 5+
+            COALESCE(n >= 5 AND early_velocity > 0 AND late_velocity / early_velocity >= 3.0
+                     AND late_score - early_score >= 5.0, false) AS is_sleeper
+        FROM windows
+    )
+    SELECT
+        m.movie_id,
+        CASE
+            WHEN c.movie_id IS NULL THEN 'stable'
+            WHEN c.is_sleeper THEN 'sleeper_hit'
+            WHEN c.slope > 0.5 THEN 'trending_up'
+            WHEN c.slope < -0.5 THEN 'trending_down'
+            ELSE 'stable'
+        END AS trend_status,
+        CASE
+            WHEN c.movie_id IS NULL THEN 0.0
+            WHEN c.is_sleeper THEN LEAST(c.late_velocity / c.early_velocity / 5.0, 1.0)
+            WHEN ABS(c.slope) > 0.5 THEN LEAST(ABS(c.slope) / 2.0, 1.0)
+            ELSE 1.0 - LEAST(ABS(c.slope), 1.0)
+        END::float8 AS trend_confidence,
+        COALESCE(c.avg_daily_reviews, 0)::float8 AS avg_daily_reviews,
+        -- Second half vs first, in percent
+        CASE WHEN c.early_new > 0 THEN (c.late_new - c.early_new) / c.early_new * 100 ELSE 0 END::float8 AS review_growth_rate,
+        COALESCE(c.score_momentum, 0)::float8 AS score_momentum,
+        COALESCE(c.spike_date IS NOT NULL, false) AS has_suspicious_activity,
+        COALESCE(c.spike_date IS NOT NULL, false) AS spike_detected,
+        c.spike_date,
+        CASE
+            WHEN c.movie_id IS NULL THEN NULL
+            ELSE COALESCE(c.spike_magnitude, 0)
+        END::float8 AS spike_magnitude,
+        c.snapshots_through,
+        COALESCE(c.n, 0) AS snapshot_count
+    FROM UNNEST(%(movie_ids)s::uuid[]) AS m(movie_id)
+    LEFT JOIN classified c ON c.movie_id = m.movie_id
+"""
+
+
+def query_params(movie_ids, days=7):
+    return {'movie_ids': [str(m) for m in movie_ids], 'days': days}
+
+
+def classify_trends_sql(conn, movie_ids, days=7):
+    """{movie_id: trend dict with window marks} for every listed movie, computed in Postgres"""
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(TRENDS_QUERY + ";", query_params(movie_ids, days))
+        return {str(row.pop('movie_id')): dict(row) for row in cur.fetchall()}